@@ -0,0 +1,264 @@
+"""Inputs, clock and side effects of an agent run, behind one interface.
+
+The graph nodes never touch Mongo, the clock or the LLM directly; they go
+through the AgentIO of the current run:
+
+- LiveIO reads and writes through the services, with the clock fixed at the
+  start of the run.
+- RecordingIO does the same, and also snapshots every input and LLM
+  exchange into a session that is saved as gzipped JSON when
+  AGENT_RECORD_DIR is set.
+- ReplayIO serves a saved session back with the recorded clock and no
+  database, network or writes, so slow production runs can be re-run and
+  profiled offline (see benchmarks/agent_replay.py).
+
+Free slots are computed from the availability inputs (user, class
+schedules, events) with the pure bitmap builder while recording and
+replaying, so that the replayed planning work matches the recorded run.
+"""
+import copy
+import gzip
+import json
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+from app.database.connection import get_database
+from app.services.availability_service import AvailabilityService
+from app.services.calendar_service import CalendarService
+from app.services.course_service import CourseService
+from app.services.notification_service import NotificationService
+from app.services.suggestion_service import SuggestionService
+from app.services.workload_service import WorkloadService
+
+SESSION_FORMAT = 1
+
+class LiveIO:
+    """Agent I/O against the real services."""
+
+    def __init__(self, now: Optional[datetime] = None):
+        self._now = now or datetime.utcnow()
+
+    def now(self) -> datetime:
+        return self._now
+
+    async def load_assignments(self, user_id: str) -> List[dict]:
+        db = get_database()
+        cursor = db.assignments.find({"user_id": user_id, "status": {"$ne": "completed"}})
+        return await cursor.to_list(length=100)
+
+    async def load_courses(self, user_id: str) -> List[dict]:
+        courses = await CourseService.get_user_courses(user_id)
+        return [c.model_dump(by_alias=True) for c in courses]
+
+    async def load_events(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        events = await CalendarService.get_user_events(user_id, start, end)
+        return [e.model_dump(mode="json") for e in events]
+
+    async def free_slots(self, user_id: str, start: datetime, end: datetime,
+                         duration_hours: float) -> List[dict]:
+        return await AvailabilityService.get_free_slots(user_id, start, end, duration_hours)
+
+    async def send_reminders(self, user_id: str) -> List[dict]:
+        return await NotificationService.check_and_send_upcoming_deadlines(user_id, hours_ahead=24)
+
+    async def workload_summary(self, user_id: str) -> Dict[str, Any]:
+        return await WorkloadService.get_summary(user_id)
+
+    def llm_enabled(self, llm) -> bool:
+        return llm is not None
+
+    async def complete(self, llm, prompt: str) -> str:
+        return await llm.ainvoke(prompt)
+
+    async def persist_suggestions(self, user_id: str, assignment_ids: List[str],
+                                  suggestions: List[dict], stored: Dict[str, Any]) -> int:
+        return await SuggestionService.persist(user_id, assignment_ids, suggestions, stored=stored)
+
+    def node_finished(self, name: str, seconds: float):
+        pass
+
+class RecordingIO(LiveIO):
+    """LiveIO that also snapshots the run's inputs into a session."""
+
+    def __init__(self, user_id: str, llm, now: Optional[datetime] = None):
+        super().__init__(now)
+        self._bitmap = None
+        self.session: Dict[str, Any] = {
+            "format": SESSION_FORMAT,
+            "user_id": user_id,
+            "now": self._now,
+            "llm_enabled": llm is not None,
+            "inputs": {},
+            "llm": [],
+            "nodes": {},
+        }
+
+    def _record(self, key: str, value):
+        self.session["inputs"][key] = copy.deepcopy(value)
+        return value
+
+    async def load_assignments(self, user_id: str) -> List[dict]:
+        return self._record("assignments", await super().load_assignments(user_id))
+
+    async def load_courses(self, user_id: str) -> List[dict]:
+        return self._record("courses", await super().load_courses(user_id))
+
+    async def load_events(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        return self._record("events", await super().load_events(user_id, start, end))
+
+    async def free_slots(self, user_id: str, start: datetime, end: datetime,
+                         duration_hours: float) -> List[dict]:
+        if self._bitmap is None:
+            user, schedules, events = await AvailabilityService.load_inputs(user_id, self._now)
+            self._record("availability", {"user": user, "schedules": schedules, "events": events})
+            self._bitmap = AvailabilityService.build_bitmap(self._now, user, schedules, events)
+        return self._bitmap.free_slots(start, end, duration_hours)
+
+    async def send_reminders(self, user_id: str) -> List[dict]:
+        return self._record("reminders", await super().send_reminders(user_id))
+
+    async def workload_summary(self, user_id: str) -> Dict[str, Any]:
+        return self._record("workload", await super().workload_summary(user_id))
+
+    async def complete(self, llm, prompt: str) -> str:
+        exchange: Dict[str, Any] = {"prompt": prompt}
+        self.session["llm"].append(exchange)
+        try:
+            exchange["response"] = await super().complete(llm, prompt)
+        except Exception as e:
+            exchange["error"] = f"{type(e).__name__}: {e}"
+            raise
+        return exchange["response"]
+
+    def node_finished(self, name: str, seconds: float):
+        self.session["nodes"][name] = round(seconds * 1000, 3)
+
+class ReplayIO(LiveIO):
+    """Serves a recorded session: recorded clock, no database, network or writes."""
+
+    def __init__(self, session: Dict[str, Any]):
+        super().__init__(session["now"])
+        self.session = session
+        self._inputs = session["inputs"]
+        self._llm = list(session["llm"])
+        self._bitmap = None
+        self.nodes: Dict[str, float] = {}
+        self.writes = 0  # suggestions a live run would have written
+
+    def _recorded(self, key: str):
+        if key not in self._inputs:
+            raise KeyError(f"Session has no recorded {key!r}")
+        return copy.deepcopy(self._inputs[key])
+
+    async def load_assignments(self, user_id: str) -> List[dict]:
+        return self._recorded("assignments")
+
+    async def load_courses(self, user_id: str) -> List[dict]:
+        return self._recorded("courses")
+
+    async def load_events(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        return self._recorded("events")
+
+    async def free_slots(self, user_id: str, start: datetime, end: datetime,
+                         duration_hours: float) -> List[dict]:
+        if self._bitmap is None:
+            inputs = self._recorded("availability")
+            self._bitmap = AvailabilityService.build_bitmap(
+                self._now, inputs["user"], inputs["schedules"], [tuple(e) for e in inputs["events"]]
+            )
+        return self._bitmap.free_slots(start, end, duration_hours)
+
+    async def send_reminders(self, user_id: str) -> List[dict]:
+        return self._recorded("reminders")
+
+    async def workload_summary(self, user_id: str) -> Dict[str, Any]:
+        return self._recorded("workload")
+
+    def llm_enabled(self, llm) -> bool:
+        return self.session["llm_enabled"]
+
+    async def complete(self, llm, prompt: str) -> str:
+        if not self._llm:
+            raise RuntimeError("Replay made more LLM calls than were recorded")
+        exchange = self._llm.pop(0)
+        if exchange["prompt"] != prompt:
+            raise RuntimeError("Replay LLM prompt differs from the recorded one")
+        if "error" in exchange:
+            raise RuntimeError(exchange["error"])
+        return exchange["response"]
+
+    async def persist_suggestions(self, user_id: str, assignment_ids: List[str],
+                                  suggestions: List[dict], stored: Dict[str, Any]) -> int:
+        # Do the diff a live run would do, but don't write
+        self.writes = len(SuggestionService.diff(assignment_ids, stored, suggestions))
+        return self.writes
+
+    def node_finished(self, name: str, seconds: float):
+        self.nodes[name] = self.nodes.get(name, 0.0) + seconds
+
+_current_io: ContextVar[Optional[LiveIO]] = ContextVar("agent_io", default=None)
+
+def current_io() -> LiveIO:
+    """The AgentIO of the running agent (a fresh LiveIO outside a run)."""
+    return _current_io.get() or LiveIO()
+
+def bound_io() -> Optional[LiveIO]:
+    """The AgentIO bound to this context, if any."""
+    return _current_io.get()
+
+def bind_io(io: LiveIO):
+    """Make io the current AgentIO; returns a token for unbind_io."""
+    return _current_io.set(io)
+
+def unbind_io(token):
+    _current_io.reset(token)
+
+# Session files: JSON with tagged datetimes and ObjectIds, so they round-trip exactly
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, timedelta):
+        return {"$td": value.total_seconds()}
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot record {type(value).__name__}")
+
+def _decode(obj: dict):
+    if len(obj) == 1:
+        if "$dt" in obj:
+            return datetime.fromisoformat(obj["$dt"])
+        if "$oid" in obj:
+            return ObjectId(obj["$oid"])
+        if "$td" in obj:
+            return timedelta(seconds=obj["$td"])
+    return obj
+
+def normalize(value):
+    """A JSON round-trip of value, for comparing recorded and replayed outputs."""
+    return json.loads(json.dumps(value, default=_encode), object_hook=_decode)
+
+def save_session(session: Dict[str, Any], directory: str) -> str:
+    """Write a session as gzipped JSON; returns the file path."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = session["now"].strftime("%Y%m%dT%H%M%S%f")
+    path = os.path.join(directory, f"{session['user_id']}-{stamp}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(session, f, default=_encode, separators=(",", ":"))
+    return path
+
+def load_session(path: str) -> Dict[str, Any]:
+    """Read a session written by save_session."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        session = json.load(f, object_hook=_decode)
+    if session.get("format") != SESSION_FORMAT:
+        raise ValueError(f"{path}: unsupported session format {session.get('format')!r}")
+    return session
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
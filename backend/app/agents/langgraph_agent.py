@@ -1,17 +1,31 @@
-"""LangGraph agent for workflow management."""
-from typing import TypedDict, Annotated, List, Dict, Any
-from datetime import datetime, timedelta
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
-from langchain_community.llms import HuggingFaceEndpoint
-from app.database.connection import get_database
+"""LangGraph agent for workflow management.
+
+langgraph and langchain_community are imported inside the methods that need
+them so that importing this module (and app.main) stays cheap; the agent is
+built on first use through get_agent().
+
+Nodes reach the database, clock and LLM only through the run's AgentIO
+(app.agents.agent_io), which is what makes runs recordable and replayable.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import TypedDict, Annotated, List, Dict, Any, Optional, Set
+from datetime import timedelta
 from app.models.assignment import Assignment
-from app.models.course import Course
-from app.services.calendar_service import CalendarService
-from app.services.notification_service import NotificationService
+from app.agents.agent_io import (
+    LiveIO, RecordingIO, bind_io, bound_io, current_io, elapsed_ms, save_session, unbind_io
+)
 from app.agents.task_planner import TaskPlanner
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Recording saves still in flight, referenced so they aren't garbage collected
+_recording_saves: Set[asyncio.Task] = set()
+
 class AgentState(TypedDict):
     """State for the LangGraph agent."""
     user_id: str
@@ -20,6 +34,7 @@ class AgentState(TypedDict):
     courses: List[Dict]
     calendar_events: List[Dict]
     suggestions: List[Dict]
+    study_plan: Dict[str, Any]
     current_task: str
 
 class StudyPlannerAgent:
@@ -28,6 +43,7 @@ class StudyPlannerAgent:
     def __init__(self):
         """Initialize the agent."""
         if settings.HUGGINGFACE_API_KEY:
+            from langchain_community.llms import HuggingFaceEndpoint
             self.llm = HuggingFaceEndpoint(
                 repo_id=settings.HUGGINGFACE_MODEL,
                 temperature=0.7,
@@ -39,16 +55,19 @@ class StudyPlannerAgent:
         
         self.graph = self._build_graph()
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self):
         """Build the LangGraph workflow."""
+        from langgraph.graph import StateGraph, END
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("analyze_state", self.analyze_state)
-        workflow.add_node("prioritize_tasks", self.prioritize_tasks)
-        workflow.add_node("suggest_schedule", self.suggest_schedule)
-        workflow.add_node("send_reminders", self.send_reminders)
-        workflow.add_node("generate_recommendations", self.generate_recommendations)
+        workflow.add_node("analyze_state", _timed("analyze_state", self.analyze_state))
+        workflow.add_node("prioritize_tasks", _timed("prioritize_tasks", self.prioritize_tasks))
+        workflow.add_node("suggest_schedule", _timed("suggest_schedule", self.suggest_schedule))
+        workflow.add_node("send_reminders", _timed("send_reminders", self.send_reminders))
+        workflow.add_node("generate_recommendations",
+                          _timed("generate_recommendations", self.generate_recommendations))
+        workflow.add_node("persist_suggestions", _timed("persist_suggestions", self.persist_suggestions))
         
         # Define edges
         workflow.set_entry_point("analyze_state")
@@ -56,41 +75,33 @@ class StudyPlannerAgent:
         workflow.add_edge("prioritize_tasks", "suggest_schedule")
         workflow.add_edge("suggest_schedule", "send_reminders")
         workflow.add_edge("send_reminders", "generate_recommendations")
-        workflow.add_edge("generate_recommendations", END)
+        workflow.add_edge("generate_recommendations", "persist_suggestions")
+        workflow.add_edge("persist_suggestions", END)
         
         return workflow.compile()
     
     async def analyze_state(self, state: AgentState) -> AgentState:
         """Analyze current state of assignments and calendar."""
-        db = get_database()
+        io = current_io()
         user_id = state["user_id"]
+        now = io.now()
         
-        # Fetch assignments
-        assignments_cursor = db.assignments.find({
-            "user_id": user_id,
-            "status": {"$ne": "completed"}
-        })
-        assignments = await assignments_cursor.to_list(length=100)
+        # Fetch assignments (pending only)
         # Keep _id as ObjectId for proper Pydantic validation
-        state["assignments"] = [dict(a) for a in assignments]
+        state["assignments"] = await io.load_assignments(user_id)
         
         # Fetch courses
-        courses_cursor = db.courses.find({"user_id": user_id})
-        courses = await courses_cursor.to_list(length=100)
-        # Keep _id as ObjectId for proper Pydantic validation
-        state["courses"] = [dict(c) for c in courses]
+        state["courses"] = await io.load_courses(user_id)
         
         # Fetch upcoming calendar events
-        end_date = datetime.utcnow() + timedelta(days=30)
-        events = await CalendarService.get_user_events(user_id, datetime.utcnow(), end_date)
-        state["calendar_events"] = [e.model_dump(mode="json") for e in events]
+        state["calendar_events"] = await io.load_events(user_id, now, now + timedelta(days=30))
         
         return state
     
     async def prioritize_tasks(self, state: AgentState) -> AgentState:
         """Prioritize assignments using TaskPlanner."""
         assignments = [Assignment(**a) for a in state["assignments"]]
-        prioritized = await TaskPlanner.prioritize_assignments(state["user_id"], assignments)
+        prioritized = TaskPlanner.rank_assignments(assignments, current_io().now())
         
         state["assignments"] = [a.model_dump(mode="json") for a in prioritized]
         state["current_task"] = "prioritization_complete"
@@ -106,11 +117,16 @@ class StudyPlannerAgent:
             try:
                 assignments.append(Assignment(**a))
             except Exception as e:
-                print(f"Warning: Skipping invalid assignment in schedule suggestions: {e}")
+                logger.warning("Skipping invalid assignment in schedule suggestions: %s", e,
+                               extra={"user_id": state["user_id"]})
                 continue
         
+        io = current_io()
         for assignment in assignments:
-            study_times = await TaskPlanner.suggest_study_times(state["user_id"], assignment)
+            free_slots = await io.free_slots(
+                state["user_id"], io.now(), assignment.due_date, assignment.estimated_hours
+            )
+            study_times = TaskPlanner.pick_study_times(free_slots, assignment.estimated_hours)
             suggestions.append({
                 "assignment_id": str(assignment.id),
                 "title": assignment.title,
@@ -125,28 +141,33 @@ class StudyPlannerAgent:
     
     async def send_reminders(self, state: AgentState) -> AgentState:
         """Send reminders for upcoming deadlines."""
-        reminders = await NotificationService.check_and_send_upcoming_deadlines(
-            state["user_id"], hours_ahead=24
-        )
+        reminders = await current_io().send_reminders(state["user_id"])
         state["current_task"] = f"reminders_sent: {len(reminders)}"
         
         return state
     
     async def generate_recommendations(self, state: AgentState) -> AgentState:
         """Generate final recommendations."""
-        # Convert dict to Assignment models
-        assignments = []
-        for a in state["assignments"]:
-            try:
-                assignments.append(Assignment(**a))
-            except Exception as e:
-                print(f"Warning: Skipping invalid assignment in recommendations: {e}")
-                continue
+        # Materialized summary: one document read instead of a scan
+        summary = await current_io().workload_summary(state["user_id"])
+        study_plan = TaskPlanner.study_plan_from_summary(summary)
+        state["study_plan"] = study_plan
+        
+        recommendations = await self.recommend(study_plan)
         
-        study_plan = TaskPlanner.generate_study_plan(state["user_id"], assignments)
+        state["suggestions"].append({
+            "type": "recommendations",
+            "content": recommendations
+        })
+        state["current_task"] = "complete"
         
+        return state
+    
+    async def recommend(self, study_plan: Dict[str, Any]) -> List[str]:
+        """Recommendations for a study plan, from the LLM when available."""
         # Generate AI recommendations if LLM is available
-        if self.llm:
+        io = current_io()
+        if io.llm_enabled(self.llm):
             try:
                 context = f"""
                 User has {study_plan['urgent_count']} urgent assignments, 
@@ -161,20 +182,25 @@ class StudyPlannerAgent:
 
 Recommendations:"""
                 
-                response = await self.llm.ainvoke(prompt)
+                response = await io.complete(self.llm, prompt)
                 recommendations = [r.strip() for r in response.split('\n') if r.strip() and not r.strip().startswith('Recommendations:')]
             except Exception as e:
-                print(f"Error generating AI recommendations: {e}")
+                logger.warning("Error generating AI recommendations: %s", e)
                 recommendations = study_plan.get("recommendations", [])
         else:
             recommendations = study_plan.get("recommendations", [])
         
-        state["suggestions"].append({
-            "type": "recommendations",
-            "content": recommendations
-        })
-        state["current_task"] = "complete"
-        
+        return recommendations
+    
+    async def persist_suggestions(self, state: AgentState) -> AgentState:
+        """Store the suggested study times on the assignments that changed."""
+        await current_io().persist_suggestions(
+            state["user_id"],
+            [a["id"] for a in state["assignments"]],
+            state["suggestions"],
+            stored={a["id"]: a["suggested_study_times"] for a in state["assignments"]}
+        )
+        state["current_task"] = "suggestions_persisted"
         return state
     
     async def run(self, user_id: str) -> Dict[str, Any]:
@@ -186,21 +212,82 @@ Recommendations:"""
             "courses": [],
             "calendar_events": [],
             "suggestions": [],
+            "study_plan": {},
             "current_task": "initialized"
         }
         
+        if bound_io() is not None:
+            # The caller supplied the AgentIO (e.g. a replay)
+            return await self._invoke(initial_state)
+        
+        recording = bool(settings.AGENT_RECORD_DIR) and random.random() < settings.AGENT_RECORD_SAMPLE_RATE
+        io = RecordingIO(user_id, self.llm) if recording else LiveIO()
+        token = bind_io(io)
+        started = time.perf_counter()
+        try:
+            result = await self._invoke(initial_state)
+        finally:
+            unbind_io(token)
+        if recording:
+            # Writing the session is not part of the run; don't make the caller wait for it
+            task = asyncio.create_task(self._save_recording(io, result, elapsed_ms(started)))
+            _recording_saves.add(task)
+            task.add_done_callback(_recording_saves.discard)
+        return result
+    
+    async def _invoke(self, initial_state: AgentState) -> Dict[str, Any]:
         final_state = await self.graph.ainvoke(initial_state)
         
         return {
-            "user_id": user_id,
+            "user_id": initial_state["user_id"],
             "assignments": final_state["assignments"],
             "suggestions": final_state["suggestions"],
-            "study_plan": TaskPlanner.generate_study_plan(
-                user_id, 
-                [Assignment(**a) for a in final_state["assignments"]]
-            )
+            "study_plan": final_state["study_plan"]
         }
+    
+    async def _save_recording(self, io: RecordingIO, result: Dict[str, Any], duration_ms: float):
+        """Save a recorded run if it was slow enough to be interesting."""
+        if duration_ms < settings.AGENT_RECORD_SLOW_MS:
+            return
+        io.session["duration_ms"] = duration_ms
+        io.session["output"] = result
+        try:
+            path = await asyncio.to_thread(save_session, io.session, settings.AGENT_RECORD_DIR)
+            logger.info("Recorded agent run", extra={
+                "user_id": result["user_id"], "path": path, "duration_ms": duration_ms
+            })
+        except Exception:
+            logger.exception("Could not save agent recording", extra={"user_id": result["user_id"]})
+
+async def wait_for_recordings():
+    """Wait for recording saves still in flight (call before the event loop exits)."""
+    if _recording_saves:
+        await asyncio.gather(*_recording_saves, return_exceptions=True)
+
+def _timed(name: str, node):
+    """Wrap a graph node so the run's AgentIO sees how long it took."""
+    async def timed_node(state: AgentState) -> AgentState:
+        started = time.perf_counter()
+        try:
+            return await node(state)
+        finally:
+            current_io().node_finished(name, time.perf_counter() - started)
+    return timed_node
+
+# Global agent instance, created lazily by get_agent()
+_agent: Optional[StudyPlannerAgent] = None
+_agent_lock = threading.Lock()
+
+def get_agent() -> StudyPlannerAgent:
+    """Return the shared agent, building it on first call."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = StudyPlannerAgent()
+    return _agent
 
-# Global agent instance
-agent = StudyPlannerAgent()
+def agent_loaded() -> bool:
+    """Whether the shared agent has been built yet."""
+    return _agent is not None
 
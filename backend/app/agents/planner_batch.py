@@ -0,0 +1,160 @@
+"""Process-pool planning for batch jobs.
+
+For large planning runs the CPU-bound part of planning is done in worker
+processes: building availability bitmaps, ranking assignments and picking
+study times. Mongo reads, reminders and LLM calls stay on the event loop.
+Workers receive compact, picklable PlanInput tuples in batches of users and
+return plain dicts.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from app.database.connection import get_database
+from app.services.availability_service import AvailabilityService
+from app.services.notification_service import NotificationService
+from app.services.suggestion_service import SuggestionService
+from app.services.workload_service import WorkloadService
+from app.agents.task_planner import TaskPlanner
+
+class PlanItem(NamedTuple):
+    """The assignment fields the planner needs (duck-types Assignment for scoring)."""
+    id: str
+    title: str
+    due_date: datetime
+    priority: int
+    estimated_hours: float
+
+class PlanInput(NamedTuple):
+    """Everything needed to plan one user without database access."""
+    user_id: str
+    now: datetime
+    assignments: Tuple[PlanItem, ...]
+    user: dict  # timezone and study_preferences
+    schedules: Tuple[dict, ...]  # raw Course.schedule dicts
+    events: Tuple[Tuple[datetime, datetime], ...]
+
+def plan_user(plan_input: PlanInput) -> Dict[str, Any]:
+    """Rank a user's assignments and suggest study times (pure CPU)."""
+    now = plan_input.now
+    ranked = TaskPlanner.rank_assignments(list(plan_input.assignments), now)
+    bitmap = AvailabilityService.build_bitmap(
+        now, plan_input.user, list(plan_input.schedules), list(plan_input.events)
+    )
+
+    suggestions = []
+    for item in ranked[:5]:  # Top 5
+        free_slots = bitmap.free_slots(now, item.due_date, item.estimated_hours)
+        study_times = TaskPlanner.pick_study_times(free_slots, item.estimated_hours)
+        suggestions.append({
+            "assignment_id": item.id,
+            "title": item.title,
+            "suggested_times": [st.isoformat() for st in study_times],
+            "estimated_hours": item.estimated_hours
+        })
+
+    return {
+        "user_id": plan_input.user_id,
+        "assignment_ids": [item.id for item in ranked],
+        "suggestions": suggestions,
+    }
+
+def plan_batch(inputs: List[PlanInput]) -> List[Dict[str, Any]]:
+    """Plan a batch of users; runs in a worker process."""
+    results = []
+    for plan_input in inputs:
+        try:
+            results.append(plan_user(plan_input))
+        except Exception as e:
+            results.append({"user_id": plan_input.user_id, "error": f"{type(e).__name__}: {e}"})
+    return results
+
+async def load_plan_items(user_id: str) -> Tuple[PlanItem, ...]:
+    """Read a user's pending assignments, with only the fields the planner needs."""
+    db = get_database()
+    cursor = db.assignments.find(
+        {"user_id": user_id, "status": {"$ne": "completed"}},
+        {"title": 1, "due_date": 1, "priority": 1, "estimated_hours": 1}
+    )
+    assignments = await cursor.to_list(length=100)
+    return tuple(
+        PlanItem(str(a["_id"]), a["title"], a["due_date"], a.get("priority", 3), a.get("estimated_hours", 2.0))
+        for a in assignments
+    )
+
+async def load_plan_input(user_id: str, now: datetime) -> PlanInput:
+    """Read a user's planning inputs from Mongo into a PlanInput."""
+    assignments = await load_plan_items(user_id)
+    user, schedules, events = await AvailabilityService.load_inputs(user_id, now)
+    return PlanInput(
+        user_id=user_id,
+        now=now,
+        assignments=assignments,
+        user=user,
+        schedules=tuple(schedules),
+        events=tuple(events),
+    )
+
+async def _finish(result: Dict[str, Any], agent) -> Dict[str, Any]:
+    """Event-loop side of a plan: stored suggestions, reminders, workload summary and recommendations."""
+    user_id = result["user_id"]
+    await SuggestionService.persist(user_id, result["assignment_ids"], result["suggestions"])
+    await NotificationService.check_and_send_upcoming_deadlines(user_id, hours_ahead=24)
+    summary = await WorkloadService.get_summary(user_id)
+    study_plan = TaskPlanner.study_plan_from_summary(summary)
+    recommendations = await agent.recommend(study_plan) if agent else study_plan["recommendations"]
+    result["suggestions"].append({"type": "recommendations", "content": recommendations})
+    result["study_plan"] = study_plan
+    return result
+
+async def plan_users(user_ids: List[str], agent=None, workers: Optional[int] = None,
+                     batch_size: int = 50) -> AsyncIterator[Tuple[str, Any]]:
+    """Plan many users, yielding (user_id, result) or (user_id, exception) as they finish.
+
+    Inputs for the next batch are read while earlier batches are being planned,
+    with at most two batches in flight per worker.
+    """
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    batches = [user_ids[i:i + batch_size] for i in range(0, len(user_ids), batch_size)]
+    # spawn rather than fork: the parent has a running loop and driver threads
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending: Dict[asyncio.Future, List[str]] = {}
+        for batch_index, batch in enumerate(batches):
+            now = datetime.utcnow()
+            loaded = await asyncio.gather(
+                *(load_plan_input(user_id, now) for user_id in batch), return_exceptions=True
+            )
+            inputs = []
+            for user_id, plan_input in zip(batch, loaded):
+                if isinstance(plan_input, Exception):
+                    yield user_id, plan_input
+                else:
+                    inputs.append(plan_input)
+            if inputs:
+                future = loop.run_in_executor(pool, plan_batch, inputs)
+                pending[future] = [plan_input.user_id for plan_input in inputs]
+
+            last = batch_index == len(batches) - 1
+            while pending and (len(pending) >= workers * 2 or last):
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    batch_users = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:  # worker died
+                        for user_id in batch_users:
+                            yield user_id, e
+                        continue
+                    for result in results:
+                        if "error" in result:
+                            yield result["user_id"], RuntimeError(result["error"])
+                            continue
+                        try:
+                            yield result["user_id"], await _finish(result, agent)
+                        except Exception as e:
+                            yield result["user_id"], e
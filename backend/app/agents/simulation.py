@@ -0,0 +1,189 @@
+"""What-if planning: re-run prioritization and scheduling on hypothetical edits.
+
+A simulation reads the user's pending assignments and cached availability
+bitmap, plans them as they are and with the requested assignment and event
+edits applied, and returns how the plan would change. Everything happens in
+memory: nothing is written, no reminders are sent and the LLM is not called.
+
+The edited plan is computed incrementally from the current one:
+
+- priority scores are reused for untouched assignments, and only computed
+  for edited or added ones;
+- event edits are applied to a copy of the bitmap, and study times are only
+  re-picked for plan entries whose assignment changed or whose window (now
+  until the due date) contains a slot whose busy state changed.
+
+The planning part is synchronous, so it cannot be cancelled from outside;
+instead it checks the caller's deadline between plan entries and raises
+TimeoutError once it has passed.
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from bson import ObjectId
+from app.agents.planner_batch import PlanItem, load_plan_items
+from app.agents.task_planner import TaskPlanner
+from app.database.connection import get_database
+from app.models.simulation import AssignmentChange, SimulationRequest
+from app.services.availability_service import AvailabilityBitmap, AvailabilityService
+
+PLAN_SIZE = 5  # the agent suggests study times for its top 5
+
+def _rank(items: Iterable[PlanItem], scores: Dict[str, float]) -> List[PlanItem]:
+    """Same order as TaskPlanner.rank_assignments, from precomputed scores."""
+    return sorted(items, key=lambda item: scores[item.id], reverse=True)
+
+def _check_deadline(deadline: Optional[float]):
+    """Raise TimeoutError if the time.monotonic() deadline has passed."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("Simulation deadline exceeded")
+
+def _study_times(bitmap: AvailabilityBitmap, now: datetime, item: PlanItem) -> List[datetime]:
+    free_slots = bitmap.free_slots(now, item.due_date, item.estimated_hours)
+    return TaskPlanner.pick_study_times(free_slots, item.estimated_hours)
+
+def apply_assignment_changes(items: Iterable[PlanItem],
+                             changes: List[AssignmentChange]) -> Tuple[List[PlanItem], Set[str]]:
+    """The edited list of pending assignments, and the ids of those that changed."""
+    by_id = {item.id: item for item in items}
+    touched = set()
+    added = 0
+    for change in changes:
+        if change.id is None:
+            item = PlanItem(
+                f"new:{added}", change.title, change.due_date,
+                change.priority if change.priority is not None else 3,
+                change.estimated_hours if change.estimated_hours is not None else 2.0,
+            )
+            added += 1
+            if change.status == "completed":
+                continue
+        else:
+            touched.add(change.id)
+            if change.remove or change.status == "completed":
+                by_id.pop(change.id, None)
+                continue
+            item = by_id[change.id]._replace(**{
+                field: getattr(change, field)
+                for field in ("title", "due_date", "priority", "estimated_hours")
+                if getattr(change, field) is not None
+            })
+        by_id[item.id] = item
+        touched.add(item.id)
+    return list(by_id.values()), touched
+
+def diff_plans(before: List[PlanItem], times_before: Dict[str, List[datetime]],
+               after: List[PlanItem], times_after: Dict[str, List[datetime]]) -> List[Dict[str, Any]]:
+    """Entries that joined, left, moved within or got new times in the plan."""
+    rank_before = {item.id: i + 1 for i, item in enumerate(before)}
+    rank_after = {item.id: i + 1 for i, item in enumerate(after)}
+    titles = {item.id: item.title for item in before}
+    titles.update((item.id, item.title) for item in after)
+
+    changes = []
+    for assignment_id in list(times_after) + [a for a in times_before if a not in times_after]:
+        if assignment_id not in times_before:
+            change = "added"
+        elif assignment_id not in times_after:
+            change = "dropped"
+        elif rank_before[assignment_id] != rank_after[assignment_id]:
+            change = "moved"
+        elif times_before[assignment_id] != times_after[assignment_id]:
+            change = "rescheduled"
+        else:
+            continue
+        changes.append({
+            "assignment_id": assignment_id,
+            "title": titles[assignment_id],
+            "change": change,
+            "rank_before": rank_before.get(assignment_id),
+            "rank_after": rank_after.get(assignment_id),
+            "times_before": times_before.get(assignment_id, []),
+            "times_after": times_after.get(assignment_id, []),
+        })
+    return changes
+
+def simulate(now: datetime, items: Tuple[PlanItem, ...], bitmap: AvailabilityBitmap,
+             edited_bitmap: AvailabilityBitmap, changes: List[AssignmentChange],
+             deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Plan the current and edited inputs and diff them (pure CPU).
+
+    deadline is a time.monotonic() value; TimeoutError is raised once it passes.
+    """
+    scores = {item.id: TaskPlanner.calculate_priority_score(item, now) for item in items}
+    before = _rank(items, scores)
+    times_before = {}
+    for item in before[:PLAN_SIZE]:
+        _check_deadline(deadline)
+        times_before[item.id] = _study_times(bitmap, now, item)
+
+    edited_items, touched = apply_assignment_changes(items, changes)
+    for item in edited_items:
+        if item.id in touched:
+            scores[item.id] = TaskPlanner.calculate_priority_score(item, now)
+    after = _rank(edited_items, scores)
+
+    changed_slots = bitmap.busy ^ edited_bitmap.busy
+    first = bitmap.index(now, round_up=True)
+    times_after = {}
+    rescheduled = 0
+    for item in after[:PLAN_SIZE]:
+        _check_deadline(deadline)
+        window = bitmap.mask(first, bitmap.index(item.due_date))
+        if item.id in times_before and item.id not in touched and not changed_slots & window:
+            times_after[item.id] = times_before[item.id]
+        else:
+            times_after[item.id] = _study_times(edited_bitmap, now, item)
+            rescheduled += 1
+
+    return {
+        "now": now,
+        "plan": [
+            {"assignment_id": item.id, "title": item.title, "rank": i + 1, "suggested_times": times_after[item.id]}
+            for i, item in enumerate(after[:PLAN_SIZE])
+        ],
+        "changes": diff_plans(before, times_before, after, times_after),
+        "rescheduled": rescheduled,
+    }
+
+async def _event_times(user_id: str, event_ids: List[str]) -> Dict[str, Tuple[datetime, datetime]]:
+    ids = [ObjectId(e) for e in event_ids if ObjectId.is_valid(e)]
+    if not ids:
+        return {}
+    cursor = get_database().calendar_events.find(
+        {"_id": {"$in": ids}, "user_id": user_id}, {"start_time": 1, "end_time": 1}
+    )
+    return {str(e["_id"]): (e["start_time"], e["end_time"]) async for e in cursor}
+
+async def simulate_user(user_id: str, request: SimulationRequest,
+                        deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Simulate a user's plan with the requested edits.
+
+    Raises LookupError if an edit names an assignment that is not pending or
+    an event the user does not have, and TimeoutError if the planning part
+    is still running at deadline (a time.monotonic() value).
+    """
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    items = await load_plan_items(user_id)
+    pending = {item.id for item in items}
+    for change in request.assignments:
+        if change.id is not None and change.id not in pending:
+            raise LookupError(f"Assignment {change.id} not found")
+
+    stored = await _event_times(user_id, [e.id for e in request.events if e.id])
+    added, removed = [], []
+    for change in request.events:
+        if change.id is not None:
+            if change.id not in stored:
+                raise LookupError(f"Event {change.id} not found")
+            removed.append(stored[change.id])
+        if not change.remove:
+            added.append((change.start_time, change.end_time))
+
+    bitmap = await AvailabilityService.get_bitmap(user_id)
+    edited_bitmap = await AvailabilityService.with_event_changes(user_id, bitmap, added, removed)
+    result = simulate(now, items, bitmap, edited_bitmap, request.assignments, deadline)
+    result["user_id"] = user_id
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from app.models.assignment import Assignment
 from app.models.calendar import CalendarEvent
-from app.services.calendar_service import CalendarService
+from app.services.availability_service import AvailabilityService
+from app.services.workload_service import WorkloadService
 
 class TaskPlanner:
     """Planner for optimizing study schedules."""
@@ -37,8 +38,11 @@ class TaskPlanner:
     @staticmethod
     async def prioritize_assignments(user_id: str, assignments: List[Assignment]) -> List[Assignment]:
         """Sort assignments by priority score."""
-        current_time = datetime.utcnow()
-        
+        return TaskPlanner.rank_assignments(assignments, datetime.utcnow())
+    
+    @staticmethod
+    def rank_assignments(assignments: List[Any], current_time: datetime) -> List[Any]:
+        """Sort anything with due_date/priority/estimated_hours by priority score."""
         # Calculate scores and sort
         assignments_with_scores = [
             (assignment, TaskPlanner.calculate_priority_score(assignment, current_time))
@@ -52,19 +56,24 @@ class TaskPlanner:
     async def suggest_study_times(user_id: str, assignment: Assignment, 
                                   preferred_hours: List[int] = None) -> List[datetime]:
         """Suggest optimal study times for an assignment."""
-        if preferred_hours is None:
-            preferred_hours = [9, 10, 14, 15, 16, 17]  # Default preferred hours
-        
         current_time = datetime.utcnow()
-        due_date = assignment.due_date
         
-        # Get free time slots
-        free_slots = await CalendarService.get_free_time_slots(
-            user_id, current_time, due_date, assignment.estimated_hours
+        # Get free time slots (respects classes, study preferences and timezone)
+        free_slots = await AvailabilityService.get_free_slots(
+            user_id, current_time, assignment.due_date, assignment.estimated_hours
         )
         
+        return TaskPlanner.pick_study_times(free_slots, assignment.estimated_hours, preferred_hours)
+    
+    @staticmethod
+    def pick_study_times(free_slots: List[dict], estimated_hours: float,
+                         preferred_hours: List[int] = None) -> List[datetime]:
+        """Choose study times from free slots, preferring the preferred hours."""
+        if preferred_hours is None:
+            preferred_hours = [9, 10, 14, 15, 16, 17]  # Default preferred hours
+        
         suggested_times = []
-        remaining_hours = assignment.estimated_hours
+        remaining_hours = estimated_hours
         
         for slot in free_slots:
             if remaining_hours <= 0:
@@ -72,7 +81,7 @@ class TaskPlanner:
             
             # Prefer slots that align with preferred hours
             slot_hour = slot["start"].hour
-            if slot_hour in preferred_hours or slot["duration_hours"] >= assignment.estimated_hours:
+            if slot_hour in preferred_hours or slot["duration_hours"] >= estimated_hours:
                 # Suggest using this slot
                 study_time = slot["start"]
                 suggested_times.append(study_time)
@@ -87,27 +96,28 @@ class TaskPlanner:
     def generate_study_plan(user_id: str, assignments: List[Assignment]) -> Dict[str, Any]:
         """Generate a comprehensive study plan."""
         current_time = datetime.utcnow()
-        
-        # Categorize assignments
-        overdue = [a for a in assignments if a.due_date < current_time and a.status != "completed"]
-        urgent = [a for a in assignments if 0 <= (a.due_date - current_time).days <= 3]
-        upcoming = [a for a in assignments if 3 < (a.due_date - current_time).days <= 7]
-        future = [a for a in assignments if (a.due_date - current_time).days > 7]
-        
-        total_hours_needed = sum(a.estimated_hours for a in assignments if a.status != "completed")
+        summary = WorkloadService.summarize(
+            ((a.due_date, a.estimated_hours) for a in assignments if a.status != "completed"),
+            current_time
+        )
+        return TaskPlanner.study_plan_from_summary(summary)
+    
+    @staticmethod
+    def study_plan_from_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the study plan from a workload summary (see WorkloadService)."""
+        counts = summary["counts"]
         
         recommendations = [
-            "Focus on overdue assignments first" if overdue else None,
-            "Break down large assignments into smaller tasks" if any(a.estimated_hours > 5 for a in assignments) else None,
+            "Focus on overdue assignments first" if counts["overdue"] else None,
+            "Break down large assignments into smaller tasks" if summary["large_count"] else None,
             "Schedule study sessions during your preferred hours"
         ]
         
         return {
-            "overdue_count": len(overdue),
-            "urgent_count": len(urgent),
-            "upcoming_count": len(upcoming),
-            "future_count": len(future),
-            "total_hours_needed": total_hours_needed,
+            "overdue_count": counts["overdue"],
+            "urgent_count": counts["urgent"],
+            "upcoming_count": counts["upcoming"],
+            "future_count": counts["future"],
+            "total_hours_needed": summary["total_hours"],
             "recommendations": [r for r in recommendations if r is not None]
         }
-
@@ -0,0 +1,126 @@
+"""Admission control for expensive endpoints.
+
+Requests first pass a per-user token bucket, then take one of a fixed
+number of execution slots. When every slot is busy they wait in a bounded
+FIFO queue for up to a timeout. Anything that cannot be admitted is
+rejected immediately with 429 and a Retry-After hint, so that bursts against
+the agent cannot starve the rest of the API.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Tuple
+from fastapi import HTTPException
+
+class AdmissionController:
+    """Concurrency cap, bounded wait queue and per-user token buckets."""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 rate_per_minute: float, burst: int, max_tracked_users: int = 10000):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.burst = burst
+        self.max_tracked_users = max_tracked_users
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # user -> (tokens, updated)
+        self._avg_duration = 1.0  # EWMA of admitted request duration, seconds
+        self.counters = {
+            "admitted": 0,
+            "rejected_rate_limited": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+        }
+        self.max_queue_depth = 0
+
+    def _take_token(self, user_id: str) -> float:
+        """Take a token from the user's bucket; return 0 or seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(user_id, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+        self._buckets[user_id] = (tokens, now)
+        while len(self._buckets) > self.max_tracked_users:
+            self._buckets.popitem(last=False)  # least recently seen
+        return retry_after
+
+    def _reject(self, reason: str, retry_after: float):
+        self.counters[reason] += 1
+        raise HTTPException(
+            status_code=429,
+            detail="Too many agent requests, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def _queue_retry_after(self) -> float:
+        """Rough time for the current queue to drain."""
+        return self._avg_duration * (len(self._waiters) + 1) / max(1, self.max_concurrent)
+
+    async def _acquire(self):
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject("rejected_queue_full", self._queue_retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                self._release()  # a slot was handed over as we gave up
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject("rejected_queue_timeout", self._queue_retry_after())
+
+    def _release(self):
+        # Hand the slot straight to the next waiter, keeping in_flight unchanged
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, user_id: str):
+        """Admit one request for a user or raise HTTPException(429)."""
+        retry_after = self._take_token(user_id)
+        if retry_after:
+            self._reject("rejected_rate_limited", retry_after)
+        await self._acquire()
+        self.counters["admitted"] += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - started
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            self._release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current queue depth, utilisation and counters."""
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "max_queue_depth_seen": self.max_queue_depth,
+            "avg_duration_seconds": round(self._avg_duration, 3),
+            "tracked_users": len(self._buckets),
+            **self.counters,
+        }
@@ -0,0 +1,36 @@
+"""ETag / conditional GET helpers for per-user read endpoints."""
+import hashlib
+from typing import Optional
+from bson import ObjectId
+from fastapi import Request, Response
+from app.database.connection import get_database
+from app.services.version_service import VersionService
+
+async def _user_exists(user_id: str) -> bool:
+    if not ObjectId.is_valid(user_id):
+        return False
+    return await get_database().users.find_one({"_id": ObjectId(user_id)}, {"_id": 1}) is not None
+
+async def not_modified(request: Request, response: Response, user_id: str, kind: str,
+                       version: Optional[str] = None) -> Optional[Response]:
+    """Set the ETag for a user's data; return a 304 response if the client's copy is current.
+
+    The tag covers the data version and the query string, so filtered views
+    (e.g. ?status=pending) get their own validators. Pass version if it was
+    already read, so the body can be loaded under the same token.
+    ``If-None-Match: *`` only matches if the user exists.
+    """
+    if version is None:
+        version = await VersionService.get(user_id, kind)
+    variant = hashlib.blake2s(str(request.url.query).encode(), digest_size=4).hexdigest()
+    etag = f'W/"{kind}-{version}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        if etag in tags or etag[2:] in tags or ("*" in tags and await _user_exists(user_id)):
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
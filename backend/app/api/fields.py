@@ -0,0 +1,48 @@
+"""Sparse fieldsets for list endpoints.
+
+``?fields=title,due_date,status`` is validated against the full response
+model, turned into a Mongo projection (``mongo_projection``, shared with the
+services in app.models.common) so only those fields are read, and
+serialized through a partial model holding just those fields. Partial models
+and their serializers are built once per field set.
+"""
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Type
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+FieldSet = Tuple[str, ...]
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[FieldSet]:
+    """Validate a comma-separated field list; None means all fields."""
+    names = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not names:
+        return None
+    unknown = names - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                   f"Available: {', '.join(model.model_fields)}"
+        )
+    return tuple(name for name in model.model_fields if name in names)
+
+@lru_cache(maxsize=128)
+def partial_model(model: Type[BaseModel], names: FieldSet) -> Type[BaseModel]:
+    """A model with only the selected fields of model, keeping types and aliases."""
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=model.model_config,
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in names}
+    )
+
+@lru_cache(maxsize=128)
+def _list_adapter(model: Type[BaseModel], names: FieldSet) -> TypeAdapter:
+    return TypeAdapter(List[partial_model(model, names)])
+
+def partial_response(model: Type[BaseModel], names: FieldSet, docs: Iterable[dict],
+                     response: Response) -> Response:
+    """Serialize docs as a list of partial models, keeping headers already set (e.g. ETag)."""
+    adapter = _list_adapter(model, names)
+    body = adapter.dump_json(adapter.validate_python(list(docs)), by_alias=True)
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
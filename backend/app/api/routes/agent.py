@@ -1,35 +1,90 @@
 """Agent API routes."""
+import asyncio
+import logging
+import time
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
-from app.agents.langgraph_agent import agent
+from app.agents.langgraph_agent import get_agent, agent_loaded
+from app.agents.simulation import simulate_user
+from app.api.admission import AdmissionController
+from app.config import settings
+from app.models.simulation import SimulationRequest, SimulationResult
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
+admission = AdmissionController(
+    max_concurrent=settings.AGENT_MAX_CONCURRENCY,
+    max_queue=settings.AGENT_MAX_QUEUE,
+    queue_timeout=settings.AGENT_QUEUE_TIMEOUT_SECONDS,
+    rate_per_minute=settings.AGENT_RATE_PER_MINUTE,
+    burst=settings.AGENT_BURST,
+)
+
 @router.post("/plan/{user_id}")
 async def run_study_planning(user_id: str) -> Dict[str, Any]:
     """Run the study planning agent for a user."""
+    async with admission.admit(user_id):
+        started = time.perf_counter()
+        try:
+            result = await get_agent().run(user_id)
+            logger.info("Agent run finished", extra={
+                "user_id": user_id, "job": "agent",
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+            return result
+        except Exception as e:
+            logger.exception("Agent run failed", extra={
+                "user_id": user_id, "job": "agent",
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+            raise HTTPException(
+                status_code=500, 
+                detail=f"Error running agent: {str(e)}. Check backend logs for details."
+            )
+
+@router.post("/simulate/{user_id}", response_model=SimulationResult)
+async def simulate_planning(user_id: str, request: SimulationRequest):
+    """Show how hypothetical assignment and event edits would change the plan.
+
+    Only prioritization and scheduling are re-run, in memory: nothing is
+    stored, no reminders are sent and the LLM is not called. The request
+    gets SIMULATION_TIMEOUT_SECONDS: the database reads are cancelled by
+    wait_for, and the planning steps check the same deadline between plan
+    entries (a single entry is not interrupted). Either way the answer is 504.
+    """
+    timeout = settings.SIMULATION_TIMEOUT_SECONDS
     try:
-        result = await agent.run(user_id)
-        return result
-    except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Agent error: {error_details}")  # Log full error
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Error running agent: {str(e)}. Check backend logs for details."
+        result = await asyncio.wait_for(
+            simulate_user(user_id, request, time.monotonic() + timeout), timeout
         )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (asyncio.TimeoutError, TimeoutError):
+        logger.warning("Simulation timed out", extra={"user_id": user_id, "job": "simulate"})
+        raise HTTPException(status_code=504, detail="Simulation took too long, try fewer changes")
+    logger.info("Simulation finished", extra={
+        "user_id": user_id, "job": "simulate", "duration_ms": result["elapsed_ms"], "sampled": True
+    })
+    return result
 
 @router.get("/health")
 async def health_check():
     """Check agent health."""
-    from app.config import settings
     return {
         "status": "healthy",
         "agent_type": "StudyPlannerAgent",
-        "llm_available": agent.llm is not None,
+        "agent_loaded": agent_loaded(),
+        "llm_available": get_agent().llm is not None if agent_loaded() else bool(settings.HUGGINGFACE_API_KEY),
         "huggingface_api_key_set": bool(settings.HUGGINGFACE_API_KEY),
         "huggingface_model": settings.HUGGINGFACE_MODEL,
-        "note": "Agent works without Hugging Face API key but with limited AI features"
+        "note": "Agent works without Hugging Face API key but with limited AI features",
+        "admission": admission.metrics()
     }
 
+@router.get("/metrics")
+async def admission_metrics() -> Dict[str, Any]:
+    """Admission control metrics (queue depth, in-flight runs, rejections)."""
+    return admission.metrics()
+
@@ -1,9 +1,18 @@
 """Assignment API routes."""
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import List, Dict, Any
 from datetime import datetime
+from pymongo import ReturnDocument
 from app.models.assignment import Assignment, AssignmentCreate, AssignmentUpdate
+from app.models.common import mongo_projection
 from app.database.connection import get_database
+from app.api.etag import not_modified
+from app.api.fields import parse_fields, partial_response
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService
+from app.services.planning_service import PlanningService
+from app.services.version_service import VersionService
+from app.services.workload_service import WorkloadService
 from bson import ObjectId
 
 router = APIRouter(prefix="/assignments", tags=["assignments"])
@@ -21,51 +30,99 @@ async def create_assignment(assignment: AssignmentCreate):
     
     result = await db.assignments.insert_one(assignment_dict)
     assignment_dict["_id"] = result.inserted_id
+    await WorkloadService.assignment_changed(assignment.user_id, None, assignment_dict)
+    await PlanningService.mark_dirty(assignment.user_id, "assignment_created")
+    await VersionService.bump(assignment.user_id, "assignments")
     return Assignment(**assignment_dict)
 
 @router.get("/user/{user_id}", response_model=List[Assignment])
-async def get_user_assignments(user_id: str, status: str = None):
-    """Get all assignments for a user."""
+async def get_user_assignments(user_id: str, request: Request, response: Response,
+                               status: str = None, fields: str = None):
+    """Get all assignments for a user.
+    
+    fields (e.g. "title,due_date,status") limits the response to those fields.
+    """
+    names = parse_fields(fields, Assignment)
+    cached = await not_modified(request, response, user_id, "assignments")
+    if cached:
+        return cached
+    
     db = get_database()
     query = {"user_id": user_id}
     if status:
         query["status"] = status
     
-    cursor = db.assignments.find(query).sort("due_date", 1)
+    projection = mongo_projection(Assignment, names) if names else None
+    cursor = db.assignments.find(query, projection).sort("due_date", 1)
     assignments = await cursor.to_list(length=100)
+    if names:
+        return partial_response(Assignment, names, assignments, response)
     return [Assignment(**a) for a in assignments]
 
+@router.get("/user/{user_id}/summary")
+async def get_workload_summary(user_id: str) -> Dict[str, Any]:
+    """Get a user's workload summary (bucket counts and hours needed)."""
+    return await WorkloadService.get_summary(user_id)
+
+@router.get("/user/{user_id}/history", response_model=List[Assignment])
+async def get_assignment_history(user_id: str, response: Response, skip: int = 0, limit: int = 50,
+                                 fields: str = None):
+    """Get a user's completed assignments, newest first, including archived ones."""
+    names = parse_fields(fields, Assignment)
+    docs = await ArchiveService.find_both_tiers(
+        "assignments", {"user_id": user_id, "status": "completed"}, "due_date",
+        descending=True, skip=skip, limit=min(limit, 100),
+        projection=mongo_projection(Assignment, names) if names else None
+    )
+    if names:
+        return partial_response(Assignment, names, docs, response)
+    return [Assignment(**a) for a in docs]
+
 @router.get("/{assignment_id}", response_model=Assignment)
 async def get_assignment(assignment_id: str):
-    """Get an assignment by ID."""
-    db = get_database()
-    assignment = await db.assignments.find_one({"_id": ObjectId(assignment_id)})
+    """Get an assignment by ID (archived assignments included)."""
+    assignment = await ArchiveService.find_assignment(assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
     return Assignment(**assignment)
 
 @router.put("/{assignment_id}", response_model=Assignment)
 async def update_assignment(assignment_id: str, assignment: AssignmentUpdate):
-    """Update an assignment."""
+    """Update an assignment (an archived one is moved back to the active list first)."""
     db = get_database()
     update_data = {k: v for k, v in assignment.model_dump().items() if v is not None}
     update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.assignments.find_one_and_update(
-        {"_id": ObjectId(assignment_id)},
-        {"$set": update_data},
-        return_document=True
-    )
-    if not result:
+    async def update():
+        return await db.assignments.find_one_and_update(
+            {"_id": ObjectId(assignment_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
+        )
+    
+    previous = await update()
+    if not previous and await ArchiveService.restore_assignment(assignment_id):
+        previous = await update()
+    if not previous:
         raise HTTPException(status_code=404, detail="Assignment not found")
+    result = {**previous, **update_data}
+    await WorkloadService.assignment_changed(result["user_id"], previous, result)
+    await PlanningService.mark_dirty(result["user_id"], "assignment_updated")
+    await VersionService.bump(result["user_id"], "assignments")
     return Assignment(**result)
 
 @router.delete("/{assignment_id}")
 async def delete_assignment(assignment_id: str):
-    """Delete an assignment."""
+    """Delete an assignment, archived or not."""
     db = get_database()
-    result = await db.assignments.delete_one({"_id": ObjectId(assignment_id)})
-    if result.deleted_count == 0:
+    deleted = await db.assignments.find_one_and_delete({"_id": ObjectId(assignment_id)})
+    if not deleted:
+        deleted = await ArchiveService.delete_archived_assignment(assignment_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Assignment not found")
+    await WorkloadService.assignment_changed(deleted["user_id"], deleted, None)
+    await ExportService.record_deletions("assignments", [deleted])
+    await PlanningService.mark_dirty(deleted["user_id"], "assignment_deleted")
+    await VersionService.bump(deleted["user_id"], "assignments")
     return {"message": "Assignment deleted successfully"}
 
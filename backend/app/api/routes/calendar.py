@@ -0,0 +1,21 @@
+"""Calendar API routes."""
+from fastapi import APIRouter, HTTPException
+from typing import List
+from app.models.calendar import FreeSlot, GroupFreeSlotsRequest
+from app.services.calendar_service import CalendarService
+
+router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+@router.post("/group-free-slots", response_model=List[FreeSlot])
+async def get_group_free_slots(request: GroupFreeSlotsRequest):
+    """Find common free windows for a group of users."""
+    if request.end_time <= request.start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    return await CalendarService.get_group_free_slots(
+        list(dict.fromkeys(request.user_ids)),
+        request.start_time,
+        request.end_time,
+        request.min_duration_hours,
+        include_classes=request.include_classes,
+        limit=request.limit
+    )
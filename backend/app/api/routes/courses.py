@@ -1,9 +1,14 @@
 """Course API routes."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 from datetime import datetime
 from app.models.course import Course, CourseCreate, CourseUpdate
+from app.api.etag import not_modified
+from app.api.fields import parse_fields, partial_response
+from app.services.availability_service import AvailabilityService
 from app.services.course_service import CourseService
+from app.services.planning_service import PlanningService
+from app.services.version_service import VersionService
 from bson import ObjectId
 
 router = APIRouter(prefix="/courses", tags=["courses"])
@@ -11,12 +16,29 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 @router.post("/", response_model=Course)
 async def create_course(course: CourseCreate):
     """Create a new course."""
-    return await CourseService.create_course(course)
+    created = await CourseService.create_course(course)
+    AvailabilityService.invalidate(created.user_id)
+    await PlanningService.mark_dirty(created.user_id, "course_created")
+    await VersionService.bump(created.user_id, "courses")
+    return created
 
 @router.get("/user/{user_id}", response_model=List[Course])
-async def get_user_courses(user_id: str):
-    """Get all courses for a user."""
-    return await CourseService.get_user_courses(user_id)
+async def get_user_courses(user_id: str, request: Request, response: Response, fields: str = None):
+    """Get all courses for a user.
+    
+    fields (e.g. "name,code") limits the response to those fields.
+    """
+    names = parse_fields(fields, Course)
+    version = await VersionService.get(user_id, "courses")
+    cached = await not_modified(request, response, user_id, "courses", version)
+    if cached:
+        return cached
+    courses = await CourseService.get_user_courses(user_id, version)
+    if names:
+        # Courses come from the read-through cache, so there is no projection to push down
+        docs = [course.model_dump(by_alias=True, include=set(names)) for course in courses]
+        return partial_response(Course, names, docs, response)
+    return courses
 
 @router.get("/{course_id}", response_model=Course)
 async def get_course(course_id: str):
@@ -32,13 +54,20 @@ async def update_course(course_id: str, course: CourseUpdate):
     updated_course = await CourseService.update_course(course_id, course)
     if not updated_course:
         raise HTTPException(status_code=404, detail="Course not found")
+    if course.schedule is not None:
+        AvailabilityService.invalidate(updated_course.user_id)
+    await PlanningService.mark_dirty(updated_course.user_id, "course_updated")
+    await VersionService.bump(updated_course.user_id, "courses")
     return updated_course
 
 @router.delete("/{course_id}")
 async def delete_course(course_id: str):
     """Delete a course."""
-    success = await CourseService.delete_course(course_id)
-    if not success:
+    deleted = await CourseService.delete_course(course_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Course not found")
+    AvailabilityService.invalidate(deleted.user_id)
+    await PlanningService.mark_dirty(deleted.user_id, "course_deleted")
+    await VersionService.bump(deleted.user_id, "courses")
     return {"message": "Course deleted successfully"}
 
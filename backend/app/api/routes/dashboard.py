@@ -0,0 +1,14 @@
+"""Dashboard API routes."""
+from fastapi import APIRouter, HTTPException
+from app.models.dashboard import Dashboard
+from app.services.dashboard_service import DashboardService
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+@router.get("/{user_id}", response_model=Dashboard)
+async def get_dashboard(user_id: str):
+    """Get everything the home view needs in one call."""
+    dashboard = await DashboardService.get_dashboard(user_id)
+    if not dashboard:
+        raise HTTPException(status_code=404, detail="User not found")
+    return dashboard
@@ -0,0 +1,80 @@
+"""WebSocket push channel for reminders and plan updates."""
+import asyncio
+import contextlib
+import time
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from app.config import settings
+from app.services.push_service import hub
+
+router = APIRouter(prefix="/ws", tags=["push"])
+
+def _retrieve(task: asyncio.Task):
+    """Mark a connection task's exception as seen; the handler decides what to do with it."""
+    if not task.cancelled():
+        task.exception()
+
+@router.websocket("/{user_id}")
+async def push_updates(websocket: WebSocket, user_id: str):
+    """Push a user's reminders and plan updates as JSON messages.
+
+    Messages look like {"type": "reminder" | "plan_updated", "at": ..., ...}.
+    After PUSH_HEARTBEAT_SECONDS without traffic the server sends
+    {"type": "ping"}; clients answer with any text (a "ping" text gets a pong).
+    Connections silent for PUSH_IDLE_TIMEOUT_SECONDS are closed, as are
+    connections that fall PUSH_QUEUE_SIZE messages behind (code 1013).
+    """
+    try:
+        subscription = hub.subscribe(user_id)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    last_seen = time.monotonic()
+
+    async def receive():
+        nonlocal last_seen
+        while True:
+            text = await websocket.receive_text()
+            last_seen = time.monotonic()
+            if text == "ping":
+                with contextlib.suppress(asyncio.QueueFull):
+                    subscription.queue.put_nowait({"type": "pong"})
+
+    async def send():
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), settings.PUSH_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                message = {"type": "ping"}
+            if time.monotonic() - last_seen > settings.PUSH_IDLE_TIMEOUT_SECONDS:
+                return 1001, "Idle timeout"
+            await websocket.send_json(message)
+
+    async def overflowed():
+        await subscription.overflowed.wait()
+        return 1013, "Too slow, reconnect and refresh"
+
+    try:
+        await websocket.accept()
+        tasks = [asyncio.ensure_future(f()) for f in (receive, send, overflowed)]
+        for task in tasks:
+            task.add_done_callback(_retrieve)
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let the sender stop before the close below. asyncio.wait, unlike
+            # gather, can itself be cancelled cleanly if the server cancels us.
+            await asyncio.wait(tasks)
+        finished = [task for task in tasks if not task.cancelled()]
+        if any(isinstance(task.exception(), WebSocketDisconnect) for task in finished):
+            return
+        for task in finished:
+            if task.exception() is None:
+                code, reason = task.result()
+                await websocket.close(code=code, reason=reason)
+                return
+        raise finished[0].exception()
+    finally:
+        hub.unsubscribe(subscription)
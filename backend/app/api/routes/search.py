@@ -0,0 +1,49 @@
+"""Search API routes."""
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException
+from app.models.common import naive_utc
+from app.models.search import SearchResult
+from app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+TYPES = ("assignments", "courses")
+
+def _values(param: Optional[str]) -> List[str]:
+    return [v.strip() for v in param.split(",") if v.strip()] if param else []
+
+@router.get("/{user_id}", response_model=SearchResult)
+async def search(user_id: str, q: Optional[str] = None, types: str = "assignments,courses",
+                 category: Optional[str] = None, status: Optional[str] = None,
+                 course_id: Optional[str] = None, due_after: Optional[datetime] = None,
+                 due_before: Optional[datetime] = None, skip: int = 0, limit: int = 20):
+    """Search a user's assignments and courses.
+
+    q is matched against assignment titles/descriptions and course names/codes
+    (whole words, stemmed; "quoted phrases" and -excluded words work) and
+    results are ranked by relevance. Without q, assignments are listed by due
+    date. category, status and course_id take comma-separated values and,
+    like due_after/due_before, only narrow assignments. Assignment results
+    include facet counts for category, status, course_id and due-date buckets.
+    """
+    searched = _values(types)
+    unknown = [t for t in searched if t not in TYPES]
+    if unknown or not searched:
+        raise HTTPException(status_code=400, detail=f"types must be among: {', '.join(TYPES)}")
+    q = q.strip() if q else None
+    skip, limit = max(skip, 0), max(1, min(limit, 100))
+
+    filters: Dict[str, List[str]] = {
+        "category": _values(category), "status": _values(status), "course_id": _values(course_id)
+    }
+    searches = {}
+    if "assignments" in searched:
+        searches["assignments"] = SearchService.search_assignments(
+            user_id, q, filters, naive_utc(due_after), naive_utc(due_before), skip, limit
+        )
+    if "courses" in searched:
+        searches["courses"] = SearchService.search_courses(user_id, q, skip, limit)
+    results = await asyncio.gather(*searches.values())
+    return {"query": q, **dict(zip(searches, results))}
@@ -1,9 +1,14 @@
 """User API routes."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 from datetime import datetime
 from app.models.user import User, UserCreate, UserUpdate
 from app.database.connection import get_database
+from app.api.etag import not_modified
+from app.services.availability_service import AvailabilityService
+from app.services.planning_service import PlanningService
+from app.services.user_service import UserService
+from app.services.version_service import VersionService
 from bson import ObjectId
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -23,27 +28,27 @@ async def create_user(user: UserCreate):
     return User(**user_dict)
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(user_id: str):
+async def get_user(user_id: str, request: Request, response: Response):
     """Get a user by ID."""
-    db = get_database()
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
+    version = await VersionService.get(user_id, "user")
+    cached = await not_modified(request, response, user_id, "user", version)
+    if cached:
+        return cached
+    
+    found = await UserService.get_user(user_id, version)
+    if not found:
         raise HTTPException(status_code=404, detail="User not found")
-    return User(**user)
+    return found
 
 @router.put("/{user_id}", response_model=User)
 async def update_user(user_id: str, user: UserUpdate):
     """Update a user."""
-    db = get_database()
-    update_data = {k: v for k, v in user.model_dump().items() if v is not None}
-    update_data["updated_at"] = datetime.utcnow()
-    
-    result = await db.users.find_one_and_update(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data},
-        return_document=True
-    )
-    if not result:
+    updated = await UserService.update_user(user_id, user)
+    if not updated:
         raise HTTPException(status_code=404, detail="User not found")
-    return User(**result)
+    await VersionService.bump(user_id, "user")
+    if user.timezone is not None or user.study_preferences is not None:
+        AvailabilityService.invalidate(user_id)
+        await PlanningService.mark_dirty(user_id, "preferences_updated")
+    return updated
 
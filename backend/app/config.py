@@ -17,9 +17,67 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173"]
     
+    # Responses smaller than this (bytes) are sent uncompressed
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+    
     # Hugging Face / LLM (for LangGraph)
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
     HUGGINGFACE_MODEL: str = os.getenv("HUGGINGFACE_MODEL", "meta-llama/Llama-3.1-8B-Instruct")
+    AGENT_PREWARM: bool = os.getenv("AGENT_PREWARM", "false").lower() == "true"  # build agent at startup
+    
+    # Agent run recording for offline replay (benchmarks/agent_replay.py); empty = off
+    AGENT_RECORD_DIR: str = os.getenv("AGENT_RECORD_DIR", "")
+    AGENT_RECORD_SAMPLE_RATE: float = float(os.getenv("AGENT_RECORD_SAMPLE_RATE", "1.0"))
+    AGENT_RECORD_SLOW_MS: float = float(os.getenv("AGENT_RECORD_SLOW_MS", "0"))  # only keep slower runs
+    
+    # Agent admission control
+    AGENT_MAX_CONCURRENCY: int = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+    AGENT_MAX_QUEUE: int = int(os.getenv("AGENT_MAX_QUEUE", "16"))
+    AGENT_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AGENT_QUEUE_TIMEOUT_SECONDS", "10"))
+    AGENT_RATE_PER_MINUTE: float = float(os.getenv("AGENT_RATE_PER_MINUTE", "6"))  # per user
+    AGENT_BURST: int = int(os.getenv("AGENT_BURST", "3"))
+    
+    # Planning job
+    # Minutes between dirty-user planning passes (0 = only the daily run)
+    DIRTY_PLANNING_INTERVAL_MINUTES: int = int(os.getenv("DIRTY_PLANNING_INTERVAL_MINUTES", "0"))
+    # Worker processes for CPU-bound planning (0 = run the agent on the event loop)
+    PLANNING_WORKERS: int = int(os.getenv("PLANNING_WORKERS", "0"))
+    PLANNING_BATCH_SIZE: int = int(os.getenv("PLANNING_BATCH_SIZE", "50"))
+    # Availability bitmaps kept in memory per process (least recently used are dropped)
+    AVAILABILITY_MAX_BITMAPS: int = int(os.getenv("AVAILABILITY_MAX_BITMAPS", "2000"))
+    
+    # Archival of cold data
+    ARCHIVE_COMPLETED_AFTER_DAYS: int = int(os.getenv("ARCHIVE_COMPLETED_AFTER_DAYS", "30"))
+    ARCHIVE_EVENTS_AFTER_DAYS: int = int(os.getenv("ARCHIVE_EVENTS_AFTER_DAYS", "7"))
+    
+    # What-if planning
+    SIMULATION_TIMEOUT_SECONDS: float = float(os.getenv("SIMULATION_TIMEOUT_SECONDS", "2"))
+    
+    # WebSocket push channel
+    PUSH_QUEUE_SIZE: int = int(os.getenv("PUSH_QUEUE_SIZE", "100"))  # per connection
+    PUSH_MAX_CONNECTIONS_PER_USER: int = int(os.getenv("PUSH_MAX_CONNECTIONS_PER_USER", "10"))
+    PUSH_HEARTBEAT_SECONDS: float = float(os.getenv("PUSH_HEARTBEAT_SECONDS", "25"))
+    PUSH_IDLE_TIMEOUT_SECONDS: float = float(os.getenv("PUSH_IDLE_TIMEOUT_SECONDS", "75"))
+    
+    # Analytics export (Parquet files, read from a secondary when available)
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", "exports")
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    # Only export changes older than this, so in-flight writes aren't skipped
+    EXPORT_LAG_SECONDS: int = int(os.getenv("EXPORT_LAG_SECONDS", "60"))
+    # Tombstones of deleted/archived documents are kept this long for incremental exports
+    EXPORT_TOMBSTONE_DAYS: int = int(os.getenv("EXPORT_TOMBSTONE_DAYS", "30"))
+    
+    # Read-through cache for users and courses
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+    
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json or text
+    # Fraction of high-volume per-user/per-reminder records kept
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
     
     # Calendar Integration
     GOOGLE_CALENDAR_CLIENT_ID: str = os.getenv("GOOGLE_CALENDAR_CLIENT_ID", "")
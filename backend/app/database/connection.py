@@ -1,7 +1,10 @@
 """Database connection setup."""
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class Database:
     """Database connection manager."""
     client: AsyncIOMotorClient = None
@@ -11,15 +14,53 @@ db = Database()
 async def connect_to_mongo():
     """Create database connection."""
     db.client = AsyncIOMotorClient(settings.MONGODB_URL)
-    print(f"Connected to MongoDB: {settings.DATABASE_NAME}")
+    logger.info("Connected to MongoDB", extra={"database": settings.DATABASE_NAME})
 
 async def close_mongo_connection():
     """Close database connection."""
     if db.client:
         db.client.close()
-        print("Disconnected from MongoDB")
+        db.client = None
+        logger.info("Disconnected from MongoDB")
 
 def get_database():
     """Get database instance."""
     return db.client[settings.DATABASE_NAME]
 
+# Indexes for the hot query paths and the archive tiers; an entry is a key
+# list, or (key list, create_index options)
+INDEXES = {
+    "assignments": [
+        [("user_id", 1), ("status", 1), ("due_date", 1)],
+        [("status", 1), ("updated_at", 1)],
+        [("updated_at", 1)],
+        ([("user_id", 1), ("title", "text"), ("description", "text")],
+         {"weights": {"title": 10, "description": 1}, "name": "assignment_search"}),
+    ],
+    "assignments_archive": [[("user_id", 1), ("due_date", -1)]],
+    "calendar_events": [[("user_id", 1), ("start_time", 1)], [("end_time", 1)], [("updated_at", 1)]],
+    "calendar_events_archive": [[("user_id", 1), ("start_time", 1)]],
+    "courses": [
+        [("user_id", 1)],
+        ([("user_id", 1), ("name", "text"), ("code", "text")],
+         {"weights": {"name": 5, "code": 10}, "name": "course_search"}),
+    ],
+    "workload_summaries": [[("replan_at", 1)], [("next_boundary", 1)]],
+    "planning_queue": [[("dirty_since", 1)]],
+    "deletions": [
+        [("collection", 1), ("deleted_at", 1)],
+        ([("deleted_at", 1)], {"expireAfterSeconds": settings.EXPORT_TOMBSTONE_DAYS * 86400}),
+    ],
+}
+
+async def ensure_indexes():
+    """Create the application's indexes (no-op for ones that already exist)."""
+    database = get_database()
+    try:
+        for collection, indexes in INDEXES.items():
+            for index in indexes:
+                keys, options = index if isinstance(index, tuple) else (index, {})
+                await database[collection].create_index(keys, **options)
+    except Exception as e:
+        logger.warning("Could not create MongoDB indexes: %s", e)
+
@@ -0,0 +1,123 @@
+"""Queue-backed structured logging.
+
+``setup_logging`` routes the root logger through a bounded in-memory queue.
+Callers only pay for building the record and a non-blocking put; a
+background listener thread formats records as one JSON object per line and
+writes them to stdout. If the queue is full, records are dropped and
+counted rather than stalling the event loop.
+
+Context goes in ``extra`` and becomes top-level JSON fields::
+
+    logger.info("Generated study plan", extra={"user_id": uid, "job": "planning",
+                                               "duration_ms": 12.5, "sampled": True})
+
+Records marked ``sampled`` are high-volume (once per user or per reminder).
+Below WARNING they are kept with probability ``LOG_SAMPLE_RATE``, and the
+kept records carry ``sample_rate`` so counts can be scaled back up.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from app.config import settings
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with extra fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key != "sampled":
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records marked ``sampled`` below WARNING."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False) or record.levelno >= logging.WARNING:
+            return True
+        if self.rate < 1 and random.random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback here, since args and exc_info may not
+        # survive the hand-off. Formatting happens on the listener thread.
+        record = logging.makeLogRecord(vars(record))
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+
+def setup_logging():
+    """Install the queue handler on the root logger (idempotent)."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    _handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    _handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE))
+    root = logging.getLogger()
+    root.handlers = [_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(_handler.queue, output)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    if _handler.dropped:
+        print(f"Logging queue overflowed, {_handler.dropped} records dropped", file=sys.stderr)
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full."""
+    return _handler.dropped if _handler else 0
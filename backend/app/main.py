@@ -1,19 +1,34 @@
 """Main FastAPI application."""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
-from app.database.connection import connect_to_mongo, close_mongo_connection
-from app.api.routes import users, courses, assignments, agent
+from app.logging_config import setup_logging, shutdown_logging
+from app.database.connection import connect_to_mongo, close_mongo_connection, ensure_indexes
+from app.api.routes import users, courses, assignments, agent, calendar, dashboard, push, search
+from app.services.cache_service import cache
+from app.services.push_service import hub
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events for the application."""
     # Startup
+    setup_logging()
     await connect_to_mongo()
+    await ensure_indexes()
+    if settings.AGENT_PREWARM:
+        # Build the LangGraph agent off the event loop so the first
+        # /agent/plan request doesn't pay for the import and compile.
+        from app.agents.langgraph_agent import get_agent
+        await asyncio.to_thread(get_agent)
     yield
     # Shutdown
+    from app.agents.langgraph_agent import wait_for_recordings
+    await wait_for_recordings()  # agent recordings still being written
     await close_mongo_connection()
+    shutdown_logging()
 
 app = FastAPI(
     title=settings.API_TITLE,
@@ -28,13 +43,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress large responses (user lists, agent plans)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 # Include routers
 app.include_router(users.router, prefix=settings.API_PREFIX)
 app.include_router(courses.router, prefix=settings.API_PREFIX)
 app.include_router(assignments.router, prefix=settings.API_PREFIX)
 app.include_router(agent.router, prefix=settings.API_PREFIX)
+app.include_router(calendar.router, prefix=settings.API_PREFIX)
+app.include_router(dashboard.router, prefix=settings.API_PREFIX)
+app.include_router(push.router, prefix=settings.API_PREFIX)
+app.include_router(search.router, prefix=settings.API_PREFIX)
 
 @app.get("/")
 async def root():
@@ -48,7 +71,7 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "cache": cache.stats(), "push": hub.metrics()}
 
 if __name__ == "__main__":
     import uvicorn
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.models.common import UTCDatetime
 from app.models.user import PyObjectId
 
 class AssignmentBase(BaseModel):
@@ -10,7 +11,7 @@ class AssignmentBase(BaseModel):
     title: str
     description: Optional[str] = None
     course_id: str
-    due_date: datetime
+    due_date: UTCDatetime
     priority: int = Field(default=3, ge=1, le=5)  # 1-5 scale
     estimated_hours: float = Field(default=2.0, ge=0)
     status: str = Field(default="pending")  # pending, in_progress, completed
@@ -24,7 +25,7 @@ class AssignmentUpdate(BaseModel):
     """Assignment update model."""
     title: Optional[str] = None
     description: Optional[str] = None
-    due_date: Optional[datetime] = None
+    due_date: Optional[UTCDatetime] = None
     priority: Optional[int] = Field(None, ge=1, le=5)
     estimated_hours: Optional[float] = Field(None, ge=0)
     status: Optional[str] = None
@@ -1,16 +1,17 @@
 """Calendar event model."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from bson import ObjectId
+from app.models.common import UTCDatetime
 from app.models.user import PyObjectId
 
 class CalendarEventBase(BaseModel):
     """Base calendar event model."""
     title: str
     description: Optional[str] = None
-    start_time: datetime
-    end_time: datetime
+    start_time: UTCDatetime
+    end_time: UTCDatetime
     event_type: str  # class, study, personal, exam, etc.
     location: Optional[str] = None
     source: str = "manual"  # manual, course_sync, agent_suggestion
@@ -23,8 +24,8 @@ class CalendarEventUpdate(BaseModel):
     """Calendar event update model."""
     title: Optional[str] = None
     description: Optional[str] = None
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
+    start_time: Optional[UTCDatetime] = None
+    end_time: Optional[UTCDatetime] = None
     event_type: Optional[str] = None
     location: Optional[str] = None
 
@@ -42,3 +43,18 @@ class CalendarEvent(CalendarEventBase):
         "json_encoders": {ObjectId: str},
     }
 
+
+class GroupFreeSlotsRequest(BaseModel):
+    """Request for common free time across a study group."""
+    user_ids: List[str] = Field(min_length=1, max_length=200)
+    start_time: UTCDatetime
+    end_time: UTCDatetime
+    min_duration_hours: float = Field(default=1.0, gt=0)
+    include_classes: bool = True
+    limit: int = Field(default=100, ge=1, le=1000)
+
+class FreeSlot(BaseModel):
+    """A free time window."""
+    start: datetime
+    end: datetime
+    duration_hours: float
@@ -0,0 +1,24 @@
+"""Field types and helpers shared by the models."""
+from datetime import datetime, timezone
+from typing import Annotated, Iterable, Optional, Type
+from pydantic import AfterValidator, BaseModel
+
+def naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Normalise to the naive UTC datetimes Mongo stores and returns."""
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+# Datetime accepted with or without an offset and kept as naive UTC, so it
+# compares with stored times
+UTCDatetime = Annotated[datetime, AfterValidator(naive_utc)]
+
+def mongo_projection(model: Type[BaseModel], names: Optional[Iterable[str]] = None) -> dict:
+    """Projection reading a model's fields (or only names) by their stored names.
+
+    _id is left out unless the model maps a field to it.
+    """
+    names = model.model_fields if names is None else names
+    projection = {model.model_fields[name].alias or name: 1 for name in names}
+    projection.setdefault("_id", 0)
+    return projection
@@ -1,17 +1,65 @@
 """Course model."""
-from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from datetime import datetime, date, time
+from typing import Optional, List, Tuple
+from pydantic import BaseModel, Field, field_validator
 from bson import ObjectId
 from app.models.user import PyObjectId
 
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+class CourseMeeting(BaseModel):
+    """A weekly recurring class meeting (local wall-clock times)."""
+    days: Tuple[int, ...]  # 0=Monday ... 6=Sunday
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+
+    model_config = {"frozen": True}
+
+    @field_validator("days", mode="before")
+    @classmethod
+    def parse_days(cls, v):
+        """Accept weekday numbers or names like "Mon" / "monday"."""
+        if isinstance(v, (str, int)):
+            v = [v]
+        days = []
+        for day in v:
+            if isinstance(day, str):
+                day = WEEKDAYS.index(day.strip().lower()[:3])
+            if not 0 <= int(day) <= 6:
+                raise ValueError("Weekday must be between 0 (Monday) and 6 (Sunday)")
+            days.append(int(day))
+        return tuple(sorted(set(days)))
+
+class CourseSchedule(BaseModel):
+    """Recurrence model for Course.schedule.
+
+    Stored in Mongo as a plain dict, e.g.::
+
+        {"meetings": [{"days": ["Mon", "Wed"], "start_time": "10:00", "end_time": "11:15"}],
+         "start_date": "2026-09-01", "end_date": "2026-12-15",
+         "exceptions": ["2026-11-25"], "timezone": "America/New_York"}
+    """
+    meetings: Tuple[CourseMeeting, ...] = ()
+    start_date: Optional[date] = None  # semester bounds (inclusive)
+    end_date: Optional[date] = None
+    exceptions: Tuple[date, ...] = ()  # dates with no class
+    timezone: str = "UTC"
+
+    model_config = {"frozen": True}
+
+    @field_validator("meetings", "exceptions", mode="before")
+    @classmethod
+    def to_tuple(cls, v):
+        return tuple(v) if isinstance(v, list) else v
+
 class CourseBase(BaseModel):
     """Base course model."""
     name: str
     code: str
     credits: int
     instructor: Optional[str] = None
-    schedule: dict = Field(default_factory=dict)  # days, times, location
+    schedule: dict = Field(default_factory=dict)  # see CourseSchedule
     semester: str
 
 class CourseCreate(CourseBase):
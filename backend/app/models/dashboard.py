@@ -0,0 +1,62 @@
+"""Dashboard payload models (compact views of the underlying documents)."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from app.models.user import PyObjectId
+
+_config = {
+    "populate_by_name": True,
+    "arbitrary_types_allowed": True,
+    "json_encoders": {ObjectId: str},
+}
+
+class DashboardUser(BaseModel):
+    """The user fields the dashboard shows."""
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    email: str
+    timezone: str = "UTC"
+
+    model_config = _config
+
+class DashboardCourse(BaseModel):
+    """A course in the dashboard sidebar."""
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    code: str
+    instructor: Optional[str] = None
+
+    model_config = _config
+
+class DashboardAssignment(BaseModel):
+    """A pending assignment with its stored study suggestions."""
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    course_id: str
+    due_date: datetime
+    priority: int = 3
+    estimated_hours: float = 2.0
+    status: str = "pending"
+    suggested_study_times: List[datetime] = Field(default_factory=list)
+
+    model_config = _config
+
+class DashboardEvent(BaseModel):
+    """An upcoming calendar event."""
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    start_time: datetime
+    end_time: datetime
+    event_type: str
+    location: Optional[str] = None
+
+    model_config = _config
+
+class Dashboard(BaseModel):
+    """Everything the home view needs in one response."""
+    user: DashboardUser
+    courses: List[DashboardCourse]
+    assignments: List[DashboardAssignment]
+    events: List[DashboardEvent]
+    workload: Dict[str, Any]
@@ -0,0 +1,62 @@
+"""Search result models."""
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from app.models.user import PyObjectId
+
+_config = {
+    "populate_by_name": True,
+    "arbitrary_types_allowed": True,
+    "json_encoders": {ObjectId: str},
+}
+
+class FacetValue(BaseModel):
+    """A facet value and how many matches have it."""
+    value: Optional[str] = None
+    count: int
+    label: Optional[str] = None  # course name for course_id values
+    start: Optional[datetime] = None  # due-date bucket bounds, for due_after/due_before
+    end: Optional[datetime] = None
+
+class AssignmentHit(BaseModel):
+    """An assignment matching a search."""
+    id: PyObjectId = Field(alias="_id")
+    title: str
+    course_id: str
+    due_date: datetime
+    priority: int = 3
+    estimated_hours: float = 2.0
+    status: str = "pending"
+    category: Optional[str] = None
+    score: Optional[float] = None  # text relevance, when searching with a query
+
+    model_config = _config
+
+class CourseHit(BaseModel):
+    """A course matching a search."""
+    id: PyObjectId = Field(alias="_id")
+    name: str
+    code: str
+    instructor: Optional[str] = None
+    semester: Optional[str] = None
+    score: Optional[float] = None
+
+    model_config = _config
+
+class AssignmentSearch(BaseModel):
+    """A page of assignment matches, with facet counts over all matches."""
+    total: int
+    results: List[AssignmentHit]
+    facets: Dict[str, List[FacetValue]]
+
+class CourseSearch(BaseModel):
+    """A page of course matches."""
+    total: int
+    results: List[CourseHit]
+
+class SearchResult(BaseModel):
+    """Search results per type; a type that was not searched is null."""
+    query: Optional[str] = None
+    assignments: Optional[AssignmentSearch] = None
+    courses: Optional[CourseSearch] = None
@@ -0,0 +1,77 @@
+"""What-if planning models: hypothetical edits and the resulting plan diff."""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from app.models.common import UTCDatetime
+
+class AssignmentChange(BaseModel):
+    """Edit, drop or (without id) add an assignment."""
+    id: Optional[str] = None  # pending assignment to edit; omit to add one
+    remove: bool = False
+    title: Optional[str] = None
+    due_date: Optional[UTCDatetime] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    estimated_hours: Optional[float] = Field(None, ge=0)
+    status: Optional[str] = None  # "completed" drops it from the plan
+
+    @model_validator(mode="after")
+    def check_new(self):
+        if self.id is None and (self.remove or self.title is None or self.due_date is None):
+            raise ValueError("New assignments need a title and due_date")
+        return self
+
+class EventChange(BaseModel):
+    """Add an event, or move (with new times) or remove an existing one by id."""
+    id: Optional[str] = None
+    remove: bool = False
+    start_time: Optional[UTCDatetime] = None
+    end_time: Optional[UTCDatetime] = None
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.remove:
+            if self.id is None:
+                raise ValueError("Removing an event needs its id")
+        elif self.start_time is None or self.end_time is None or self.end_time <= self.start_time:
+            raise ValueError("start_time and end_time are required, with end_time after start_time")
+        return self
+
+class SimulationRequest(BaseModel):
+    """Hypothetical edits to apply on top of the user's current planning state."""
+    assignments: List[AssignmentChange] = Field(default_factory=list, max_length=50)
+    events: List[EventChange] = Field(default_factory=list, max_length=50)
+
+    @model_validator(mode="after")
+    def check_unique_ids(self):
+        """One change per existing assignment or event; combine edits into a single change."""
+        for name, changes in (("assignment", self.assignments), ("event", self.events)):
+            ids = [c.id for c in changes if c.id is not None]
+            if len(ids) != len(set(ids)):
+                raise ValueError(f"Each {name} id may appear in only one change")
+        return self
+
+class PlanEntry(BaseModel):
+    """One assignment's place in the plan."""
+    assignment_id: str  # "new:<n>" for the n-th added assignment
+    title: str
+    rank: int  # 1-based position in the priority ranking
+    suggested_times: List[datetime]
+
+class PlanChange(BaseModel):
+    """How an assignment's place in the plan differs between now and the what-if."""
+    assignment_id: str
+    title: str
+    change: str  # added, dropped, moved, rescheduled
+    rank_before: Optional[int] = None
+    rank_after: Optional[int] = None
+    times_before: List[datetime] = Field(default_factory=list)
+    times_after: List[datetime] = Field(default_factory=list)
+
+class SimulationResult(BaseModel):
+    """The simulated plan and its differences from the current one."""
+    user_id: str
+    now: datetime
+    plan: List[PlanEntry]
+    changes: List[PlanChange]
+    rescheduled: int  # plan entries whose study times were recomputed
+    elapsed_ms: float
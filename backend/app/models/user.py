@@ -1,9 +1,7 @@
 """User model."""
 from datetime import datetime
 from typing import Optional, List, Annotated, Union
-from pydantic import BaseModel, EmailStr, Field, GetJsonSchemaHandler
-from pydantic.json_schema import JsonSchemaValue
-from pydantic_core import core_schema
+from pydantic import BaseModel, BeforeValidator, EmailStr, Field, PlainSerializer, WithJsonSchema
 from bson import ObjectId
 
 def validate_object_id(v: Union[str, ObjectId]) -> ObjectId:
@@ -16,16 +14,13 @@ def validate_object_id(v: Union[str, ObjectId]) -> ObjectId:
         raise ValueError("Invalid ObjectId string")
     raise ValueError("Must be a string or ObjectId")
 
-def get_object_id_schema(
-    _source_type: type[ObjectId], handler: GetJsonSchemaHandler
-) -> JsonSchemaValue:
-    """Generate JSON schema for ObjectId."""
-    return {"type": "string", "format": "objectid"}
-
+# Accepts ObjectId or its hex string (e.g. from a model_dump(mode="json")
+# round-trip) and serializes to a string in JSON.
 PyObjectId = Annotated[
     ObjectId,
-    core_schema.no_info_plain_validator_function(validate_object_id),
-    core_schema.json_schema(get_object_id_schema),
+    BeforeValidator(validate_object_id),
+    PlainSerializer(str, return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "format": "objectid"}),
 ]
 
 class UserBase(BaseModel):
@@ -0,0 +1,124 @@
+"""Hot/cold tiering for assignments and calendar events.
+
+Completed assignments and past events are moved out of the hot collections
+that the planner and list endpoints query into ``assignments_archive`` and
+``calendar_events_archive``. Each batch is upserted into the archive with one
+bulk_write and then removed from the hot collection, so re-running after a
+crash is safe. A document is only removed if it is unchanged since it was
+read (same ``updated_at``, still matching the archive query); one edited in
+between, e.g. reopened, stays hot and its archive copy is dropped again.
+Updating an archived assignment restores it to the hot collection first;
+deleting one removes it from whichever tier holds it.
+Readers that need history use the helpers here to see both tiers.
+"""
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from bson import ObjectId
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+from app.database.connection import get_database
+from app.services.export_service import ExportService
+from app.services.version_service import VersionService
+
+BATCH_SIZE = 1000
+
+class ArchiveService:
+    """Service for archiving and reading cold data."""
+
+    @staticmethod
+    async def _move(source: str, query: dict, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+        """Move matching documents from a hot collection to its archive; returns moved count per user."""
+        db = get_database()
+        hot, archive = db[source], db[f"{source}_archive"]
+        moved: Dict[str, int] = {}
+        while True:
+            batch = await hot.find(query).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                return moved
+            now = datetime.utcnow()
+            await archive.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": now}, upsert=True) for doc in batch],
+                ordered=False
+            )
+            await hot.bulk_write([
+                DeleteOne({"$and": [query, {"_id": doc["_id"], "updated_at": doc.get("updated_at")}]})
+                for doc in batch
+            ], ordered=False)
+            ids = [doc["_id"] for doc in batch]
+            kept = {doc["_id"] async for doc in hot.find({"_id": {"$in": ids}}, {"_id": 1})}
+            if kept:
+                await archive.delete_many({"_id": {"$in": list(kept)}, "archived_at": now})
+            archived = [doc for doc in batch if doc["_id"] not in kept]
+            await ExportService.record_deletions(source, archived, reason="archived")
+            for doc in archived:
+                moved[doc["user_id"]] = moved.get(doc["user_id"], 0) + 1
+            if len(batch) < batch_size:
+                return moved
+
+    @staticmethod
+    async def archive_completed_assignments(older_than_days: int) -> int:
+        """Archive completed assignments not updated for older_than_days."""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        moved = await ArchiveService._move(
+            "assignments", {"status": "completed", "updated_at": {"$lt": cutoff}}
+        )
+        for user_id in moved:
+            await VersionService.bump(user_id, "assignments")
+        return sum(moved.values())
+
+    @staticmethod
+    async def archive_past_events(older_than_days: int) -> int:
+        """Archive events that ended more than older_than_days ago."""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        moved = await ArchiveService._move("calendar_events", {"end_time": {"$lt": cutoff}})
+        return sum(moved.values())
+
+    @staticmethod
+    async def find_assignment(assignment_id: str) -> Optional[dict]:
+        """Find an assignment in the hot collection, falling back to the archive."""
+        db = get_database()
+        query = {"_id": ObjectId(assignment_id)}
+        return await db.assignments.find_one(query) or await db.assignments_archive.find_one(query)
+
+    @staticmethod
+    async def restore_assignment(assignment_id: str) -> bool:
+        """Move an archived assignment back to the hot collection; False if it is not archived.
+
+        Used before writing to an archived assignment, so writes only ever go
+        to the hot tier. It is archived again once it is cold.
+        """
+        db = get_database()
+        doc = await db.assignments_archive.find_one({"_id": ObjectId(assignment_id)})
+        if doc is None:
+            return False
+        archived_at = doc.pop("archived_at", None)
+        try:
+            await db.assignments.insert_one(doc)
+        except DuplicateKeyError:
+            pass  # restored concurrently, or left hot by an interrupted move
+        await db.assignments_archive.delete_one({"_id": doc["_id"], "archived_at": archived_at})
+        return True
+
+    @staticmethod
+    async def delete_archived_assignment(assignment_id: str) -> Optional[dict]:
+        """Delete an assignment from the archive; returns the deleted document."""
+        db = get_database()
+        return await db.assignments_archive.find_one_and_delete({"_id": ObjectId(assignment_id)})
+
+    @staticmethod
+    async def find_both_tiers(collection: str, query: dict, sort_field: str, descending: bool = False,
+                              skip: int = 0, limit: int = 100,
+                              projection: Optional[dict] = None) -> List[dict]:
+        """Query a hot collection and its archive as one result set, merged on sort_field."""
+        db = get_database()
+        direction = -1 if descending else 1
+        if projection:
+            # The merge needs the sort key even if the caller didn't ask for it
+            projection = {**projection, sort_field: 1}
+        # Each tier needs at most skip + limit documents for the merged page
+        needed = skip + limit
+        hot = await db[collection].find(query, projection).sort(sort_field, direction).to_list(length=needed)
+        cold = await db[f"{collection}_archive"].find(query, projection).sort(sort_field, direction).to_list(length=needed)
+        merged = heapq.merge(hot, cold, key=lambda doc: doc[sort_field], reverse=descending)
+        return list(merged)[skip:needed]
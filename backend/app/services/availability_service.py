@@ -0,0 +1,287 @@
+"""Per-user availability bitmaps for fast free-slot queries.
+
+A user's planning horizon is divided into fixed SLOT_MINUTES slots and held
+as two Python ints used as bitsets (bit i = slot i):
+
+- base: slots inside the user's study window (study_preferences, in their
+  timezone) that are not taken by a class meeting
+- busy: slots covered by stored calendar events
+
+Free time is ``base & ~busy``, so "next N free hours before D" is a handful
+of word-level shifts and ANDs instead of a walk over the event list. New
+events are marked in ``busy`` as CalendarService creates them; course and
+preference changes invalidate the bitmap so it is rebuilt on next use.
+Bitmaps live in process memory, at most AVAILABILITY_MAX_BITMAPS of them
+(least recently used first out), and are dropped after MAX_AGE so that
+writes made by other workers are picked up.
+"""
+import copy
+import math
+from collections import OrderedDict
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from bson import ObjectId
+from app.config import settings
+from app.database.connection import get_database
+from app.models.course import WEEKDAYS
+from app.services.schedule_service import ScheduleService
+
+SLOT_MINUTES = 15
+HORIZON_DAYS = 120
+MAX_AGE = timedelta(minutes=15)
+SLOT = timedelta(minutes=SLOT_MINUTES)
+
+class AvailabilityBitmap:
+    """Bitset of free slots over a user's planning horizon."""
+
+    def __init__(self, origin: datetime, slots: int):
+        self.origin = origin  # naive UTC, aligned to a slot boundary
+        self.slots = slots
+        self.base = 0
+        self.busy = 0
+        self.built_at = datetime.utcnow()
+
+    @property
+    def end(self) -> datetime:
+        return self.origin + self.slots * SLOT
+
+    @property
+    def free(self) -> int:
+        return self.base & ~self.busy
+
+    def index(self, moment: datetime, round_up: bool = False) -> int:
+        """Slot index of a moment, clamped to the horizon."""
+        offset = (moment - self.origin) / SLOT
+        i = math.ceil(offset) if round_up else math.floor(offset)
+        return max(0, min(self.slots, i))
+
+    def time_at(self, i: int) -> datetime:
+        return self.origin + i * SLOT
+
+    @staticmethod
+    def mask(i: int, j: int) -> int:
+        """Bits i..j-1 set."""
+        return ((1 << (j - i)) - 1) << i if j > i else 0
+
+    def busy_mask(self, start: datetime, end: datetime) -> int:
+        """Slots touched by [start, end) - rounded outwards."""
+        return self.mask(self.index(start), self.index(end, round_up=True))
+
+    def free_mask(self, start: datetime, end: datetime) -> int:
+        """Slots fully inside [start, end) - rounded inwards."""
+        return self.mask(self.index(start, round_up=True), self.index(end))
+
+    def find_run(self, n: int, i: int, j: int) -> Optional[int]:
+        """First slot index k in [i, j - n] such that slots k..k+n-1 are all free."""
+        if n <= 0 or j - i < n:
+            return None
+        runs = self.free & self.mask(i, j)
+        # After this loop bit k is set iff bits k..k+n-1 were all set
+        covered = 1
+        while covered < n and runs:
+            shift = min(covered, n - covered)
+            runs &= runs >> shift
+            covered += shift
+        if not runs:
+            return None
+        return (runs & -runs).bit_length() - 1
+
+    def iter_runs(self, i: int, j: int, min_slots: int = 1) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) slot ranges of maximal free runs within [i, j)."""
+        bits = self.free & self.mask(i, j)
+        while bits:
+            low = bits & -bits
+            start = low.bit_length() - 1
+            carried = bits + low  # the run carries into its first clear bit
+            stop = (carried & -carried).bit_length() - 1
+            if stop - start >= min_slots:
+                yield start, stop
+            bits &= ~((1 << stop) - 1)
+
+    def free_slots(self, start_date: datetime, end_date: datetime, duration_hours: float) -> List[dict]:
+        """Free slots of at least duration_hours within the window (clipped to the horizon).
+        
+        Slots start on the slot grid, so a window opening mid-slot starts at the
+        next boundary and repeated plans suggest the same times.
+        """
+        min_slots = max(1, math.ceil(duration_hours * 60 / SLOT_MINUTES))
+        free_slots = []
+        first = self.index(start_date, round_up=True)
+        for run_start, run_stop in self.iter_runs(first, self.index(end_date), min_slots):
+            start = self.time_at(run_start)
+            end = self.time_at(run_stop)
+            free_slots.append({
+                "start": start,
+                "end": end,
+                "duration_hours": (end - start).total_seconds() / 3600
+            })
+        return [s for s in free_slots if s["duration_hours"] >= duration_hours]
+
+# user_id -> bitmap, least recently used first
+_bitmaps: "OrderedDict[str, AvailabilityBitmap]" = OrderedDict()
+
+def _is_stale(bitmap: AvailabilityBitmap, now: datetime) -> bool:
+    return now - bitmap.built_at > MAX_AGE or now - bitmap.origin > timedelta(days=1)
+
+def _cache_bitmap(user_id: str, bitmap: AvailabilityBitmap, now: datetime):
+    _bitmaps[user_id] = bitmap
+    _bitmaps.move_to_end(user_id)
+    while len(_bitmaps) > settings.AVAILABILITY_MAX_BITMAPS:
+        _bitmaps.popitem(last=False)
+    # Stale entries collect at the old end; drop them rather than wait for eviction
+    while _bitmaps:
+        oldest = next(iter(_bitmaps.values()))
+        if not _is_stale(oldest, now):
+            break
+        _bitmaps.popitem(last=False)
+
+class AvailabilityService:
+    """Service maintaining per-user availability bitmaps."""
+
+    @staticmethod
+    async def get_bitmap(user_id: str) -> AvailabilityBitmap:
+        """Get the user's bitmap, building it if missing or stale."""
+        bitmap = _bitmaps.get(user_id)
+        now = datetime.utcnow()
+        if bitmap is None or _is_stale(bitmap, now):
+            bitmap = await AvailabilityService.build(user_id, now)
+        _cache_bitmap(user_id, bitmap, now)
+        return bitmap
+
+    @staticmethod
+    async def build(user_id: str, now: Optional[datetime] = None) -> AvailabilityBitmap:
+        """Build a bitmap from preferences, course meetings and stored events."""
+        now = now or datetime.utcnow()
+        user, schedules, events = await AvailabilityService.load_inputs(user_id, now)
+        return AvailabilityService.build_bitmap(now, user, schedules, events)
+
+    @staticmethod
+    async def load_inputs(user_id: str, now: datetime) -> Tuple[dict, List[dict], List[Tuple[datetime, datetime]]]:
+        """Fetch what build_bitmap needs: user preferences, course schedules and event times."""
+        db = get_database()
+        user = None
+        if ObjectId.is_valid(user_id):
+            user = await db.users.find_one(
+                {"_id": ObjectId(user_id)}, {"_id": 0, "timezone": 1, "study_preferences": 1}
+            )
+        courses = await db.courses.find({"user_id": user_id}, {"_id": 0, "schedule": 1}).to_list(length=100)
+        events = await _event_intervals(user_id, now - SLOT, now + timedelta(days=HORIZON_DAYS))
+        return user or {}, [c.get("schedule") or {} for c in courses], events
+
+    @staticmethod
+    def build_bitmap(now: datetime, user: dict, schedules: List[dict],
+                     events: List[Tuple[datetime, datetime]]) -> AvailabilityBitmap:
+        """Build a bitmap from already-loaded inputs (pure CPU, safe to run in a worker process)."""
+        origin = now.replace(second=0, microsecond=0)
+        origin -= timedelta(minutes=origin.minute % SLOT_MINUTES)
+        bitmap = AvailabilityBitmap(origin, HORIZON_DAYS * 24 * 60 // SLOT_MINUTES)
+
+        for start, end in _study_windows(user, bitmap.origin, bitmap.end):
+            bitmap.base |= bitmap.free_mask(start, end)
+
+        for raw in schedules:
+            schedule = ScheduleService.parse_schedule(raw)
+            if schedule:
+                for start, end in ScheduleService.expand(schedule, bitmap.origin, bitmap.end):
+                    bitmap.base &= ~bitmap.busy_mask(start, end)
+
+        for start, end in events:
+            bitmap.busy |= bitmap.busy_mask(start, end)
+
+        return bitmap
+
+    @staticmethod
+    async def get_free_slots(user_id: str, start_date: datetime, end_date: datetime,
+                             duration_hours: float) -> List[dict]:
+        """Free slots of at least duration_hours within the window (clipped to the horizon)."""
+        bitmap = await AvailabilityService.get_bitmap(user_id)
+        return bitmap.free_slots(start_date, end_date, duration_hours)
+
+    @staticmethod
+    def event_added(user_id: str, start: datetime, end: datetime):
+        """Mark an event's slots busy in the cached bitmap."""
+        bitmap = _bitmaps.get(user_id)
+        if bitmap:
+            bitmap.busy |= bitmap.busy_mask(start, end)
+
+    @staticmethod
+    async def with_event_changes(user_id: str, bitmap: AvailabilityBitmap,
+                                 added: List[Tuple[datetime, datetime]],
+                                 removed: List[Tuple[datetime, datetime]]) -> AvailabilityBitmap:
+        """Copy of a bitmap as if the removed events were deleted and the added ones stored.
+
+        The bitmap itself is left alone, so the cached one can be passed in.
+        """
+        edited = copy.copy(bitmap)
+        for start, end in removed:
+            cleared = edited.busy_mask(start, end)
+            if not cleared:
+                continue
+            i = edited.index(start)
+            j = edited.index(end, round_up=True)
+            others = await _event_intervals(user_id, edited.time_at(i), edited.time_at(j))
+            for interval in removed:
+                if interval in others:
+                    others.remove(interval)
+            still_busy = 0
+            for other_start, other_end in others:
+                still_busy |= edited.busy_mask(other_start, other_end)
+            edited.busy = (edited.busy & ~cleared) | (still_busy & cleared)
+        for start, end in added:
+            edited.busy |= edited.busy_mask(start, end)
+        return edited
+
+    @staticmethod
+    def invalidate(user_id: str):
+        """Drop the cached bitmap (courses, timezone or preferences changed)."""
+        _bitmaps.pop(user_id, None)
+
+def _study_windows(user: dict, start: datetime, end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+    """Daily study windows from study_preferences, as naive UTC intervals.
+
+    Recognised preferences: ``study_start`` / ``study_end`` ("HH:MM", local)
+    and ``study_days`` (weekday names or 0-6). Defaults to the whole day.
+    """
+    prefs = user.get("study_preferences") or {}
+    try:
+        tz = ZoneInfo(user.get("timezone") or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = timezone.utc
+    try:
+        day_start = time.fromisoformat(prefs.get("study_start", "00:00"))
+        day_end = time.fromisoformat(prefs["study_end"]) if prefs.get("study_end") else None
+    except (TypeError, ValueError):
+        day_start, day_end = time(0, 0), None
+    days = set(range(7))
+    if prefs.get("study_days"):
+        try:
+            days = {WEEKDAYS.index(d.strip().lower()[:3]) if isinstance(d, str) else int(d)
+                    for d in prefs["study_days"]}
+        except (AttributeError, TypeError, ValueError):
+            pass
+
+    local_day: date = start.replace(tzinfo=timezone.utc).astimezone(tz).date() - timedelta(days=1)
+    last_day: date = end.replace(tzinfo=timezone.utc).astimezone(tz).date()
+    while local_day <= last_day:
+        if local_day.weekday() in days:
+            window_start = datetime.combine(local_day, day_start, tzinfo=tz)
+            if day_end is None:
+                window_end = datetime.combine(local_day + timedelta(days=1), time(0, 0), tzinfo=tz)
+            else:
+                window_end = datetime.combine(local_day, day_end, tzinfo=tz)
+                if window_end <= window_start:  # window crosses midnight
+                    window_end += timedelta(days=1)
+            yield (
+                window_start.astimezone(timezone.utc).replace(tzinfo=None),
+                window_end.astimezone(timezone.utc).replace(tzinfo=None),
+            )
+        local_day += timedelta(days=1)
+
+async def _event_intervals(user_id: str, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """(start, end) of a user's events overlapping a window, reading only the two time fields."""
+    db = get_database()
+    query = {"user_id": user_id, "start_time": {"$lt": end}, "end_time": {"$gt": start}}
+    cursor = db.calendar_events.find(query, {"start_time": 1, "end_time": 1, "_id": 0})
+    events = await cursor.to_list(length=None)
+    return [(e["start_time"], e["end_time"]) for e in events]
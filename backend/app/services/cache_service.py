@@ -0,0 +1,143 @@
+"""Read-through cache for rarely changing documents (users, courses).
+
+Services look documents up with ``get_or_load(key, loader, version)``: a hit
+is served from the backend, a miss calls the loader and stores its result for
+``CACHE_TTL_SECONDS``. Write paths call ``invalidate`` with the keys they
+affect after the write. If an invalidation happens while a load is in flight
+the loaded value is returned but not stored, so a slow read cannot put a
+stale document back after a write.
+
+Entries also remember the data version token they were loaded under (see
+VersionService). Routes that have already read the token for their ETag pass
+it in, and an entry stored under another token is a miss there, so a body is
+never served under an ETag built from a newer version. Other callers pass no
+token and do not pay for reading it.
+
+The backend is pluggable. ``MemoryBackend`` is a per-process LRU; a shared
+backend (e.g. Redis) only needs the same async get/set/delete methods, and
+makes invalidations visible to every worker. With the in-memory backend
+other workers see a change after at most the TTL, except through the
+version-checked ETag routes.
+"""
+import copy
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.config import settings
+
+class CacheBackend(ABC):
+    """Storage interface for the read-through cache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """The live value for key, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store value under key for ttl seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        """Drop keys (missing ones are ignored)."""
+
+    def size(self) -> int:
+        """Number of stored entries, if the backend can tell cheaply."""
+        return 0
+
+class MemoryBackend(CacheBackend):
+    """Bounded in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires, value)
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # least recently used
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class ReadThroughCache:
+    """Read-through cache with explicit invalidation and hit/miss counters."""
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          version: Optional[str] = None) -> Any:
+        """Return the cached value for key, loading and storing it on a miss.
+
+        version is the current data version token, if the caller has read
+        it; an entry stored under another token is then reloaded. Without a
+        version any entry is a hit. None is never cached, so lookups of
+        missing documents always reach the loader. Callers get a copy and
+        may mutate it freely.
+        """
+        if not self.enabled:
+            return await loader()
+        entry = await self.backend.get(key)
+        if entry is not None and (version is None or entry[0] == version):
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+        self.misses += 1
+        seen = self.invalidations
+        value = await loader()
+        if value is not None and self.invalidations == seen:
+            await self.backend.set(key, (version, copy.deepcopy(value)), self.ttl)
+        return value
+
+    async def invalidate(self, *keys: str):
+        """Drop keys after a write to the documents they hold."""
+        self.invalidations += 1
+        await self.backend.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and counters."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+cache = ReadThroughCache(
+    MemoryBackend(settings.CACHE_MAX_ENTRIES),
+    ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
+
+def user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+def course_key(course_id: str) -> str:
+    return f"course:{course_id}"
+
+def user_courses_key(user_id: str) -> str:
+    return f"courses:{user_id}"
@@ -1,10 +1,22 @@
 """Calendar integration service."""
+import asyncio
+import heapq
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
 from app.database.connection import get_database
 from app.models.calendar import CalendarEvent, CalendarEventCreate
+from app.services.archive_service import ArchiveService
+from app.services.availability_service import AvailabilityService
+from app.services.course_service import CourseService
+from app.services.planning_service import PlanningService
+from app.services.schedule_service import ScheduleService
 from bson import ObjectId
 
+Interval = Tuple[datetime, datetime]
+
+logger = logging.getLogger(__name__)
+
 class CalendarService:
     """Service for calendar operations."""
     
@@ -19,12 +31,15 @@ class CalendarService:
         
         result = await db.calendar_events.insert_one(event_dict)
         event_dict["_id"] = result.inserted_id
+        AvailabilityService.event_added(event_data.user_id, event_data.start_time, event_data.end_time)
+        await PlanningService.mark_dirty(event_data.user_id, "event_created")
         return CalendarEvent(**event_dict)
     
     @staticmethod
     async def get_user_events(user_id: str, start_date: Optional[datetime] = None, 
-                              end_date: Optional[datetime] = None) -> List[CalendarEvent]:
-        """Get events for a user within a date range."""
+                              end_date: Optional[datetime] = None,
+                              include_archived: bool = False) -> List[CalendarEvent]:
+        """Get events for a user within a date range (past events are archived)."""
         db = get_database()
         query = {"user_id": user_id}
         
@@ -35,32 +50,45 @@ class CalendarService:
             if end_date:
                 query["start_time"]["$lte"] = end_date
         
-        cursor = db.calendar_events.find(query).sort("start_time", 1)
-        events = await cursor.to_list(length=1000)
+        if include_archived:
+            events = await ArchiveService.find_both_tiers("calendar_events", query, "start_time", limit=1000)
+        else:
+            cursor = db.calendar_events.find(query).sort("start_time", 1)
+            events = await cursor.to_list(length=1000)
         return [CalendarEvent(**event) for event in events]
     
     @staticmethod
     async def get_free_time_slots(user_id: str, start_date: datetime, 
-                                  end_date: datetime, duration_hours: float) -> List[dict]:
-        """Find free time slots for study sessions."""
+                                  end_date: datetime, duration_hours: float,
+                                  include_classes: bool = True) -> List[dict]:
+        """Find free time slots for study sessions.
+        
+        Busy time is the user's stored events plus, when include_classes is set,
+        their course meetings expanded from Course.schedule.
+        """
         events = await CalendarService.get_user_events(user_id, start_date, end_date)
         
         # Sort events by start time
         events.sort(key=lambda x: x.start_time)
+        busy = [(e.start_time, e.end_time) for e in events]
+        
+        if include_classes:
+            meetings = await ScheduleService.get_user_class_meetings(user_id, start_date, end_date)
+            busy = heapq.merge(busy, meetings)
         
         free_slots = []
         current = start_date
         
-        for event in events:
-            if current < event.start_time:
-                slot_duration = (event.start_time - current).total_seconds() / 3600
+        for busy_start, busy_end in busy:
+            if current < busy_start:
+                slot_duration = (busy_start - current).total_seconds() / 3600
                 if slot_duration >= duration_hours:
                     free_slots.append({
                         "start": current,
-                        "end": event.start_time,
+                        "end": busy_start,
                         "duration_hours": slot_duration
                     })
-            current = max(current, event.end_time)
+            current = max(current, busy_end)
         
         # Check for free time after last event
         if current < end_date:
@@ -74,11 +102,96 @@ class CalendarService:
         
         return free_slots
     
+    @staticmethod
+    async def get_group_free_slots(user_ids: List[str], start_date: datetime, end_date: datetime,
+                                   duration_hours: float, include_classes: bool = True,
+                                   limit: int = 100) -> List[dict]:
+        """Find windows of at least duration_hours when every user in the group is free.
+        
+        Each member's events are read through their own cursor in
+        (user_id, start_time) index order, alongside their lazily expanded
+        class meetings. The streams are k-way merged through a heap holding
+        one head per stream, so memory stays O(group size) however long the
+        window is. Members' courses and the streams' first batches are loaded
+        concurrently.
+        """
+        streams = [_event_stream(user_id, start_date, end_date) for user_id in user_ids]
+        if include_classes:
+            member_courses = await asyncio.gather(*(CourseService.get_user_courses(u) for u in user_ids))
+            for courses in member_courses:
+                for course in courses:
+                    schedule = ScheduleService.parse_schedule(course.schedule)
+                    if schedule:
+                        streams.append(_iter_async(ScheduleService.expand(schedule, start_date, end_date)))
+        
+        free_slots = []
+        current = start_date
+        merged = _merge_streams(streams)
+        try:
+            async for busy_start, busy_end in merged:
+                if current < busy_start:
+                    slot_duration = (busy_start - current).total_seconds() / 3600
+                    if slot_duration >= duration_hours:
+                        free_slots.append({
+                            "start": current,
+                            "end": busy_start,
+                            "duration_hours": slot_duration
+                        })
+                        if len(free_slots) >= limit:
+                            return free_slots
+                current = max(current, busy_end)
+        finally:
+            # Returning early leaves the streams suspended; close them now rather than on GC
+            await merged.aclose()
+        
+        if current < end_date:
+            slot_duration = (end_date - current).total_seconds() / 3600
+            if slot_duration >= duration_hours:
+                free_slots.append({
+                    "start": current,
+                    "end": end_date,
+                    "duration_hours": slot_duration
+                })
+        
+        return free_slots
+    
     @staticmethod
     async def sync_google_calendar(user_id: str, access_token: str) -> List[CalendarEvent]:
         """Sync events from Google Calendar."""
         # Placeholder for Google Calendar API integration
         # In production, use google-auth and google-api-python-client
-        print(f"Syncing Google Calendar for user {user_id}")
+        logger.info("Syncing Google Calendar", extra={"user_id": user_id})
         return []
 
+
+async def _event_stream(user_id: str, start: datetime, end: datetime) -> AsyncIterator[Interval]:
+    """A user's events overlapping [start, end) in start_time order, read in batches."""
+    db = get_database()
+    cursor = db.calendar_events.find(
+        {"user_id": user_id, "start_time": {"$lt": end}, "end_time": {"$gt": start}},
+        {"start_time": 1, "end_time": 1, "_id": 0}
+    ).sort("start_time", 1).batch_size(500)
+    async for event in cursor:
+        yield event["start_time"], event["end_time"]
+
+async def _iter_async(intervals: Iterable[Interval]) -> AsyncIterator[Interval]:
+    for interval in intervals:
+        yield interval
+
+async def _merge_streams(streams: List[AsyncIterator[Interval]]) -> AsyncIterator[Interval]:
+    """Heap-based k-way merge of start-ordered interval streams; closes them when done."""
+    try:
+        firsts = await asyncio.gather(*(anext(stream, None) for stream in streams))
+        heap = [(first, index) for index, first in enumerate(firsts) if first is not None]
+        heapq.heapify(heap)
+        while heap:
+            interval, index = heap[0]
+            yield interval
+            following = await anext(streams[index], None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following, index))
+    finally:
+        for stream in streams:
+            await stream.aclose()
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Optional
 from app.database.connection import get_database
 from app.models.course import Course, CourseCreate, CourseUpdate
+from app.services.cache_service import cache, course_key, user_courses_key
 from bson import ObjectId
 
 class CourseService:
@@ -17,21 +18,32 @@ class CourseService:
         
         result = await db.courses.insert_one(course_dict)
         course_dict["_id"] = result.inserted_id
+        await cache.invalidate(user_courses_key(course_data.user_id))
         return Course(**course_dict)
     
     @staticmethod
-    async def get_user_courses(user_id: str) -> List[Course]:
-        """Get all courses for a user."""
-        db = get_database()
-        cursor = db.courses.find({"user_id": user_id})
-        courses = await cursor.to_list(length=100)
+    async def get_user_courses(user_id: str, version: Optional[str] = None) -> List[Course]:
+        """Get all courses for a user (cached).
+        
+        version is the user's current "courses" version token, if the caller
+        already read it (for an ETag); a cached list from another version is
+        then reloaded.
+        """
+        async def load():
+            db = get_database()
+            return await db.courses.find({"user_id": user_id}).to_list(length=100)
+        
+        courses = await cache.get_or_load(user_courses_key(user_id), load, version)
         return [Course(**course) for course in courses]
     
     @staticmethod
     async def get_course(course_id: str) -> Optional[Course]:
-        """Get a course by ID."""
-        db = get_database()
-        course = await db.courses.find_one({"_id": ObjectId(course_id)})
+        """Get a course by ID (cached)."""
+        async def load():
+            db = get_database()
+            return await db.courses.find_one({"_id": ObjectId(course_id)})
+        
+        course = await cache.get_or_load(course_key(course_id), load)
         return Course(**course) if course else None
     
     @staticmethod
@@ -46,12 +58,18 @@ class CourseService:
             {"$set": update_data},
             return_document=True
         )
-        return Course(**result) if result else None
+        if not result:
+            return None
+        await cache.invalidate(course_key(course_id), user_courses_key(result["user_id"]))
+        return Course(**result)
     
     @staticmethod
-    async def delete_course(course_id: str) -> bool:
-        """Delete a course."""
+    async def delete_course(course_id: str) -> Optional[Course]:
+        """Delete a course, returning it if it existed."""
         db = get_database()
-        result = await db.courses.delete_one({"_id": ObjectId(course_id)})
-        return result.deleted_count > 0
+        result = await db.courses.find_one_and_delete({"_id": ObjectId(course_id)})
+        if not result:
+            return None
+        await cache.invalidate(course_key(course_id), user_courses_key(result["user_id"]))
+        return Course(**result)
 
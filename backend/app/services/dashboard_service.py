@@ -0,0 +1,56 @@
+"""Composite dashboard reads."""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from app.database.connection import get_database
+from app.models.common import mongo_projection
+from app.models.dashboard import (
+    Dashboard, DashboardAssignment, DashboardCourse, DashboardEvent, DashboardUser
+)
+from app.services.course_service import CourseService
+from app.services.user_service import UserService
+from app.services.workload_service import WorkloadService
+
+EVENT_DAYS = 7
+
+class DashboardService:
+    """Service assembling the dashboard payload."""
+
+    @staticmethod
+    async def get_dashboard(user_id: str) -> Optional[Dashboard]:
+        """Fetch the user, then courses, pending assignments, upcoming events and workload concurrently.
+
+        Returns None if the user does not exist. The user lookup goes first
+        (usually a cache hit) so an unknown id costs a single read. The whole
+        call is read-only: the workload summary is recounted in memory if
+        stale rather than stored.
+        """
+        user = await UserService.get_user(user_id)
+        if user is None:
+            return None
+
+        db = get_database()
+        now = datetime.utcnow()
+        assignments = db.assignments.find(
+            {"user_id": user_id, "status": {"$ne": "completed"}},
+            mongo_projection(DashboardAssignment)
+        ).sort("due_date", 1).to_list(length=100)
+        events = db.calendar_events.find(
+            {"user_id": user_id, "start_time": {"$lt": now + timedelta(days=EVENT_DAYS)},
+             "end_time": {"$gt": now}},
+            mongo_projection(DashboardEvent)
+        ).sort("start_time", 1).to_list(length=200)
+
+        courses, assignments, events, workload = await asyncio.gather(
+            CourseService.get_user_courses(user_id),
+            assignments,
+            events,
+            WorkloadService.get_summary(user_id, persist=False),
+        )
+        return Dashboard(
+            user=DashboardUser.model_validate(user, from_attributes=True),
+            courses=[DashboardCourse.model_validate(c, from_attributes=True) for c in courses],
+            assignments=[DashboardAssignment(**a) for a in assignments],
+            events=[DashboardEvent(**e) for e in events],
+            workload=workload,
+        )
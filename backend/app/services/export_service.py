@@ -0,0 +1,216 @@
+"""Columnar export of assignments and calendar events for analytics.
+
+Each run streams documents changed since the last export (by ``updated_at``)
+from a secondary when one is available, in batches, and appends them as
+row groups to a new Parquet part file with typed columns::
+
+    EXPORT_DIR/assignments/part-20250101T020000000000.parquet
+    EXPORT_DIR/assignments/_watermark.json
+
+The window ends EXPORT_LAG_SECONDS before the run starts, so writes still in
+flight with an older updated_at are picked up by the next run instead of
+being skipped. A document updated again later shows up in a later part, so
+readers keep the row with the latest updated_at per _id. Array fields
+(suggestions, reminders) are not exported because changes to them do not
+touch updated_at.
+
+Deleted and archived documents are recorded as tombstones in the deletions
+collection (see record_deletions) and exported by the same incremental runs
+to a separate folder, which dataset readers skip because of the leading
+underscore::
+
+    EXPORT_DIR/assignments/_deletes/part-20250101T020000000000.parquet
+
+Readers drop an _id when its latest tombstone is newer than its latest row.
+Tombstones expire after EXPORT_TOMBSTONE_DAYS, so incremental exports must
+run more often than that. A full export writes a fresh snapshot to a
+temporary folder and only replaces the previous export once it is complete.
+
+pyarrow is only needed here, and is imported on first use.
+"""
+import asyncio
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo import ReadPreference
+from app.config import settings
+from app.database.connection import get_database
+
+# Exported fields and their Arrow types, per collection
+STRING, INT, FLOAT, TIMESTAMP = "string", "int", "float", "timestamp"
+EXPORTS: Dict[str, List[Tuple[str, str]]] = {
+    "assignments": [
+        ("_id", STRING), ("user_id", STRING), ("course_id", STRING), ("title", STRING),
+        ("category", STRING), ("status", STRING), ("priority", INT), ("estimated_hours", FLOAT),
+        ("due_date", TIMESTAMP), ("created_at", TIMESTAMP), ("updated_at", TIMESTAMP),
+    ],
+    "calendar_events": [
+        ("_id", STRING), ("user_id", STRING), ("title", STRING), ("event_type", STRING),
+        ("source", STRING), ("location", STRING), ("external_id", STRING),
+        ("start_time", TIMESTAMP), ("end_time", TIMESTAMP),
+        ("created_at", TIMESTAMP), ("updated_at", TIMESTAMP),
+    ],
+}
+DELETES = [("_id", STRING), ("user_id", STRING), ("reason", STRING), ("deleted_at", TIMESTAMP)]
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Analytics export needs pyarrow (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+def _schema(pa, fields: List[Tuple[str, str]]):
+    types = {STRING: pa.string(), INT: pa.int32(), FLOAT: pa.float64(), TIMESTAMP: pa.timestamp("ms")}
+    return pa.schema([(name, types[kind]) for name, kind in fields])
+
+def _to_table(pa, schema, fields: List[Tuple[str, str]], docs: List[dict]):
+    """Column-wise conversion of a batch of documents."""
+    columns = []
+    for name, kind in fields:
+        values = [doc.get(name) for doc in docs]
+        if kind == STRING:
+            values = [None if v is None else str(v) for v in values]
+        columns.append(pa.array(values, type=schema.field(name).type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+def _read_watermark(path: str) -> Optional[datetime]:
+    try:
+        with open(path) as f:
+            return datetime.fromisoformat(json.load(f)["updated_at"])
+    except FileNotFoundError:
+        return None
+
+def _write_json(path: str, data: dict):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+def _part_path(directory: str, until: datetime) -> str:
+    return os.path.join(directory, f"part-{until:%Y%m%dT%H%M%S%f}.parquet")
+
+async def _write_part(pa, pq, fields: List[Tuple[str, str]], cursor, path: str, batch_size: int) -> int:
+    """Write a cursor's documents to a Parquet file, one row group per batch; returns the row count.
+
+    Nothing is written when the cursor is empty.
+    """
+    schema = _schema(pa, fields)
+    rows = 0
+    writer = None
+    pending_write = None
+    try:
+        while True:
+            docs = await cursor.to_list(length=batch_size)
+            if pending_write:
+                await pending_write  # the previous batch was written while this one was read
+                pending_write = None
+            if not docs:
+                break
+            if writer is None:
+                writer = pq.ParquetWriter(f"{path}.tmp", schema, compression="zstd")
+            table = _to_table(pa, schema, fields, docs)
+            pending_write = asyncio.ensure_future(asyncio.to_thread(writer.write_table, table))
+            rows += len(docs)
+    finally:
+        if pending_write:
+            await pending_write
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        os.replace(f"{path}.tmp", path)
+    return rows
+
+def _swap_dir(tmp_dir: str, out_dir: str):
+    """Replace out_dir with tmp_dir, keeping the old one until the rename succeeded."""
+    old_dir = f"{out_dir}.old"
+    if os.path.isdir(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.isdir(out_dir):
+        os.rename(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    if os.path.isdir(old_dir):
+        shutil.rmtree(old_dir)
+
+class ExportService:
+    """Service for incremental Parquet exports."""
+
+    @staticmethod
+    async def record_deletions(collection: str, docs: List[dict], reason: str = "deleted"):
+        """Record tombstones for documents removed from an exported collection.
+
+        reason is "deleted" or "archived".
+        """
+        if collection not in EXPORTS or not docs:
+            return
+        now = datetime.utcnow()
+        await get_database().deletions.insert_many([
+            {"collection": collection, "doc_id": str(doc["_id"]), "user_id": doc.get("user_id"),
+             "reason": reason, "deleted_at": now}
+            for doc in docs
+        ])
+
+    @staticmethod
+    async def export_collection(collection: str, directory: str, full: bool = False,
+                                batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Export documents changed since the last run (or everything with full=True)."""
+        pa, pq = _pyarrow()
+        fields = EXPORTS[collection]
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        out_dir = os.path.join(directory, collection)
+        # A full export is built next to the current one and swapped in when complete
+        write_dir = f"{out_dir}.tmp" if full else out_dir
+        if full and os.path.isdir(write_dir):
+            shutil.rmtree(write_dir)  # left over from a failed run
+        os.makedirs(write_dir, exist_ok=True)
+        watermark_path = os.path.join(write_dir, "_watermark.json")
+
+        since = None if full else _read_watermark(watermark_path)
+        until = datetime.utcnow() - timedelta(seconds=settings.EXPORT_LAG_SECONDS)
+        window = {"$lte": until}
+        if since:
+            window["$gt"] = since
+        # Documents without updated_at predate the field; include them in the first export
+        query = {"updated_at": window} if since else {"$or": [{"updated_at": window}, {"updated_at": None}]}
+
+        db = get_database()
+        source = db.get_collection(collection, read_preference=ReadPreference.SECONDARY_PREFERRED)
+        cursor = source.find(query, {name: 1 for name, _ in fields}).sort("updated_at", 1).batch_size(batch_size)
+        path = _part_path(write_dir, until)
+        rows = await _write_part(pa, pq, fields, cursor, path, batch_size)
+
+        # A snapshot has nothing to delete; later runs export the window's tombstones
+        deletes = 0
+        if since:
+            tombstones = db.get_collection("deletions", read_preference=ReadPreference.SECONDARY_PREFERRED).aggregate([
+                {"$match": {"collection": collection, "deleted_at": window}},
+                {"$sort": {"deleted_at": 1}},
+                {"$project": {"_id": "$doc_id", "user_id": 1, "reason": 1, "deleted_at": 1}},
+            ], batchSize=batch_size)
+            deletes_dir = os.path.join(write_dir, "_deletes")
+            os.makedirs(deletes_dir, exist_ok=True)
+            deletes = await _write_part(
+                pa, pq, DELETES, tombstones, _part_path(deletes_dir, until), batch_size
+            )
+
+        _write_json(watermark_path, {
+            "updated_at": until.isoformat(), "rows": rows, "deletes": deletes,
+            "exported_at": datetime.utcnow().isoformat()
+        })
+        if full:
+            _swap_dir(write_dir, out_dir)
+        return {"collection": collection, "rows": rows, "deletes": deletes,
+                "path": _part_path(out_dir, until) if rows else None, "since": since, "until": until}
+
+    @staticmethod
+    async def export_all(directory: Optional[str] = None, full: bool = False) -> List[Dict[str, Any]]:
+        """Export every configured collection."""
+        directory = directory or settings.EXPORT_DIR
+        return [
+            await ExportService.export_collection(collection, directory, full=full)
+            for collection in EXPORTS
+        ]
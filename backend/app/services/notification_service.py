@@ -1,8 +1,13 @@
 """Notification service."""
+import logging
 from datetime import datetime, timedelta
 from typing import List
 from app.database.connection import get_database
 from app.models.assignment import Assignment
+from app.services.push_service import hub
+from app.services.version_service import VersionService
+
+logger = logging.getLogger(__name__)
 
 class NotificationService:
     """Service for sending notifications and reminders."""
@@ -11,7 +16,10 @@ class NotificationService:
     async def send_reminder(user_id: str, assignment_id: str, message: str) -> bool:
         """Send a reminder notification."""
         # In production, integrate with email, SMS, or push notification services
-        print(f"Sending reminder to user {user_id} for assignment {assignment_id}: {message}")
+        logger.info("Sending reminder: %s", message, extra={
+            "user_id": user_id, "assignment_id": assignment_id, "event": "reminder_sent", "sampled": True
+        })
+        hub.publish(user_id, "reminder", assignment_id=assignment_id, message=message)
         return True
     
     @staticmethod
@@ -51,5 +59,9 @@ class NotificationService:
                     "due_date": assignment_obj.due_date
                 })
         
+        if reminders_sent:
+            # reminders_sent is part of the assignment payload
+            await VersionService.bump(user_id, "assignments")
+        
         return reminders_sent
 
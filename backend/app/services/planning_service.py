@@ -0,0 +1,69 @@
+"""Dirty-set tracking for incremental replanning.
+
+Write paths mark a user dirty in ``planning_queue``; the planning job then
+only runs the agent for dirty users, plus users whose workload summary has
+passed its ``replan_at`` bucket boundary (an assignment became urgent or
+overdue since they were last planned). Each mark bumps a version so that a
+write landing while the user is being planned keeps them dirty for the next
+pass.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from app.database.connection import get_database
+from app.services.workload_service import WorkloadService
+
+class PlanningService:
+    """Service for tracking which users need replanning."""
+
+    @staticmethod
+    async def mark_dirty(user_id: str, reason: str):
+        """Mark a user as needing replanning."""
+        db = get_database()
+        now = datetime.utcnow()
+        await db.planning_queue.update_one(
+            {"_id": user_id},
+            {
+                "$min": {"dirty_since": now},
+                "$set": {"reason": reason, "updated_at": now},
+                "$inc": {"version": 1},
+            },
+            upsert=True
+        )
+
+    @staticmethod
+    async def get_users_to_plan(limit: int = 10000) -> Dict[str, Optional[int]]:
+        """Users needing a plan run, mapped to their dirty version (None for time-triggered)."""
+        db = get_database()
+        users: Dict[str, Optional[int]] = {}
+
+        cursor = db.planning_queue.find({}, {"version": 1}).sort("dirty_since", 1).limit(limit)
+        async for entry in cursor:
+            users[entry["_id"]] = entry["version"]
+
+        # Urgency buckets rolled over since the user was last planned
+        # (summaries written before replan_at existed fall back to next_boundary)
+        now = datetime.utcnow()
+        cursor = db.workload_summaries.find(
+            {"$or": [
+                {"replan_at": {"$lte": now}},
+                {"replan_at": {"$exists": False}, "next_boundary": {"$lte": now}},
+            ]},
+            {"_id": 1}
+        ).limit(limit)
+        async for summary in cursor:
+            users.setdefault(summary["_id"], None)
+
+        return users
+
+    @staticmethod
+    async def clear_dirty(user_id: str, version: Optional[int], planned_at: datetime):
+        """Record a plan made at planned_at.
+
+        Clears the dirty mark unless it was re-marked since version was read,
+        and moves the rollover trigger past planned_at.
+        """
+        await WorkloadService.advance_replan(user_id, planned_at)
+        if version is None:
+            return
+        db = get_database()
+        await db.planning_queue.delete_one({"_id": user_id, "version": version})
@@ -0,0 +1,80 @@
+"""In-process pub/sub hub for pushing updates to connected clients.
+
+Services publish small JSON-able messages for a user (reminders sent, plan
+updated). Every open WebSocket of that user has its own bounded queue.
+Publishing never blocks: if a connection's queue is full the client is too
+slow, so it is marked overflowed and disconnected, and it reconnects and
+re-syncs over REST instead of holding up the publisher or everyone else.
+
+The hub only sees events raised in this process. Jobs run by the automation
+scheduler in another process are not delivered; a shared broker would be
+needed for that.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Set
+from app.config import settings
+
+class Subscription:
+    """One connection's queue of pending messages."""
+
+    def __init__(self, user_id: str, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = asyncio.Event()
+
+class PushHub:
+    """Fan-out of per-user messages to bounded per-connection queues."""
+
+    def __init__(self, max_queue: int, max_connections_per_user: int):
+        self.max_queue = max_queue
+        self.max_connections_per_user = max_connections_per_user
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self.counters = {"published": 0, "delivered": 0, "dropped_slow_consumers": 0, "rejected_connections": 0}
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Register a connection; raises ValueError if the user has too many open."""
+        subscriptions = self._subscribers.setdefault(user_id, set())
+        if len(subscriptions) >= self.max_connections_per_user:
+            self.counters["rejected_connections"] += 1
+            raise ValueError("Too many open connections for this user")
+        subscription = Subscription(user_id, self.max_queue)
+        subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str, message_type: str, **data: Any) -> int:
+        """Queue a message for every connection of a user; returns how many got it."""
+        subscriptions = self._subscribers.get(user_id)
+        if not subscriptions:
+            return 0
+        self.counters["published"] += 1
+        message = {"type": message_type, "at": datetime.utcnow().isoformat(), **data}
+        delivered = 0
+        for subscription in list(subscriptions):
+            if subscription.overflowed.is_set():
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                self.counters["dropped_slow_consumers"] += 1
+                subscription.overflowed.set()
+        self.counters["delivered"] += delivered
+        return delivered
+
+    def metrics(self) -> Dict[str, Any]:
+        """Open connections and counters."""
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(s) for s in self._subscribers.values()),
+            **self.counters,
+        }
+
+hub = PushHub(settings.PUSH_QUEUE_SIZE, settings.PUSH_MAX_CONNECTIONS_PER_USER)
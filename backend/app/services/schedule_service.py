@@ -0,0 +1,95 @@
+"""Course schedule recurrence service.
+
+Class meetings are never stored as calendar events. They are expanded from
+Course.schedule on demand, one local week at a time, and the expanded weeks
+are cached by schedule content so edits to a course invalidate naturally.
+"""
+from datetime import datetime, date, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import ValidationError
+from app.models.course import CourseSchedule
+from app.services.course_service import CourseService
+
+Interval = Tuple[datetime, datetime]
+
+class ScheduleService:
+    """Service for expanding recurring course meetings into busy time."""
+
+    @staticmethod
+    def parse_schedule(raw: Optional[dict]) -> Optional[CourseSchedule]:
+        """Parse a Course.schedule dict; return None if it has no recurrence info."""
+        if not raw:
+            return None
+        data = dict(raw)
+        if "meetings" not in data and "days" in data:
+            # Shorthand: a single meeting pattern at the top level
+            data["meetings"] = [{
+                key: data.pop(key) for key in ("days", "start_time", "end_time", "location")
+                if key in data
+            }]
+        try:
+            schedule = CourseSchedule(**data)
+        except (ValidationError, TypeError):
+            return None
+        return schedule if schedule.meetings else None
+
+    @staticmethod
+    def expand(schedule: CourseSchedule, start: datetime, end: datetime) -> Iterator[Interval]:
+        """Lazily yield meetings overlapping [start, end) as naive UTC intervals, in order."""
+        # Local dates can differ from UTC dates by up to a day either side
+        first_day = (start - timedelta(days=1)).date()
+        week = first_day - timedelta(days=first_day.weekday())
+        last_day = (end + timedelta(days=1)).date()
+
+        while week <= last_day:
+            for meeting_start, meeting_end in _expand_week(schedule, week):
+                if meeting_start >= end:
+                    return
+                if meeting_end > start:
+                    yield meeting_start, meeting_end
+            week += timedelta(days=7)
+
+    @staticmethod
+    async def get_user_class_meetings(user_id: str, start: datetime, end: datetime) -> List[Interval]:
+        """Get all class meetings for a user's courses within a window, sorted by start."""
+        courses = await CourseService.get_user_courses(user_id)
+        meetings = []
+        for course in courses:
+            schedule = ScheduleService.parse_schedule(course.schedule)
+            if schedule:
+                meetings.extend(ScheduleService.expand(schedule, start, end))
+        meetings.sort()
+        return meetings
+
+@lru_cache(maxsize=4096)
+def _expand_week(schedule: CourseSchedule, week_start: date) -> Tuple[Interval, ...]:
+    """Expand one local week (Monday-based) of a schedule into sorted UTC intervals."""
+    try:
+        tz = ZoneInfo(schedule.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = timezone.utc
+
+    intervals = []
+    for offset in range(7):
+        day = week_start + timedelta(days=offset)
+        if schedule.start_date and day < schedule.start_date:
+            continue
+        if schedule.end_date and day > schedule.end_date:
+            continue
+        if day in schedule.exceptions:
+            continue
+        for meeting in schedule.meetings:
+            if day.weekday() not in meeting.days:
+                continue
+            local_start = datetime.combine(day, meeting.start_time, tzinfo=tz)
+            local_end = datetime.combine(day, meeting.end_time, tzinfo=tz)
+            if local_end <= local_start:
+                continue
+            intervals.append((
+                local_start.astimezone(timezone.utc).replace(tzinfo=None),
+                local_end.astimezone(timezone.utc).replace(tzinfo=None),
+            ))
+    intervals.sort()
+    return tuple(intervals)
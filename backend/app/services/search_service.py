@@ -0,0 +1,148 @@
+"""Full-text and faceted search over a user's assignments and courses.
+
+Queries use the text indexes on assignment title/description and course
+name/code (see INDEXES), which are prefixed with user_id so each search only
+touches the user's own entries. Matches are ranked by text score and paged
+on the server. Facet counts come from the same aggregation through $facet:
+each facet is counted with every filter applied except its own, so a client
+can show the other values of a facet it has already narrowed.
+
+Without a query the same endpoint browses: everything matching the
+filters, by due date. Archived assignments are not searched.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from app.database.connection import get_database
+from app.models.common import mongo_projection
+from app.models.search import AssignmentHit, CourseHit
+from app.services.course_service import CourseService
+
+FACETS = ("category", "status", "course_id")
+# Due-date buckets: (value, days from now to the end of the bucket)
+DUE_BUCKETS = (("overdue", 0), ("next_7_days", 7), ("next_30_days", 30), ("later", None))
+
+def _base_match(user_id: str, query: Optional[str]) -> dict:
+    match = {"user_id": user_id}
+    if query:
+        match["$text"] = {"$search": query}
+    return match
+
+def _sort(query: Optional[str], field: str) -> dict:
+    return {"score": -1, field: 1, "_id": 1} if query else {field: 1, "_id": 1}
+
+def _due_buckets(now: datetime) -> List[Tuple[str, Optional[datetime], Optional[datetime]]]:
+    buckets = []
+    start = None
+    for value, days in DUE_BUCKETS:
+        end = now + timedelta(days=days) if days is not None else None
+        buckets.append((value, start, end))
+        start = end
+    return buckets
+
+def _due_bucket_expr(now: datetime) -> dict:
+    return {"$switch": {
+        "branches": [
+            {"case": {"$lt": ["$due_date", end]}, "then": value}
+            for value, _, end in _due_buckets(now) if end is not None
+        ],
+        "default": DUE_BUCKETS[-1][0],
+    }}
+
+class SearchService:
+    """Service for searching assignments and courses."""
+
+    @staticmethod
+    async def search_assignments(user_id: str, query: Optional[str] = None,
+                                 filters: Optional[Dict[str, List[str]]] = None,
+                                 due_after: Optional[datetime] = None, due_before: Optional[datetime] = None,
+                                 skip: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Ranked page of matching assignments, the total, and facet counts.
+
+        filters maps a facet (category, status, course_id) to the values to
+        keep; several values of one facet match any of them.
+        """
+        now = datetime.utcnow()
+        conditions = {
+            facet: {facet: {"$in": values}} for facet, values in (filters or {}).items() if values
+        }
+        due = {}
+        if due_after:
+            due["$gte"] = due_after
+        if due_before:
+            due["$lt"] = due_before
+        if due:
+            conditions["due_date"] = {"due_date": due}
+
+        def match_except(facet: Optional[str] = None) -> dict:
+            parts = [c for name, c in conditions.items() if name != facet]
+            return {"$and": parts} if parts else {}
+
+        def count_by(facet: str, key) -> List[dict]:
+            return [
+                {"$match": match_except(facet)},
+                {"$group": {"_id": key, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ]
+
+        pipeline = [{"$match": _base_match(user_id, query)}]
+        if query:
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+        pipeline.append({"$facet": {
+            "results": [
+                {"$match": match_except()},
+                {"$sort": _sort(query, "due_date")},
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": mongo_projection(AssignmentHit)},
+            ],
+            "total": [{"$match": match_except()}, {"$count": "count"}],
+            **{facet: count_by(facet, f"${facet}") for facet in FACETS},
+            "due": count_by("due_date", _due_bucket_expr(now)),
+        }})
+
+        db = get_database()
+        courses = CourseService.get_user_courses(user_id)
+        (output,), courses = await asyncio.gather(
+            db.assignments.aggregate(pipeline).to_list(length=1), courses
+        )
+        course_names = {str(c.id): c.name for c in courses}
+        bounds = {value: (start, end) for value, start, end in _due_buckets(now)}
+
+        facets = {
+            facet: [{"value": g["_id"], "count": g["count"]} for g in output[facet]] for facet in FACETS
+        }
+        for value in facets["course_id"]:
+            value["label"] = course_names.get(value["value"])
+        counts = {g["_id"]: g["count"] for g in output["due"]}
+        facets["due"] = [
+            {"value": value, "count": counts[value], "start": bounds[value][0], "end": bounds[value][1]}
+            for value, _ in DUE_BUCKETS if value in counts
+        ]
+        return {
+            "total": output["total"][0]["count"] if output["total"] else 0,
+            "results": output["results"],
+            "facets": facets,
+        }
+
+    @staticmethod
+    async def search_courses(user_id: str, query: Optional[str] = None,
+                             skip: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Ranked page of matching courses and the total."""
+        pipeline = [{"$match": _base_match(user_id, query)}]
+        if query:
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+        pipeline.append({"$facet": {
+            "results": [
+                {"$sort": _sort(query, "code")},
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": mongo_projection(CourseHit)},
+            ],
+            "total": [{"$count": "count"}],
+        }})
+        (output,) = await get_database().courses.aggregate(pipeline).to_list(length=1)
+        return {
+            "total": output["total"][0]["count"] if output["total"] else 0,
+            "results": output["results"],
+        }
@@ -0,0 +1,76 @@
+"""Persistence of the planner's study-time suggestions.
+
+The latest plan is stored on each assignment in ``suggested_study_times``,
+so clients can show suggestions with a plain read instead of re-running the
+agent. The new suggestions are compared with the stored ones, and only the
+assignments whose times changed are written, in a single bulk_write.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.database.connection import get_database
+from app.services.push_service import hub
+from app.services.version_service import VersionService
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def _stored_form(times: Iterable) -> List[datetime]:
+    """Times as Mongo stores them: naive datetimes truncated to milliseconds."""
+    result = []
+    for value in times:
+        value = _as_datetime(value)
+        result.append(value.replace(microsecond=value.microsecond // 1000 * 1000))
+    return result
+
+class SuggestionService:
+    """Service for persisting suggested study times."""
+
+    @staticmethod
+    def diff(assignment_ids: Iterable[str], stored: Dict[str, Iterable],
+             suggestions: List[dict]) -> Dict[str, List[datetime]]:
+        """Assignments whose suggested times changed, with their new times.
+
+        Assignments in assignment_ids that are missing from suggestions (no
+        longer in the top of the plan) get their stale suggestions cleared.
+        """
+        planned = {
+            s["assignment_id"]: s["suggested_times"] for s in suggestions if "assignment_id" in s
+        }
+        changes = {}
+        for assignment_id in assignment_ids:
+            new = _stored_form(planned.get(assignment_id, []))
+            if new != _stored_form(stored.get(assignment_id) or []):
+                changes[assignment_id] = new
+        return changes
+
+    @staticmethod
+    async def persist(user_id: str, assignment_ids: List[str], suggestions: List[dict],
+                      stored: Optional[Dict[str, Iterable]] = None) -> int:
+        """Write changed suggestions for a user's planned assignments; returns the number written.
+
+        stored maps assignment id to its current suggested_study_times; when
+        omitted it is read with one projected query.
+        """
+        db = get_database()
+        if stored is None:
+            docs = await db.assignments.find(
+                {"_id": {"$in": [ObjectId(a) for a in assignment_ids]}},
+                {"suggested_study_times": 1}
+            ).to_list(length=len(assignment_ids))
+            stored = {str(doc["_id"]): doc.get("suggested_study_times", []) for doc in docs}
+
+        changes = SuggestionService.diff(assignment_ids, stored, suggestions)
+        if not changes:
+            return 0
+        await db.assignments.bulk_write([
+            UpdateOne(
+                {"_id": ObjectId(assignment_id), "user_id": user_id},
+                {"$set": {"suggested_study_times": times}}
+            )
+            for assignment_id, times in changes.items()
+        ], ordered=False)
+        await VersionService.bump(user_id, "assignments")
+        hub.publish(user_id, "plan_updated", assignment_ids=list(changes))
+        return len(changes)
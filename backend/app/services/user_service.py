@@ -0,0 +1,42 @@
+"""User lookup service."""
+from datetime import datetime
+from typing import Optional
+from app.database.connection import get_database
+from app.models.user import User, UserUpdate
+from app.services.cache_service import cache, user_key
+from bson import ObjectId
+
+class UserService:
+    """Service for user reads and updates."""
+
+    @staticmethod
+    async def get_user(user_id: str, version: Optional[str] = None) -> Optional[User]:
+        """Get a user by ID (cached).
+
+        version is the user's current "user" version token, if the caller
+        already read it (for an ETag); a cached copy from another version is
+        then reloaded.
+        """
+        async def load():
+            db = get_database()
+            return await db.users.find_one({"_id": ObjectId(user_id)})
+
+        user = await cache.get_or_load(user_key(user_id), load, version)
+        return User(**user) if user else None
+
+    @staticmethod
+    async def update_user(user_id: str, user_data: UserUpdate) -> Optional[User]:
+        """Update a user."""
+        db = get_database()
+        update_data = {k: v for k, v in user_data.model_dump().items() if v is not None}
+        update_data["updated_at"] = datetime.utcnow()
+
+        result = await db.users.find_one_and_update(
+            {"_id": ObjectId(user_id)},
+            {"$set": update_data},
+            return_document=True
+        )
+        if not result:
+            return None
+        await cache.invalidate(user_key(user_id))
+        return User(**result)
@@ -0,0 +1,29 @@
+"""Per-user data versions for HTTP validators.
+
+``data_versions`` holds one document per user with a token per kind of data
+("assignments", "courses", "user"). Write paths bump the token after the
+write; list endpoints derive their ETag from it, so a conditional GET only
+reads this small document.
+"""
+from bson import ObjectId
+from app.database.connection import get_database
+
+class VersionService:
+    """Service for per-user data version tokens."""
+
+    @staticmethod
+    async def bump(user_id: str, *kinds: str):
+        """Give each kind of a user's data a new version token."""
+        db = get_database()
+        await db.data_versions.update_one(
+            {"_id": user_id},
+            {"$set": {kind: ObjectId() for kind in kinds}},
+            upsert=True
+        )
+
+    @staticmethod
+    async def get(user_id: str, kind: str) -> str:
+        """Current version token ("0" if the data was never written through the API)."""
+        db = get_database()
+        doc = await db.data_versions.find_one({"_id": user_id}, {kind: 1})
+        return str(doc[kind]) if doc and kind in doc else "0"
@@ -0,0 +1,224 @@
+"""Materialized per-user workload summary.
+
+One ``workload_summaries`` document per user holds the bucket counts used by
+TaskPlanner's study plan (overdue / urgent / upcoming / future), the hours
+still needed, and a compact ``items`` map of open assignments. Assignment
+writes apply ``$inc`` deltas, so reads are a single document lookup.
+
+Buckets depend on the clock, so the document also stores ``next_boundary``,
+the instant right after which an open assignment next changes bucket. A
+read past that instant recounts from ``items`` (not from ``assignments``)
+and stores the new boundary.
+
+``replan_at`` is the same kind of instant, but for replanning: it is only
+moved forward by ``advance_replan`` once the user has been planned, so
+reads (which move ``next_boundary``) cannot hide a rollover from the
+planning job.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+from pymongo.errors import DuplicateKeyError
+from app.database.connection import get_database
+from app.models.common import naive_utc
+
+BUCKETS = ("overdue", "urgent", "upcoming", "future")
+URGENT_WINDOW = timedelta(days=4)  # (due - now).days <= 3
+UPCOMING_WINDOW = timedelta(days=8)  # (due - now).days <= 7
+LARGE_ASSIGNMENT_HOURS = 5
+FAR_FUTURE = datetime(9999, 12, 31)
+REBUILD_ATTEMPTS = 3
+
+def bucket_for(due_date: datetime, now: datetime) -> str:
+    """Workload bucket of an open assignment at a given time."""
+    if due_date < now:
+        return "overdue"
+    if due_date < now + URGENT_WINDOW:
+        return "urgent"
+    if due_date < now + UPCOMING_WINDOW:
+        return "upcoming"
+    return "future"
+
+def next_boundary(due_date: datetime, now: datetime) -> datetime:
+    """Latest instant, at or after now, before the assignment changes bucket.
+
+    Buckets are closed at their end (see bucket_for), so the bucket changes
+    right after the returned instant; a recount at exactly that instant still
+    sees the old bucket and must return it again rather than skip past it.
+    """
+    for boundary in (due_date - UPCOMING_WINDOW, due_date - URGENT_WINDOW, due_date):
+        if boundary >= now:
+            return boundary
+    return FAR_FUTURE
+
+async def _load_items(user_id: str) -> Dict[str, dict]:
+    """Open assignments as the summary's items map."""
+    cursor = get_database().assignments.find(
+        {"user_id": user_id, "status": {"$ne": "completed"}},
+        {"due_date": 1, "estimated_hours": 1}
+    )
+    return {
+        str(a["_id"]): {"due_date": a["due_date"], "estimated_hours": a.get("estimated_hours", 0.0)}
+        async for a in cursor
+    }
+
+def _is_open(assignment: Optional[dict]) -> bool:
+    return bool(assignment) and assignment.get("status") != "completed"
+
+class WorkloadService:
+    """Service maintaining per-user workload summaries."""
+
+    @staticmethod
+    def summarize(items: Iterable[Tuple[datetime, float]], now: datetime) -> Dict[str, Any]:
+        """Compute a summary from (due_date, estimated_hours) pairs of open assignments."""
+        counts = {bucket: 0 for bucket in BUCKETS}
+        total_hours = 0.0
+        large_count = 0
+        boundary = FAR_FUTURE
+        for due_date, hours in items:
+            counts[bucket_for(due_date, now)] += 1
+            total_hours += hours
+            if hours > LARGE_ASSIGNMENT_HOURS:
+                large_count += 1
+            boundary = min(boundary, next_boundary(due_date, now))
+        return {
+            "counts": counts,
+            "total_hours": total_hours,
+            "large_count": large_count,
+            "next_boundary": boundary,
+            "computed_at": now,
+        }
+
+    @staticmethod
+    async def get_summary(user_id: str, persist: bool = True) -> Dict[str, Any]:
+        """Get a user's workload summary, recounting only if a bucket boundary has passed.
+
+        With persist=False nothing is written: a missing or stale summary is
+        computed in memory (for hot read paths such as the dashboard).
+        """
+        db = get_database()
+        now = datetime.utcnow()
+        doc = await db.workload_summaries.find_one({"_id": user_id}, {"items": 0})
+        if doc is None:
+            doc = await WorkloadService.rebuild(user_id) if persist else WorkloadService.summarize(
+                ((i["due_date"], i["estimated_hours"]) for i in (await _load_items(user_id)).values()), now
+            )
+        elif doc["next_boundary"] <= now:
+            doc = await WorkloadService._recount(user_id, now, persist)
+        return {
+            "user_id": user_id,
+            "counts": doc["counts"],
+            "total_hours": doc["total_hours"],
+            "large_count": doc["large_count"],
+            "next_boundary": doc["next_boundary"] if doc["next_boundary"] != FAR_FUTURE else None,
+            "computed_at": doc["computed_at"],
+        }
+
+    @staticmethod
+    async def rebuild(user_id: str) -> Dict[str, Any]:
+        """Rebuild a summary from the assignments collection (first use or repair).
+
+        Like _recount, the rebuilt summary only replaces the stored one if no
+        write bumped its version in between; otherwise the rebuild is retried.
+        """
+        db = get_database()
+        for _ in range(REBUILD_ATTEMPTS):
+            now = datetime.utcnow()
+            current = await db.workload_summaries.find_one({"_id": user_id}, {"version": 1, "replan_at": 1})
+            items = await _load_items(user_id)
+            doc = WorkloadService.summarize(
+                ((i["due_date"], i["estimated_hours"]) for i in items.values()), now
+            )
+            doc.update({"_id": user_id, "items": items})
+            if current is None:
+                doc.update({"version": 0, "replan_at": doc["next_boundary"]})
+                try:
+                    await db.workload_summaries.insert_one(doc)
+                    return doc
+                except DuplicateKeyError:
+                    continue  # built concurrently; rebuild against that version
+            version = current.get("version", 0)
+            # Keep a replan that is still due
+            replan_at = current.get("replan_at", doc["next_boundary"])
+            doc.update({"version": version + 1, "replan_at": min(replan_at, doc["next_boundary"])})
+            result = await db.workload_summaries.replace_one({"_id": user_id, "version": version}, doc)
+            if result.matched_count:
+                return doc
+        return doc  # still contended; serve it unsaved and let a later read store it
+
+    @staticmethod
+    async def _recount(user_id: str, now: datetime, persist: bool = True) -> Dict[str, Any]:
+        """Recount buckets from the stored items after a boundary has passed."""
+        db = get_database()
+        doc = await db.workload_summaries.find_one({"_id": user_id})
+        if doc is None:
+            return await WorkloadService.rebuild(user_id)
+        summary = WorkloadService.summarize(
+            ((i["due_date"], i["estimated_hours"]) for i in doc.get("items", {}).values()), now
+        )
+        if not persist:
+            return summary
+        # Only store if no write landed in between; the next read retries otherwise
+        await db.workload_summaries.update_one(
+            {"_id": user_id, "version": doc.get("version", 0)},
+            {"$set": summary, "$inc": {"version": 1}}
+        )
+        return summary
+
+    @staticmethod
+    async def assignment_changed(user_id: str, before: Optional[dict], after: Optional[dict]):
+        """Apply an assignment write to the summary as an incremental update.
+
+        ``before`` / ``after`` are the stored documents around the write (None
+        for inserts / deletes). Users without a summary yet are skipped; it is
+        built from assignments on first read.
+        """
+        if not _is_open(before) and not _is_open(after):
+            return
+        now = datetime.utcnow()
+        inc: Dict[str, float] = {"version": 1}
+
+        def apply(assignment: dict, sign: int):
+            hours = assignment.get("estimated_hours", 0.0)
+            key = f"counts.{bucket_for(naive_utc(assignment['due_date']), now)}"
+            inc[key] = inc.get(key, 0) + sign
+            inc["total_hours"] = inc.get("total_hours", 0.0) + sign * hours
+            if hours > LARGE_ASSIGNMENT_HOURS:
+                inc["large_count"] = inc.get("large_count", 0) + sign
+
+        if _is_open(before):
+            apply(before, -1)
+        if _is_open(after):
+            apply(after, 1)
+
+        assignment_id = str((after or before)["_id"])
+        update: Dict[str, Any] = {"$inc": {k: v for k, v in inc.items() if v}}
+        if _is_open(after):
+            due_date = naive_utc(after["due_date"])
+            update["$set"] = {f"items.{assignment_id}": {
+                "due_date": due_date,
+                "estimated_hours": after.get("estimated_hours", 0.0),
+            }}
+            boundary = next_boundary(due_date, now)
+            update["$min"] = {"next_boundary": boundary, "replan_at": boundary}
+        else:
+            update["$unset"] = {f"items.{assignment_id}": ""}
+
+        db = get_database()
+        await db.workload_summaries.update_one({"_id": user_id}, update)
+
+    @staticmethod
+    async def advance_replan(user_id: str, planned_at: datetime):
+        """Move replan_at to the first bucket boundary after a plan made at planned_at."""
+        db = get_database()
+        doc = await db.workload_summaries.find_one({"_id": user_id}, {"items": 1, "version": 1})
+        if doc is None:
+            return
+        boundary = min(
+            (next_boundary(i["due_date"], planned_at) for i in doc.get("items", {}).values()),
+            default=FAR_FUTURE
+        )
+        # A write in between may have lowered replan_at; keep it and retry next pass
+        await db.workload_summaries.update_one(
+            {"_id": user_id, "version": doc.get("version", 0)},
+            {"$set": {"replan_at": boundary}}
+        )
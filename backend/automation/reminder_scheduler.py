@@ -1,8 +1,17 @@
 """Scheduler for automated reminders using APScheduler."""
 import asyncio
+import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from automation.task_executor import check_all_users_deadlines, run_daily_planning
+from apscheduler.triggers.interval import IntervalTrigger
+from app.config import settings
+from app.database.connection import connect_to_mongo, close_mongo_connection
+from app.logging_config import setup_logging
+from automation.task_executor import (
+    archive_old_data, check_all_users_deadlines, export_analytics, run_daily_planning, run_full_planning
+)
+
+logger = logging.getLogger(__name__)
 
 def setup_scheduler():
     """Setup and start the reminder scheduler."""
@@ -17,7 +26,7 @@ def setup_scheduler():
         replace_existing=True
     )
     
-    # Run daily planning every morning at 8 AM
+    # Run daily planning every morning at 8 AM (users with changes only)
     scheduler.add_job(
         run_daily_planning,
         trigger=CronTrigger(hour=8, minute=0),
@@ -26,16 +35,60 @@ def setup_scheduler():
         replace_existing=True
     )
     
+    # Full sweep of every user as a fallback, once a week
+    scheduler.add_job(
+        run_full_planning,
+        trigger=CronTrigger(day_of_week="sun", hour=3, minute=0),
+        id="full_planning",
+        name="Run study planning for all users",
+        replace_existing=True
+    )
+    
+    # Archive completed assignments and past events nightly
+    scheduler.add_job(
+        archive_old_data,
+        trigger=CronTrigger(hour=2, minute=0),
+        id="archive_old_data",
+        name="Archive completed assignments and past events",
+        replace_existing=True
+    )
+    
+    # Incremental analytics export, before the archive job moves data out
+    scheduler.add_job(
+        export_analytics,
+        trigger=CronTrigger(hour=1, minute=30),
+        id="export_analytics",
+        name="Export assignments and events to Parquet",
+        replace_existing=True
+    )
+    
+    # Optionally replan dirty users continuously through the day
+    if settings.DIRTY_PLANNING_INTERVAL_MINUTES > 0:
+        scheduler.add_job(
+            run_daily_planning,
+            trigger=IntervalTrigger(minutes=settings.DIRTY_PLANNING_INTERVAL_MINUTES),
+            id="dirty_planning",
+            name="Replan users with changes",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+    
     return scheduler
 
 async def main():
     """Main function to run the scheduler."""
+    setup_logging()
+    # One client for the whole process: jobs can overlap (e.g. the hourly
+    # deadline check and interval replanning) and must not close it under
+    # each other
+    await connect_to_mongo()
     scheduler = setup_scheduler()
     scheduler.start()
     
-    print("Reminder scheduler started")
-    print("- Checking deadlines every hour")
-    print("- Running daily planning at 8:00 AM")
+    logger.info("Reminder scheduler started", extra={
+        "jobs": [job.name for job in scheduler.get_jobs()]
+    })
     
     try:
         # Keep the scheduler running
@@ -43,7 +96,9 @@ async def main():
             await asyncio.sleep(1)
     except (KeyboardInterrupt, SystemExit):
         scheduler.shutdown()
-        print("Scheduler stopped")
+        logger.info("Scheduler stopped")
+    finally:
+        await close_mongo_connection()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,59 +1,169 @@
 """Automated task execution scripts."""
 import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from app.database.connection import connect_to_mongo, close_mongo_connection, get_database
+from app.config import settings
+from app.logging_config import setup_logging
+from app.database.connection import connect_to_mongo, close_mongo_connection, db as mongo, get_database
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService
 from app.services.notification_service import NotificationService
-from app.agents.langgraph_agent import agent
+from app.services.planning_service import PlanningService
+
+logger = logging.getLogger(__name__)
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+@asynccontextmanager
+async def _mongo():
+    """Connect for one job, unless the process already holds a connection.
+
+    The scheduler connects once at startup and its jobs (which may overlap)
+    share that client; a task run from the command line connects and closes
+    its own.
+    """
+    if mongo.client is not None:
+        yield
+        return
+    await connect_to_mongo()
+    try:
+        yield
+    finally:
+        await close_mongo_connection()
 
 async def check_all_users_deadlines():
     """Check deadlines for all users and send reminders."""
-    await connect_to_mongo()
-    db = get_database()
-    
-    # Get all active users
-    users_cursor = db.users.find({})
-    users = await users_cursor.to_list(length=1000)
-    
-    for user in users:
-        user_id = str(user["_id"])
-        try:
-            reminders = await NotificationService.check_and_send_upcoming_deadlines(
-                user_id, hours_ahead=24
-            )
-            print(f"Sent {len(reminders)} reminders to user {user_id}")
-        except Exception as e:
-            print(f"Error processing user {user_id}: {e}")
-    
-    await close_mongo_connection()
+    async with _mongo():
+        db = get_database()
 
-async def run_daily_planning():
-    """Run daily study planning for all users."""
-    await connect_to_mongo()
-    db = get_database()
-    
-    users_cursor = db.users.find({})
-    users = await users_cursor.to_list(length=1000)
-    
-    for user in users:
-        user_id = str(user["_id"])
-        try:
-            result = await agent.run(user_id)
-            print(f"Generated study plan for user {user_id}: {len(result.get('suggestions', []))} suggestions")
-        except Exception as e:
-            print(f"Error generating plan for user {user_id}: {e}")
+        # Get all active users
+        users_cursor = db.users.find({})
+        users = await users_cursor.to_list(length=1000)
+
+        job_started = time.perf_counter()
+        sent = 0
+        for user in users:
+            user_id = str(user["_id"])
+            started = time.perf_counter()
+            try:
+                reminders = await NotificationService.check_and_send_upcoming_deadlines(
+                    user_id, hours_ahead=24
+                )
+                sent += len(reminders)
+                logger.info("Checked deadlines", extra={
+                    "user_id": user_id, "job": "deadlines", "reminders": len(reminders),
+                    "duration_ms": _elapsed_ms(started), "sampled": True
+                })
+            except Exception:
+                logger.exception("Error processing user", extra={"user_id": user_id, "job": "deadlines"})
+        logger.info("Deadline check finished", extra={
+            "job": "deadlines", "users": len(users), "reminders": sent, "duration_ms": _elapsed_ms(job_started)
+        })
+
+async def run_daily_planning(full_sweep: bool = False):
+    """Run study planning for users whose data changed.
     
-    await close_mongo_connection()
+    Only users marked dirty by the write paths, or whose urgency buckets
+    rolled over, are planned. full_sweep plans every user as a fallback.
+    """
+    from app.agents.langgraph_agent import get_agent, wait_for_recordings
+    from app.agents.planner_batch import plan_users
+    async with _mongo():
+        agent = get_agent()
+        db = get_database()
+
+        if full_sweep:
+            users_cursor = db.users.find({}, {"_id": 1})
+            users = await users_cursor.to_list(length=1000)
+            to_plan = {str(user["_id"]): None for user in users}
+            dirty = await PlanningService.get_users_to_plan()
+            to_plan.update({user_id: version for user_id, version in dirty.items() if user_id in to_plan})
+        else:
+            to_plan = await PlanningService.get_users_to_plan()
+        planned_at = datetime.utcnow()
+
+        job = "planning-full" if full_sweep else "planning"
+        job_started = time.perf_counter()
+        failed = 0
+        if settings.PLANNING_WORKERS > 0:
+            # CPU-bound planning in worker processes, I/O stays on this loop
+            async for user_id, result in plan_users(
+                list(to_plan), agent, settings.PLANNING_WORKERS, settings.PLANNING_BATCH_SIZE
+            ):
+                if isinstance(result, Exception):
+                    failed += 1
+                    logger.error("Error generating plan: %s", result, extra={"user_id": user_id, "job": job})
+                    continue
+                await PlanningService.clear_dirty(user_id, to_plan[user_id], planned_at)
+                logger.info("Generated study plan", extra={
+                    "user_id": user_id, "job": job,
+                    "suggestions": len(result.get("suggestions", [])), "sampled": True
+                })
+        else:
+            for user_id, version in to_plan.items():
+                started = time.perf_counter()
+                try:
+                    result = await agent.run(user_id)
+                    await PlanningService.clear_dirty(user_id, version, planned_at)
+                    logger.info("Generated study plan", extra={
+                        "user_id": user_id, "job": job, "suggestions": len(result.get("suggestions", [])),
+                        "duration_ms": _elapsed_ms(started), "sampled": True
+                    })
+                except Exception:
+                    failed += 1
+                    logger.exception("Error generating plan", extra={"user_id": user_id, "job": job})
+        await wait_for_recordings()
+        logger.info("Planning finished", extra={
+            "job": job, "users": len(to_plan), "failed": failed, "duration_ms": _elapsed_ms(job_started)
+        })
+
+async def archive_old_data():
+    """Move completed assignments and past events to the archive collections."""
+    async with _mongo():
+        started = time.perf_counter()
+        assignments = await ArchiveService.archive_completed_assignments(settings.ARCHIVE_COMPLETED_AFTER_DAYS)
+        events = await ArchiveService.archive_past_events(settings.ARCHIVE_EVENTS_AFTER_DAYS)
+        logger.info("Archived old data", extra={
+            "job": "archive", "assignments": assignments, "events": events, "duration_ms": _elapsed_ms(started)
+        })
+
+async def export_analytics(full: bool = False):
+    """Export assignments and calendar events changed since the last export to Parquet."""
+    async with _mongo():
+        started = time.perf_counter()
+        for result in await ExportService.export_all(full=full):
+            logger.info("Exported collection", extra={
+                "job": "export", "collection": result["collection"], "rows": result["rows"],
+                "deletes": result["deletes"], "path": result["path"]
+            })
+        logger.info("Analytics export finished", extra={"job": "export", "duration_ms": _elapsed_ms(started)})
+
+async def run_full_planning():
+    """Run study planning for every user."""
+    await run_daily_planning(full_sweep=True)
 
 if __name__ == "__main__":
     import sys
+    setup_logging()
     if len(sys.argv) > 1:
         task = sys.argv[1]
         if task == "deadlines":
             asyncio.run(check_all_users_deadlines())
         elif task == "planning":
             asyncio.run(run_daily_planning())
+        elif task == "planning-full":
+            asyncio.run(run_full_planning())
+        elif task == "archive":
+            asyncio.run(archive_old_data())
+        elif task == "export":
+            asyncio.run(export_analytics())
+        elif task == "export-full":
+            asyncio.run(export_analytics(full=True))
         else:
-            print("Usage: python task_executor.py [deadlines|planning]")
+            print("Usage: python task_executor.py [deadlines|planning|planning-full|archive|export|export-full]")
     else:
-        print("Usage: python task_executor.py [deadlines|planning]")
+        print("Usage: python task_executor.py [deadlines|planning|planning-full|archive|export|export-full]")
 
@@ -0,0 +1,110 @@
+"""Replay recorded agent runs offline and time each graph node.
+
+Runs saved with AGENT_RECORD_DIR are fed back through StudyPlannerAgent with
+ReplayIO, which supplies the recorded inputs, clock and LLM responses, so no
+database or network is needed. For each session this prints the recorded
+and replayed durations with a per-node breakdown, and checks that the
+replayed output matches the recorded one. The exit status is 1 if any
+session diverges.
+
+Usage (from backend/):
+    python -m benchmarks.agent_replay recordings/*.json.gz [--repeat 5] [--profile replay.prof]
+"""
+import argparse
+import asyncio
+import cProfile
+import pstats
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from app.agents.agent_io import ReplayIO, bind_io, load_session, normalize, unbind_io
+from app.config import settings
+
+def first_difference(expected: Any, actual: Any, path: str = "") -> Optional[str]:
+    """Path and values of the first difference between two JSON-like values."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            if key not in expected or key not in actual:
+                return f"{path}.{key}: only in {'replay' if key in actual else 'recording'}"
+            diff = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if diff:
+                return diff
+        return None
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"{path}: {len(expected)} items recorded, {len(actual)} replayed"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            diff = first_difference(e, a, f"{path}[{i}]")
+            if diff:
+                return diff
+        return None
+    if expected != actual:
+        return f"{path or 'output'}: recorded {expected!r}, replayed {actual!r}"
+    return None
+
+async def replay(agent, session: Dict[str, Any]) -> Tuple[Dict[str, Any], float, ReplayIO]:
+    """Run one session through the agent; returns (output, seconds, io)."""
+    io = ReplayIO(session)
+    token = bind_io(io)
+    try:
+        started = time.perf_counter()
+        output = await agent.run(session["user_id"])
+        return output, time.perf_counter() - started, io
+    finally:
+        unbind_io(token)
+
+async def main_async(args) -> int:
+    # Replays never call the LLM, so don't build (or authenticate) an endpoint
+    settings.HUGGINGFACE_API_KEY = ""
+    from app.agents.langgraph_agent import StudyPlannerAgent
+    agent = StudyPlannerAgent()
+
+    profiler = cProfile.Profile() if args.profile else None
+    failures = 0
+    for path in args.sessions:
+        session = load_session(path)
+        totals: List[float] = []
+        nodes: Dict[str, List[float]] = {}
+        diff = None
+        for _ in range(args.repeat):
+            if profiler:
+                profiler.enable()
+            output, seconds, io = await replay(agent, session)
+            if profiler:
+                profiler.disable()
+            totals.append(seconds)
+            for name, node_seconds in io.nodes.items():
+                nodes.setdefault(name, []).append(node_seconds)
+            if diff is None and "output" in session:
+                diff = first_difference(normalize(session["output"]), normalize(output))
+
+        status = "MATCH" if diff is None else "DIVERGED"
+        failures += diff is not None
+        recorded = session.get("duration_ms")
+        print(f"{path}: {status}  user {session['user_id']}  recorded "
+              f"{recorded if recorded is not None else '?'} ms, replay median "
+              f"{statistics.median(totals) * 1000:.2f} ms (min {min(totals) * 1000:.2f}, n={args.repeat})")
+        for name, values in nodes.items():
+            recorded_node = session.get("nodes", {}).get(name)
+            print(f"    {name:<26} {statistics.median(values) * 1000:9.3f} ms"
+                  f"   recorded {recorded_node if recorded_node is not None else '?':>9} ms")
+        if diff:
+            print(f"    first difference: {diff}")
+
+    if profiler:
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(args.top)
+    return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded agent runs offline")
+    parser.add_argument("sessions", nargs="+", help="recorded .json.gz session files")
+    parser.add_argument("--repeat", type=int, default=1, help="replays per session")
+    parser.add_argument("--profile", help="write cProfile stats to this file and print the top entries")
+    parser.add_argument("--top", type=int, default=25, help="profile entries to print")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+if __name__ == "__main__":
+    main()
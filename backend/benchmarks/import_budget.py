@@ -0,0 +1,77 @@
+"""Import-time budget check for the API and automation entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+must stay within its budget. Modules that are only needed once an agent run
+actually happens (LangGraph, LangChain) must not be imported at all.
+
+Usage (from backend/):
+    python -m benchmarks.import_budget [--runs 3] [--scale 1.0]
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS: Dict[str, float] = {
+    "app.main": 1200.0,
+    "app.api.routes.assignments": 1000.0,
+    "automation.task_executor": 800.0,
+}
+
+# Heavy packages that must only load on first agent use
+FORBIDDEN_PREFIXES: Tuple[str, ...] = ("langgraph", "langchain", "langchain_community", "huggingface_hub")
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """Import a module in a fresh interpreter; return (ms, imported module names)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+    
+    cumulative_us = 0.0
+    imported = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        imported.append(name)
+        if name == module:
+            cumulative_us = float(cumulative)
+    return cumulative_us / 1000.0, imported
+
+def check(runs: int = 3, scale: float = 1.0) -> bool:
+    """Check every budgeted module; return True if all pass."""
+    ok = True
+    for module, budget in BUDGETS_MS.items():
+        budget *= scale
+        samples = []
+        forbidden = set()
+        for _ in range(runs):
+            elapsed, imported = measure_import(module)
+            samples.append(elapsed)
+            forbidden.update(m for m in imported if m.split(".")[0] in FORBIDDEN_PREFIXES)
+        best = min(samples)
+        passed = best <= budget and not forbidden
+        ok = ok and passed
+        status = "OK  " if passed else "FAIL"
+        print(f"{status} {module}: {best:.0f} ms (budget {budget:.0f} ms)")
+        if forbidden:
+            print(f"     imports heavy modules: {', '.join(sorted(forbidden)[:5])}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument("--runs", type=int, default=3, help="fresh imports per module (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply budgets, e.g. for slow CI boxes")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.runs, args.scale) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""In-process load test for the FastAPI app.
+
+Drives app.main through httpx's ASGI transport (no sockets, no uvicorn)
+against a seeded MongoDB database, and reports throughput and p50/p95/p99
+latency per route. Reports are saved as JSON so builds can be compared.
+
+Usage (from backend/, with MongoDB running at MONGODB_URL):
+    python -m benchmarks.load_test --scenario crud --seed
+    python -m benchmarks.load_test --scenario dashboard --concurrency 50 --duration 30 \\
+        --out reports/dashboard.json --compare reports/dashboard-main.json
+
+The load test uses its own database (DATABASE_NAME + "_loadtest"), which
+--seed drops and recreates.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bson import ObjectId
+
+@dataclass
+class Step:
+    """One weighted request in a scenario; path and body are built per call."""
+    weight: int
+    method: str
+    route: str  # route template, used to group results
+    build: Callable[["VirtualUser"], Tuple[str, Optional[dict]]]
+
+class VirtualUser:
+    """A simulated client acting as one seeded student."""
+
+    def __init__(self, user_id: str, course_ids: List[str], assignment_ids: List[str], rng: random.Random):
+        self.user_id = user_id
+        self.course_ids = course_ids
+        self.assignment_ids = assignment_ids
+        self.rng = rng
+        self.etags: Dict[str, str] = {}  # conditional GETs, like a browser cache
+
+def _new_assignment(vu: VirtualUser) -> Tuple[str, dict]:
+    due = datetime.utcnow() + timedelta(hours=vu.rng.randint(1, 24 * 30))
+    return "/assignments/", {
+        "user_id": vu.user_id,
+        "course_id": vu.rng.choice(vu.course_ids),
+        "title": "Load test assignment",
+        "due_date": due.isoformat(),
+        "priority": vu.rng.randint(1, 5),
+        "estimated_hours": vu.rng.choice([1, 2, 4]),
+    }
+
+def _update_assignment(vu: VirtualUser) -> Tuple[str, dict]:
+    return f"/assignments/{vu.rng.choice(vu.assignment_ids)}", {"priority": vu.rng.randint(1, 5)}
+
+SCENARIOS: Dict[str, List[Step]] = {
+    "crud": [
+        Step(4, "GET", "/assignments/user/{user_id}", lambda vu: (f"/assignments/user/{vu.user_id}", None)),
+        Step(2, "GET", "/assignments/{id}", lambda vu: (f"/assignments/{vu.rng.choice(vu.assignment_ids)}", None)),
+        Step(2, "GET", "/courses/user/{user_id}", lambda vu: (f"/courses/user/{vu.user_id}", None)),
+        Step(1, "GET", "/users/{id}", lambda vu: (f"/users/{vu.user_id}", None)),
+        Step(1, "POST", "/assignments/", _new_assignment),
+        Step(2, "PUT", "/assignments/{id}", _update_assignment),
+    ],
+    "dashboard": [
+        Step(3, "GET", "/assignments/user/{user_id}", lambda vu: (f"/assignments/user/{vu.user_id}", None)),
+        Step(2, "GET", "/courses/user/{user_id}", lambda vu: (f"/courses/user/{vu.user_id}", None)),
+        Step(2, "GET", "/users/{id}", lambda vu: (f"/users/{vu.user_id}", None)),
+        Step(2, "GET", "/assignments/user/{user_id}/summary",
+             lambda vu: (f"/assignments/user/{vu.user_id}/summary", None)),
+    ],
+    # The same view through the composite endpoint, for comparison with "dashboard"
+    "home": [
+        Step(1, "GET", "/dashboard/{user_id}", lambda vu: (f"/dashboard/{vu.user_id}", None)),
+    ],
+    "agent": [
+        Step(1, "POST", "/agent/plan/{user_id}", lambda vu: (f"/agent/plan/{vu.user_id}", None)),
+        Step(3, "GET", "/assignments/user/{user_id}", lambda vu: (f"/assignments/user/{vu.user_id}", None)),
+    ],
+}
+
+class StubLLM:
+    """Stands in for HuggingFaceEndpoint with a fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def ainvoke(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+        return "Recommendations:\n- Start with the most urgent assignment\n- Review notes daily"
+
+async def seed(db, users: int, courses: int, assignments: int, events: int, rng: random.Random) -> List[VirtualUser]:
+    """Drop and refill the load-test database."""
+    for name in ("users", "courses", "assignments", "calendar_events", "workload_summaries",
+                 "planning_queue", "data_versions"):
+        await db[name].drop()
+    now = datetime.utcnow()
+    for u in range(users):
+        user_id = ObjectId()
+        await db.users.insert_one({
+            "_id": user_id, "email": f"student{u}@example.com", "name": f"Student {u}",
+            "timezone": "UTC", "study_preferences": {"study_start": "08:00", "study_end": "22:00"},
+            "created_at": now, "updated_at": now,
+        })
+    return await load_virtual_users(db, rng, courses, assignments, events, create=True)
+
+async def load_virtual_users(db, rng: random.Random, courses: int = 0, assignments: int = 0,
+                             events: int = 0, create: bool = False) -> List[VirtualUser]:
+    """Build virtual users from the seeded data (creating their documents when seeding)."""
+    now = datetime.utcnow()
+    virtual_users = []
+    async for user in db.users.find({}, {"_id": 1}):
+        user_id = str(user["_id"])
+        if create:
+            course_docs = [{
+                "_id": ObjectId(), "user_id": user_id, "name": f"Course {c}", "code": f"CS{100 + c}",
+                "credits": 3, "semester": "Fall",
+                "schedule": {"days": rng.sample(["Mon", "Tue", "Wed", "Thu", "Fri"], 2),
+                             "start_time": f"{rng.randint(8, 16):02d}:00", "end_time": f"{rng.randint(17, 18):02d}:00"},
+                "created_at": now, "updated_at": now,
+            } for c in range(courses)]
+            assignment_docs = [{
+                "_id": ObjectId(), "user_id": user_id, "course_id": str(rng.choice(course_docs)["_id"]) if course_docs else "",
+                "title": f"Assignment {a}", "description": "Lorem ipsum " * 20,
+                "due_date": now + timedelta(hours=rng.randint(-48, 24 * 45)),
+                "priority": rng.randint(1, 5), "estimated_hours": rng.choice([1.0, 2.0, 4.0, 8.0]),
+                "status": rng.choice(["pending", "pending", "in_progress", "completed"]),
+                "category": rng.choice(["homework", "exam", "project"]),
+                "created_at": now, "updated_at": now, "suggested_study_times": [], "reminders_sent": [],
+            } for a in range(assignments)]
+            event_docs = []
+            for _ in range(events):
+                start = now + timedelta(minutes=15 * rng.randint(0, 4 * 24 * 30))
+                event_docs.append({
+                    "_id": ObjectId(), "user_id": user_id, "title": "Event", "event_type": "personal",
+                    "start_time": start, "end_time": start + timedelta(hours=1), "source": "manual",
+                    "created_at": now, "updated_at": now,
+                })
+            if course_docs:
+                await db.courses.insert_many(course_docs)
+            if assignment_docs:
+                await db.assignments.insert_many(assignment_docs)
+            if event_docs:
+                await db.calendar_events.insert_many(event_docs)
+        course_ids = [str(c["_id"]) async for c in db.courses.find({"user_id": user_id}, {"_id": 1})]
+        assignment_ids = [str(a["_id"]) async for a in db.assignments.find({"user_id": user_id}, {"_id": 1})]
+        if course_ids and assignment_ids:
+            virtual_users.append(VirtualUser(user_id, course_ids, assignment_ids, random.Random(rng.random())))
+    return virtual_users
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+async def run_load(client, steps: List[Step], virtual_users: List[VirtualUser], concurrency: int,
+                   duration: float, prefix: str) -> Dict[str, Any]:
+    """Run the scenario with `concurrency` concurrent clients for `duration` seconds."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    weights = [s.weight for s in steps]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        vu = virtual_users[index % len(virtual_users)]
+        while time.perf_counter() < deadline:
+            step = vu.rng.choices(steps, weights)[0]
+            path, body = step.build(vu)
+            url = prefix + path
+            headers = {"Accept-Encoding": "gzip"}
+            if step.method == "GET" and url in vu.etags:
+                headers["If-None-Match"] = vu.etags[url]
+            route = f"{step.method} {step.route}"
+            started = time.perf_counter()
+            try:
+                response = await client.request(step.method, url, json=body, headers=headers)
+                status = response.status_code
+                if step.method == "GET" and "etag" in response.headers:
+                    vu.etags[url] = response.headers["etag"]
+            except Exception:
+                status = 599
+            latencies[route].append(time.perf_counter() - started)
+            statuses[route][status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    routes = {}
+    all_latencies = []
+    for route, values in sorted(latencies.items()):
+        values.sort()
+        all_latencies.extend(values)
+        routes[route] = _stats(values, elapsed, statuses[route])
+    all_latencies.sort()
+    total_statuses: Dict[int, int] = defaultdict(int)
+    for counts in statuses.values():
+        for status, count in counts.items():
+            total_statuses[status] += count
+    return {"elapsed_seconds": elapsed, "routes": routes, "total": _stats(all_latencies, elapsed, total_statuses)}
+
+def _stats(values: List[float], elapsed: float, statuses: Dict[int, int]) -> Dict[str, Any]:
+    return {
+        "requests": len(values),
+        "rps": len(values) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """Print a per-route table, with deltas against a baseline report if given."""
+    meta = report["meta"]
+    print(f"scenario={meta['scenario']} concurrency={meta['concurrency']} "
+          f"duration={meta['duration']}s commit={meta['commit']}")
+    header = f"{'route':45} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}  statuses"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for route, stats in rows:
+        line = (f"{route:45} {stats['requests']:7d} {stats['rps']:8.1f} {stats['p50_ms']:8.1f} "
+                f"{stats['p95_ms']:8.1f} {stats['p99_ms']:8.1f}  {stats['statuses']}")
+        print(line)
+        if baseline:
+            base = baseline["routes"].get(route) if route != "TOTAL" else baseline["total"]
+            if base:
+                print(f"{'  vs baseline':45} {'':7} {_delta(stats['rps'], base['rps']):>8} "
+                      f"{_delta(stats['p50_ms'], base['p50_ms']):>8} {_delta(stats['p95_ms'], base['p95_ms']):>8} "
+                      f"{_delta(stats['p99_ms'], base['p99_ms']):>8}")
+
+def _delta(current: float, base: float) -> str:
+    return f"{(current - base) / base * 100:+.0f}%" if base else "n/a"
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+async def main_async(args):
+    import httpx
+    from app.config import settings
+    settings.DATABASE_NAME = f"{settings.DATABASE_NAME}_loadtest"
+    from app.database.connection import connect_to_mongo, close_mongo_connection, get_database
+    from app.main import app
+
+    rng = random.Random(args.random_seed)
+    await connect_to_mongo()
+    try:
+        db = get_database()
+        if args.seed:
+            virtual_users = await seed(db, args.users, args.courses, args.assignments, args.events, rng)
+        else:
+            virtual_users = await load_virtual_users(db, rng)
+        if not virtual_users:
+            raise SystemExit("No seeded users found; run with --seed first")
+
+        if args.scenario == "agent":
+            from app.agents.langgraph_agent import get_agent
+            from app.api.routes.agent import admission
+            get_agent().llm = StubLLM(args.llm_latency)
+            if args.no_rate_limit:
+                admission.rate = 1e9
+                admission.burst = 10 ** 9
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            result = await run_load(client, SCENARIOS[args.scenario], virtual_users,
+                                    args.concurrency, args.duration, settings.API_PREFIX)
+    finally:
+        await close_mongo_connection()
+
+    report = {
+        "meta": {
+            "scenario": args.scenario,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "virtual_users": len(virtual_users),
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+        },
+        **result,
+    }
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Report saved to {args.out}")
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process ASGI load test")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="crud")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seed", action="store_true", help="drop and reseed the load-test database")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--courses", type=int, default=5, help="per user")
+    parser.add_argument("--assignments", type=int, default=40, help="per user")
+    parser.add_argument("--events", type=int, default=60, help="per user")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM latency, seconds")
+    parser.add_argument("--no-rate-limit", action="store_true", help="disable per-user agent rate limits")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
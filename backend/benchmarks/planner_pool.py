@@ -0,0 +1,100 @@
+"""Benchmark process-pool planning against core count.
+
+Plans a synthetic population of users with planner_batch.plan_batch, first
+in-process and then through a ProcessPoolExecutor with an increasing number
+of workers, and prints the speedup for each. No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.planner_pool [--users 2000] [--batch-size 50]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import List
+from app.agents.planner_batch import PlanInput, PlanItem, plan_batch
+
+def synthetic_inputs(users: int, seed: int = 42) -> List[PlanInput]:
+    """Users with a realistic mix of assignments, class schedules and events."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    inputs = []
+    for u in range(users):
+        assignments = tuple(
+            PlanItem(
+                id=f"{u}-{a}",
+                title=f"Assignment {a}",
+                due_date=now + timedelta(hours=rng.randint(-48, 24 * 60)),
+                priority=rng.randint(1, 5),
+                estimated_hours=rng.choice([1.0, 2.0, 3.0, 5.0, 8.0]),
+            )
+            for a in range(rng.randint(5, 40))
+        )
+        schedules = tuple(
+            {
+                "days": rng.sample(["Mon", "Tue", "Wed", "Thu", "Fri"], 2),
+                "start_time": f"{rng.randint(8, 16):02d}:00",
+                "end_time": f"{rng.randint(17, 18):02d}:15",
+                "start_date": (now - timedelta(days=30)).date().isoformat(),
+                "end_date": (now + timedelta(days=90)).date().isoformat(),
+                "timezone": "America/New_York",
+            }
+            for _ in range(rng.randint(3, 6))
+        )
+        events = []
+        for _ in range(rng.randint(20, 200)):
+            start = now + timedelta(minutes=15 * rng.randint(0, 4 * 24 * 90))
+            events.append((start, start + timedelta(minutes=15 * rng.randint(2, 12))))
+        events.sort()
+        inputs.append(PlanInput(
+            user_id=str(u),
+            now=now,
+            assignments=assignments,
+            user={"timezone": "America/New_York",
+                  "study_preferences": {"study_start": "08:00", "study_end": "23:00"}},
+            schedules=schedules,
+            events=tuple(events),
+        ))
+    return inputs
+
+def run_pool(inputs: List[PlanInput], workers: int, batch_size: int) -> float:
+    """Seconds to plan all inputs with a pool of the given size (pool start-up excluded)."""
+    batches = [inputs[i:i + batch_size] for i in range(0, len(inputs), batch_size)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # Warm the workers so interpreter start-up isn't measured
+        list(pool.map(plan_batch, [inputs[:1]] * workers))
+        start = time.perf_counter()
+        for _ in pool.map(plan_batch, batches):
+            pass
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process-pool planning")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    inputs = synthetic_inputs(args.users)
+
+    start = time.perf_counter()
+    plan_batch(inputs)
+    serial = time.perf_counter() - start
+    print(f"{args.users} users, batch size {args.batch_size}, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'seconds':>9} {'users/s':>9} {'speedup':>8}")
+    print(f"{'inline':>8} {serial:9.2f} {args.users / serial:9.0f} {1.0:8.2f}")
+
+    workers = 1
+    while True:
+        elapsed = run_pool(inputs, workers, args.batch_size)
+        print(f"{workers:>8} {elapsed:9.2f} {args.users / elapsed:9.0f} {serial / elapsed:8.2f}")
+        if workers >= args.max_workers:
+            break
+        workers = min(workers * 2, args.max_workers)
+
+if __name__ == "__main__":
+    main()
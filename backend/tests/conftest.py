@@ -0,0 +1,19 @@
+"""Shared test fixtures.
+
+Async tests use the anyio pytest plugin: mark them with @pytest.mark.anyio.
+"""
+import pytest
+from app.database import connection
+from app.services.cache_service import cache
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+def db(monkeypatch):
+    """An empty in-memory database behind get_database(), with the cache off."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    monkeypatch.setattr(connection.db, "client", mongomock_motor.AsyncMongoMockClient())
+    monkeypatch.setattr(cache, "enabled", False)
+    return connection.get_database()
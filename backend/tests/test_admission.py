@@ -0,0 +1,84 @@
+"""AdmissionController: token buckets, concurrency slots and the wait queue."""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.api.admission import AdmissionController
+
+pytestmark = pytest.mark.anyio
+
+def controller(**overrides) -> AdmissionController:
+    options = dict(max_concurrent=2, max_queue=2, queue_timeout=1.0, rate_per_minute=6000, burst=100)
+    return AdmissionController(**{**options, **overrides})
+
+async def run(admission: AdmissionController, user_id: str, hold: asyncio.Event):
+    """Hold a slot until hold is set; returns "ok" or the 429's Retry-After."""
+    try:
+        async with admission.admit(user_id):
+            await hold.wait()
+        return "ok"
+    except HTTPException as e:
+        assert e.status_code == 429
+        return int(e.headers["Retry-After"])
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+async def test_burst_then_rate_limited():
+    admission = controller(rate_per_minute=6, burst=2)
+    hold = asyncio.Event()
+    hold.set()
+    assert await run(admission, "u", hold) == "ok"
+    assert await run(admission, "u", hold) == "ok"
+    assert await run(admission, "u", hold) == 10  # one token every 10 seconds
+    assert await run(admission, "other", hold) == "ok"
+    assert admission.metrics()["rejected_rate_limited"] == 1
+
+async def test_queue_full_is_rejected_and_queue_drains_in_order():
+    admission = controller()
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(run(admission, f"u{i}", hold)) for i in range(5)]
+    await settle()
+    metrics = admission.metrics()
+    assert (metrics["in_flight"], metrics["queue_depth"]) == (2, 2)
+    assert tasks[4].done() and isinstance(tasks[4].result(), int)
+
+    hold.set()
+    assert await asyncio.gather(*tasks[:4]) == ["ok"] * 4
+    metrics = admission.metrics()
+    assert (metrics["in_flight"], metrics["queue_depth"]) == (0, 0)
+    assert (metrics["admitted"], metrics["rejected_queue_full"], metrics["max_queue_depth_seen"]) == (4, 1, 2)
+
+async def test_queue_timeout_gives_up_without_leaking_a_slot():
+    admission = controller(max_concurrent=1, queue_timeout=0.05)
+    hold = asyncio.Event()
+    holder = asyncio.create_task(run(admission, "a", hold))
+    await settle()
+    assert isinstance(await run(admission, "b", hold), int)
+    assert admission.metrics()["rejected_queue_timeout"] == 1
+    hold.set()
+    assert await holder == "ok"
+    assert admission.metrics()["in_flight"] == 0
+
+async def test_cancelled_waiter_leaves_the_queue():
+    admission = controller(max_concurrent=1)
+    hold = asyncio.Event()
+    holder = asyncio.create_task(run(admission, "a", hold))
+    await settle()
+    waiter = asyncio.create_task(run(admission, "b", hold))
+    await settle()
+    assert admission.metrics()["queue_depth"] == 1
+    waiter.cancel()
+    await settle()
+    assert admission.metrics()["queue_depth"] == 0
+    hold.set()
+    assert await holder == "ok"
+    assert admission.metrics()["in_flight"] == 0
+
+async def test_tracked_users_are_bounded():
+    admission = controller(max_tracked_users=3)
+    hold = asyncio.Event()
+    hold.set()
+    for i in range(10):
+        await run(admission, f"u{i}", hold)
+    assert admission.metrics()["tracked_users"] == 3
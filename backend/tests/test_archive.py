@@ -0,0 +1,44 @@
+"""Reads and writes of archived assignments."""
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.api.routes.assignments import delete_assignment, get_assignment, update_assignment
+from app.models.assignment import AssignmentUpdate
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def archived(db):
+    now = datetime.utcnow()
+    doc = {"_id": ObjectId(), "user_id": "user-1", "title": "Old essay", "course_id": "c",
+           "status": "completed", "due_date": now - timedelta(days=60),
+           "updated_at": now - timedelta(days=45), "archived_at": now - timedelta(days=10)}
+    await db.assignments_archive.insert_one(doc)
+    return str(doc["_id"])
+
+async def test_archived_assignment_is_readable(archived):
+    assert (await get_assignment(archived)).title == "Old essay"
+
+async def test_reopening_moves_it_back_to_the_hot_tier(db, archived):
+    updated = await update_assignment(archived, AssignmentUpdate(status="pending"))
+    assert updated.status == "pending"
+    hot = await db.assignments.find_one({"_id": ObjectId(archived)})
+    assert hot["status"] == "pending" and "archived_at" not in hot
+    assert await db.assignments_archive.count_documents({}) == 0
+
+async def test_deleting_removes_it_from_the_archive_with_a_tombstone(db, archived):
+    await delete_assignment(archived)
+    assert await db.assignments_archive.count_documents({}) == 0
+    tombstone = await db.deletions.find_one({"doc_id": archived})
+    assert (tombstone["collection"], tombstone["reason"]) == ("assignments", "deleted")
+    with pytest.raises(HTTPException) as e:
+        await get_assignment(archived)
+    assert e.value.status_code == 404
+
+async def test_unknown_ids_are_404(db):
+    missing = str(ObjectId())
+    for call in (update_assignment(missing, AssignmentUpdate(title="x")), delete_assignment(missing)):
+        with pytest.raises(HTTPException) as e:
+            await call
+        assert e.value.status_code == 404
@@ -0,0 +1,111 @@
+"""AvailabilityBitmap run searches (checked against a slot-by-slot scan) and the bitmap cache."""
+import random
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import pytest
+from app.config import settings
+from app.services import availability_service
+from app.services.availability_service import MAX_AGE, SLOT, AvailabilityBitmap, AvailabilityService
+
+ORIGIN = datetime(2026, 1, 5)
+
+def make_bitmap(free: str) -> AvailabilityBitmap:
+    """Bitmap whose slot k is free iff free[k] == "1"."""
+    bitmap = AvailabilityBitmap(ORIGIN, len(free))
+    bitmap.base = int(free[::-1], 2) if free else 0
+    return bitmap
+
+def scan_find_run(free: str, n: int, i: int, j: int):
+    for k in range(i, j - n + 1):
+        if n > 0 and free[k:k + n] == "1" * n:
+            return k
+    return None
+
+def scan_runs(free: str, i: int, j: int, min_slots: int):
+    runs, k = [], i
+    while k < j:
+        if free[k] == "1":
+            start = k
+            while k < j and free[k] == "1":
+                k += 1
+            if k - start >= min_slots:
+                runs.append((start, k))
+        else:
+            k += 1
+    return runs
+
+@pytest.mark.parametrize("free, n, i, j, expected", [
+    ("0011100111", 3, 0, 10, 2),
+    ("0011100111", 4, 0, 10, None),
+    ("0011100111", 3, 3, 10, 7),
+    ("0011100111", 3, 0, 9, 2),
+    ("0011100111", 3, 5, 9, None),  # the run at 7 is cut off by j
+    ("1111", 0, 0, 4, None),
+    ("1111", 5, 0, 4, None),
+    ("1111", 4, 0, 4, 0),
+])
+def test_find_run(free, n, i, j, expected):
+    assert make_bitmap(free).find_run(n, i, j) == expected
+
+def test_busy_slots_are_not_free():
+    bitmap = make_bitmap("1111111111")
+    bitmap.busy = bitmap.busy_mask(ORIGIN + 2 * SLOT + timedelta(minutes=5), ORIGIN + 4 * SLOT)
+    assert bitmap.find_run(3, 0, 10) == 4
+    assert list(bitmap.iter_runs(0, 10)) == [(0, 2), (4, 10)]
+
+def test_iter_runs():
+    bitmap = make_bitmap("1101110001111")
+    assert list(bitmap.iter_runs(0, 13)) == [(0, 2), (3, 6), (9, 13)]
+    assert list(bitmap.iter_runs(0, 13, min_slots=3)) == [(3, 6), (9, 13)]
+    assert list(bitmap.iter_runs(4, 11)) == [(4, 6), (9, 11)]
+    assert list(make_bitmap("0000").iter_runs(0, 4)) == []
+
+def test_random_bitmaps_match_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        size = rng.randint(1, 200)
+        density = rng.random()
+        free = "".join("1" if rng.random() < density else "0" for _ in range(size))
+        bitmap = make_bitmap(free)
+        i = rng.randint(0, size)
+        j = rng.randint(i, size)
+        n = rng.randint(0, 12)
+        assert bitmap.find_run(n, i, j) == scan_find_run(free, n, i, j)
+        assert list(bitmap.iter_runs(i, j, max(1, n))) == scan_runs(free, i, j, max(1, n))
+
+def test_free_slots_start_on_the_grid():
+    bitmap = make_bitmap("0111111110")
+    slots = bitmap.free_slots(ORIGIN + timedelta(minutes=20), ORIGIN + 10 * SLOT, 1.0)
+    assert slots == [{"start": ORIGIN + 2 * SLOT, "end": ORIGIN + 9 * SLOT, "duration_hours": 1.75}]
+    assert bitmap.free_slots(ORIGIN, ORIGIN + 10 * SLOT, 2.5) == []
+
+@pytest.fixture
+def bitmap_cache(monkeypatch):
+    """Empty bitmap cache holding at most 3 entries; builds are counted instead of read from Mongo."""
+    built = []
+
+    async def build(user_id, now=None):
+        built.append(user_id)
+        return AvailabilityBitmap((now or datetime.utcnow()).replace(second=0, microsecond=0), 8)
+
+    monkeypatch.setattr(availability_service, "_bitmaps", OrderedDict())
+    monkeypatch.setattr(settings, "AVAILABILITY_MAX_BITMAPS", 3)
+    monkeypatch.setattr(AvailabilityService, "build", staticmethod(build))
+    return built
+
+@pytest.mark.anyio
+async def test_bitmap_cache_evicts_least_recently_used(bitmap_cache):
+    for user_id in ("a", "b", "c", "a", "d"):
+        await AvailabilityService.get_bitmap(user_id)
+    assert list(availability_service._bitmaps) == ["c", "a", "d"]
+    assert bitmap_cache == ["a", "b", "c", "d"]
+
+@pytest.mark.anyio
+async def test_bitmap_cache_drops_stale_entries(bitmap_cache):
+    await AvailabilityService.get_bitmap("a")
+    await AvailabilityService.get_bitmap("b")
+    availability_service._bitmaps["a"].built_at -= MAX_AGE + timedelta(seconds=1)
+    await AvailabilityService.get_bitmap("c")
+    assert list(availability_service._bitmaps) == ["b", "c"]
+    await AvailabilityService.get_bitmap("a")
+    assert bitmap_cache == ["a", "b", "c", "a"]
@@ -0,0 +1,68 @@
+"""ReadThroughCache hits, misses, version checks and invalidation."""
+import asyncio
+import pytest
+from app.services.cache_service import MemoryBackend, ReadThroughCache
+
+pytestmark = pytest.mark.anyio
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return dict(self.value) if self.value is not None else None
+
+def make_cache(max_entries: int = 100) -> ReadThroughCache:
+    return ReadThroughCache(MemoryBackend(max_entries), ttl=60)
+
+async def test_hit_without_version_does_not_reload():
+    cache, load = make_cache(), Loader({"name": "A"})
+    assert await cache.get_or_load("k", load) == {"name": "A"}
+    first = await cache.get_or_load("k", load)
+    first["name"] = "mutated"
+    assert await cache.get_or_load("k", load) == {"name": "A"}
+    assert load.calls == 1
+
+async def test_version_mismatch_reloads():
+    cache, load = make_cache(), Loader({"name": "A"})
+    await cache.get_or_load("k", load, "v1")
+    await cache.get_or_load("k", load, "v1")
+    await cache.get_or_load("k", load)  # callers without a token accept any entry
+    assert load.calls == 1
+    load.value = {"name": "B"}
+    assert await cache.get_or_load("k", load, "v2") == {"name": "B"}
+    assert load.calls == 2
+
+async def test_missing_documents_are_not_cached():
+    cache, load = make_cache(), Loader(None)
+    assert await cache.get_or_load("k", load) is None
+    assert await cache.get_or_load("k", load) is None
+    assert load.calls == 2
+
+async def test_invalidation_during_load_is_not_overwritten():
+    cache = make_cache()
+    release = asyncio.Event()
+
+    async def slow_load():
+        await release.wait()
+        return {"name": "stale"}
+
+    pending = asyncio.create_task(cache.get_or_load("k", slow_load))
+    await asyncio.sleep(0)
+    await cache.invalidate("k")
+    release.set()
+    assert await pending == {"name": "stale"}
+    load = Loader({"name": "fresh"})
+    assert await cache.get_or_load("k", load) == {"name": "fresh"}
+
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    await backend.set("a", 1, 60)
+    await backend.set("b", 2, 60)
+    await backend.get("a")
+    await backend.set("c", 3, 60)
+    assert (await backend.get("a"), await backend.get("b"), await backend.get("c")) == (1, None, 3)
+    await backend.set("d", 4, 0)
+    assert await backend.get("d") is None
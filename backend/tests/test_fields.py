@@ -0,0 +1,49 @@
+"""Sparse fieldsets: parsing, projections and partial models."""
+import json
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+from app.api.fields import parse_fields, partial_model, partial_response
+from app.models.assignment import Assignment
+from app.models.calendar import FreeSlot
+from app.models.common import mongo_projection
+
+def test_parse_fields_keeps_model_order_and_drops_blanks():
+    assert parse_fields("status, title,,due_date,title", Assignment) == ("title", "due_date", "status")
+
+@pytest.mark.parametrize("fields", [None, "", " , "])
+def test_parse_fields_without_names_means_all(fields):
+    assert parse_fields(fields, Assignment) is None
+
+def test_parse_fields_rejects_unknown_names():
+    with pytest.raises(HTTPException) as e:
+        parse_fields("title,colour,_id", Assignment)
+    assert e.value.status_code == 400
+    assert "_id, colour" in e.value.detail
+
+def test_mongo_projection_uses_stored_names():
+    assert mongo_projection(Assignment, ("id", "title")) == {"_id": 1, "title": 1}
+    assert mongo_projection(Assignment, ("title",)) == {"title": 1, "_id": 0}
+    assert mongo_projection(FreeSlot) == {"start": 1, "end": 1, "duration_hours": 1, "_id": 0}
+
+def test_partial_model_keeps_types_aliases_and_is_cached():
+    names = ("id", "due_date", "priority")
+    model = partial_model(Assignment, names)
+    assert model is partial_model(Assignment, names)
+    assert list(model.model_fields) == list(names)
+    oid = ObjectId()
+    item = model(_id=oid, due_date="2026-03-01T10:00:00+01:00", priority=2)
+    assert item.due_date == datetime(2026, 3, 1, 9, 0)  # still normalised to naive UTC
+    assert json.loads(item.model_dump_json(by_alias=True)) == {
+        "_id": str(oid), "due_date": "2026-03-01T09:00:00", "priority": 2
+    }
+    with pytest.raises(ValueError):
+        model(_id=oid, due_date=item.due_date, priority=9)
+
+def test_partial_response_serializes_only_selected_fields_and_keeps_headers():
+    response = Response(headers={"ETag": '"v1"'})
+    docs = [{"title": "Essay", "status": "pending"}, {"title": "Lab", "status": "completed"}]
+    result = partial_response(Assignment, ("title", "status"), docs, response)
+    assert json.loads(result.body) == docs
+    assert result.headers["etag"] == '"v1"'
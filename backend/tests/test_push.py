@@ -0,0 +1,33 @@
+"""WebSocket push channel: delivery, slow consumers and disconnects."""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.main import app
+from app.services.push_service import hub
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(hub, "max_queue", 5)
+    return TestClient(app)  # no lifespan: the channel itself does not touch Mongo
+
+def publish(ws, user_id: str, count: int):
+    async def send():
+        for n in range(count):
+            hub.publish(user_id, "reminder", n=n)
+    ws.portal.call(send)
+
+def test_messages_are_delivered_and_disconnect_unsubscribes(client):
+    with client.websocket_connect("/api/v1/ws/push-user-1") as ws:
+        publish(ws, "push-user-1", 2)
+        assert [ws.receive_json()["n"] for _ in range(2)] == [0, 1]
+        ws.send_text("ping")
+        assert ws.receive_json()["type"] == "pong"
+    assert "push-user-1" not in hub._subscribers
+
+def test_slow_consumer_is_closed_with_1013(client):
+    with client.websocket_connect("/api/v1/ws/push-user-2") as ws:
+        publish(ws, "push-user-2", hub.max_queue + 3)
+        with pytest.raises(WebSocketDisconnect) as e:
+            while True:
+                ws.receive_json()
+        assert e.value.code == 1013
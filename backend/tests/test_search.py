@@ -0,0 +1,68 @@
+"""Search browse pipeline (no text query) against an in-memory database."""
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.services.search_service import SearchService
+
+pytestmark = pytest.mark.anyio
+
+USER = "user-1"
+
+@pytest.fixture
+async def seeded(db):
+    now = datetime.utcnow()
+    course = ObjectId()
+    await db.courses.insert_many([
+        {"_id": course, "user_id": USER, "name": "Algorithms", "code": "CS101", "credits": 3, "semester": "F"},
+        {"_id": ObjectId(), "user_id": "someone-else", "name": "Biology", "code": "BIO1", "credits": 3, "semester": "F"},
+    ])
+
+    def assignment(title, days, category="homework", status="pending", course_id=str(course)):
+        return {"_id": ObjectId(), "user_id": USER, "title": title, "course_id": course_id,
+                "category": category, "status": status, "due_date": now + timedelta(days=days)}
+
+    await db.assignments.insert_many([
+        assignment("Late essay", -2),
+        assignment("Lab 1", 1, category="lab"),
+        assignment("Exam prep", 5, category="exam", status="in_progress"),
+        assignment("Project", 20, category="project", course_id="other"),
+        assignment("Done", 3, status="completed"),
+        {**assignment("Not mine", 1), "user_id": "someone-else"},
+    ])
+    return str(course)
+
+def facet(result, name):
+    return {value["value"]: value["count"] for value in result["facets"][name]}
+
+async def test_browse_lists_the_users_assignments_by_due_date(seeded):
+    result = await SearchService.search_assignments(USER)
+    assert result["total"] == 5
+    assert [hit["title"] for hit in result["results"]] == ["Late essay", "Lab 1", "Done", "Exam prep", "Project"]
+    assert all("score" not in hit for hit in result["results"])
+
+async def test_browse_pages(seeded):
+    result = await SearchService.search_assignments(USER, skip=1, limit=2)
+    assert result["total"] == 5
+    assert [hit["title"] for hit in result["results"]] == ["Lab 1", "Done"]
+
+async def test_facets_ignore_their_own_filter(seeded):
+    result = await SearchService.search_assignments(USER, filters={"status": ["pending"], "category": []})
+    assert result["total"] == 3
+    assert facet(result, "status") == {"pending": 3, "in_progress": 1, "completed": 1}
+    assert facet(result, "category") == {"homework": 1, "lab": 1, "project": 1}
+    labels = {value["value"]: value["label"] for value in result["facets"]["course_id"]}
+    assert labels == {seeded: "Algorithms", "other": None}
+
+async def test_due_buckets_and_due_filter(seeded):
+    result = await SearchService.search_assignments(USER)
+    assert facet(result, "due") == {"overdue": 1, "next_7_days": 3, "next_30_days": 1}
+    bucket = next(value for value in result["facets"]["due"] if value["value"] == "next_7_days")
+
+    narrowed = await SearchService.search_assignments(USER, due_after=bucket["start"], due_before=bucket["end"])
+    assert [hit["title"] for hit in narrowed["results"]] == ["Lab 1", "Done", "Exam prep"]
+    assert facet(narrowed, "due") == facet(result, "due")  # the due facet ignores the due filter
+
+async def test_courses_browse(seeded):
+    result = await SearchService.search_courses(USER)
+    assert result["total"] == 1
+    assert [hit["code"] for hit in result["results"]] == ["CS101"]
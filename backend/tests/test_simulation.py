@@ -0,0 +1,98 @@
+"""What-if planning: applying edits and diffing plans."""
+import copy
+from datetime import datetime, timedelta
+import pytest
+from app.agents.planner_batch import PlanItem
+from app.agents.simulation import _check_deadline, apply_assignment_changes, diff_plans, simulate
+from app.models.simulation import AssignmentChange, SimulationRequest
+from app.services.availability_service import SLOT_MINUTES, AvailabilityBitmap
+
+NOW = datetime(2026, 3, 2, 9, 0)
+ITEMS = [
+    PlanItem("a", "Essay", NOW + timedelta(days=2), 3, 4.0),
+    PlanItem("b", "Lab", NOW + timedelta(days=5), 2, 2.0),
+    PlanItem("c", "Quiz", NOW + timedelta(days=1), 4, 1.0),
+]
+
+def by_id(items):
+    return {item.id: item for item in items}
+
+def test_edit_keeps_unset_fields():
+    items, touched = apply_assignment_changes(ITEMS, [AssignmentChange(id="b", priority=5)])
+    assert by_id(items)["b"] == ITEMS[1]._replace(priority=5)
+    assert touched == {"b"}
+
+def test_remove_and_complete_drop_the_item():
+    items, touched = apply_assignment_changes(ITEMS, [
+        AssignmentChange(id="a", remove=True), AssignmentChange(id="c", status="completed")
+    ])
+    assert [item.id for item in items] == ["b"]
+    assert touched == {"a", "c"}
+
+def test_added_items_get_sequential_ids_and_defaults():
+    due = NOW + timedelta(days=3)
+    items, touched = apply_assignment_changes(ITEMS, [
+        AssignmentChange(title="Project", due_date=due),
+        AssignmentChange(title="Done already", due_date=due, status="completed"),
+        AssignmentChange(title="Reading", due_date=due, priority=1, estimated_hours=0.5),
+    ])
+    added = {item.id: item for item in items if item.id.startswith("new:")}
+    assert added == {
+        "new:0": PlanItem("new:0", "Project", due, 3, 2.0),
+        "new:2": PlanItem("new:2", "Reading", due, 1, 0.5),
+    }
+    assert touched == {"new:0", "new:2"}
+
+def test_inputs_are_not_mutated():
+    original = list(ITEMS)
+    apply_assignment_changes(ITEMS, [AssignmentChange(id="a", title="Renamed"), AssignmentChange(id="b", remove=True)])
+    assert ITEMS == original
+
+def test_diff_plans():
+    a, b, c = ITEMS
+    new = PlanItem("new:0", "Project", NOW, 3, 2.0)
+    t1, t2 = NOW + timedelta(hours=1), NOW + timedelta(hours=2)
+    before, times_before = [a, b, c], {"a": [t1], "b": [t1], "c": [t2]}
+    after, times_after = [a, new, c], {"a": [t1], "new:0": [t2], "c": [t1]}
+    changes = {change["assignment_id"]: change for change in diff_plans(before, times_before, after, times_after)}
+    assert set(changes) == {"new:0", "b", "c"}  # a kept its rank and times
+    assert changes["new:0"]["change"] == "added" and changes["new:0"]["rank_before"] is None
+    assert changes["b"]["change"] == "dropped" and changes["b"]["times_after"] == []
+    assert changes["c"]["change"] == "rescheduled"
+    assert (changes["c"]["times_before"], changes["c"]["times_after"]) == ([t2], [t1])
+
+def test_diff_plans_reports_rank_moves():
+    a, b, _ = ITEMS
+    changes = diff_plans([a, b], {"a": [], "b": []}, [b, a], {"b": [], "a": []})
+    assert [(c["assignment_id"], c["change"], c["rank_before"], c["rank_after"]) for c in changes] == [
+        ("b", "moved", 2, 1), ("a", "moved", 1, 2)
+    ]
+
+def test_request_rejects_duplicate_ids():
+    with pytest.raises(ValueError, match="only one change"):
+        SimulationRequest(assignments=[{"id": "a", "priority": 1}, {"id": "a", "remove": True}])
+
+def test_deadline():
+    _check_deadline(None)
+    with pytest.raises(TimeoutError):
+        _check_deadline(0.0)
+
+def open_bitmap(days: int = 7) -> AvailabilityBitmap:
+    bitmap = AvailabilityBitmap(NOW, days * 24 * 60 // SLOT_MINUTES)
+    bitmap.base = bitmap.mask(0, bitmap.slots)
+    return bitmap
+
+def test_simulate_without_edits_changes_nothing():
+    bitmap = open_bitmap()
+    result = simulate(NOW, tuple(ITEMS), bitmap, bitmap, [])
+    assert result["changes"] == [] and result["rescheduled"] == 0
+    assert [entry["rank"] for entry in result["plan"]] == [1, 2, 3]
+
+def test_simulate_only_replans_entries_whose_window_changed():
+    bitmap = open_bitmap()
+    edited = copy.copy(bitmap)
+    # Busy from day 3 on: only Lab (due on day 5) has that in its window
+    edited.busy = bitmap.mask(bitmap.index(NOW + timedelta(days=3)), bitmap.slots)
+    result = simulate(NOW, tuple(ITEMS), bitmap, edited, [])
+    assert result["rescheduled"] == 1
+    assert all(change["assignment_id"] == "b" for change in result["changes"])
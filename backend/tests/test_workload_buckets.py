@@ -0,0 +1,58 @@
+"""Workload bucket assignment and boundary computation."""
+from datetime import datetime, timedelta
+import pytest
+from app.services.workload_service import (
+    FAR_FUTURE, URGENT_WINDOW, UPCOMING_WINDOW, WorkloadService, bucket_for, next_boundary
+)
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+@pytest.mark.parametrize("due_in, bucket", [
+    (timedelta(hours=-1), "overdue"),
+    (timedelta(0), "urgent"),
+    (URGENT_WINDOW - timedelta(seconds=1), "urgent"),
+    (URGENT_WINDOW, "upcoming"),
+    (UPCOMING_WINDOW - timedelta(seconds=1), "upcoming"),
+    (UPCOMING_WINDOW, "future"),
+    (timedelta(days=60), "future"),
+])
+def test_bucket_for(due_in, bucket):
+    assert bucket_for(NOW + due_in, NOW) == bucket
+
+@pytest.mark.parametrize("due_in, boundary_in", [
+    (timedelta(days=30), timedelta(days=30) - UPCOMING_WINDOW),
+    (UPCOMING_WINDOW, timedelta(0)),  # still "future" at this instant
+    (timedelta(days=2), timedelta(days=2)),
+    (URGENT_WINDOW, timedelta(0)),  # still "upcoming" at this instant
+    (timedelta(hours=-1), None),
+])
+def test_next_boundary(due_in, boundary_in):
+    expected = NOW + boundary_in if boundary_in is not None else FAR_FUTURE
+    assert next_boundary(NOW + due_in, NOW) == expected
+
+def test_bucket_changes_right_after_the_boundary():
+    tick = timedelta(microseconds=1)
+    for days in (0.5, 3, 5, 7.5, 12, 40):
+        due_date = NOW + timedelta(days=days)
+        moment = NOW
+        while (boundary := next_boundary(due_date, moment)) != FAR_FUTURE:
+            assert bucket_for(due_date, boundary) == bucket_for(due_date, moment)
+            assert bucket_for(due_date, boundary + tick) != bucket_for(due_date, moment)
+            # A recount landing on the boundary must not skip the change
+            assert next_boundary(due_date, boundary) == boundary
+            moment = boundary + tick
+        assert bucket_for(due_date, moment) == "overdue"
+
+def test_summarize():
+    items = [
+        (NOW - timedelta(days=1), 2.0),
+        (NOW + timedelta(days=1), 6.0),
+        (NOW + timedelta(days=5), 1.5),
+        (NOW + timedelta(days=20), 3.0),
+    ]
+    summary = WorkloadService.summarize(items, NOW)
+    assert summary["counts"] == {"overdue": 1, "urgent": 1, "upcoming": 1, "future": 1}
+    assert summary["total_hours"] == 12.5
+    assert summary["large_count"] == 1
+    assert summary["next_boundary"] == NOW + timedelta(days=1)
+    assert WorkloadService.summarize([], NOW)["next_boundary"] == FAR_FUTURE
@@ -25,6 +25,12 @@ export const updateUser = async (userId, userData) => {
   return response.data;
 };
 
+// Dashboard (user, courses, pending assignments, upcoming events and workload in one call)
+export const getDashboard = async (userId) => {
+  const response = await api.get(`/dashboard/${userId}`);
+  return response.data;
+};
+
 // Courses
 export const createCourse = async (courseData) => {
   const response = await api.post('/courses', courseData);
@@ -70,6 +76,13 @@ export const deleteAssignment = async (assignmentId) => {
   return response.data;
 };
 
+// Search: params may include q, types, category, status, course_id,
+// due_after, due_before, skip and limit.
+export const search = async (userId, params = {}) => {
+  const response = await api.get(`/search/${userId}`, { params });
+  return response.data;
+};
+
 // Agent
 export const runStudyPlanning = async (userId) => {
   const response = await api.post(`/agent/plan/${userId}`);
@@ -81,5 +94,20 @@ export const getAgentHealth = async () => {
   return response.data;
 };
 
+// Push updates: onMessage gets {type: 'reminder' | 'plan_updated', ...}.
+// Returns the socket; call close() on it to unsubscribe.
+export const subscribeToUpdates = (userId, onMessage) => {
+  const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws/${userId}`);
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    if (message.type === 'ping') {
+      socket.send('pong');
+    } else if (message.type !== 'pong') {
+      onMessage(message);
+    }
+  };
+  return socket;
+};
+
 export default api;
 